@@ -1,10 +1,75 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    # Rotating refresh tokens (see app/utils/refresh_tokens.py)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # An already rotated token is still accepted this long (concurrent refreshes from several tabs)
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
+
+    # Argon2 parameters; existing hashes are upgraded on the next successful login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    # Password hashing process pool (see app/utils/hashing_service.py)
+    HASH_WORKERS: int = 2
+    HASH_QUEUE_SIZE: int = 32
+
+    # In-process cache of authenticated users (see app/utils/principal_cache.py)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+
+    # How often buffered last_seen timestamps are written (see app/utils/presence.py)
+    PRESENCE_FLUSH_INTERVAL_SECONDS: int = 30
+
+    # Batched activity log writer (see app/utils/activity_logger.py)
+    ACTIVITY_LOG_BATCH_SIZE: int = 200
+    ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000
+
+    # Server-Sent Events stream (see app/routes/stream_routes.py)
+    STREAM_MAX_CONNECTIONS: int = 200
+    STREAM_HEARTBEAT_SECONDS: int = 15
+    STREAM_REPLAY_SIZE: int = 1000
+    STREAM_QUEUE_SIZE: int = 256
+    STREAM_MAX_DURATION_SECONDS: int = 600
+    STREAM_RETRY_MS: int = 3000
+    # Lifetime of the single-use tickets that authenticate GET /stream (see app/utils/stream_tickets.py)
+    STREAM_TICKET_TTL_SECONDS: int = 30
+
+    # Response cache of GET /admin/analytics/ (see app/utils/response_cache.py)
+    ANALYTICS_CACHE_MAX_SIZE: int = 256
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+
+    # Rows fetched per round trip when exporting reports (see app/utils/report_utils.py)
+    REPORT_BATCH_SIZE: int = 1000
+    # Pages per PDF chunk; chunks are rendered in parallel and concatenated
+    REPORT_PDF_CHUNK_PAGES: int = 50
+    # Background report jobs (see app/utils/report_jobs.py). With several
+    # workers REPORT_CACHE_DIR must be shared by all of them; it defaults to
+    # trace-reports in the system temp directory.
+    REPORT_WORKERS: int = 2
+    REPORT_QUEUE_SIZE: int = 16
+    REPORT_JOB_HEARTBEAT_SECONDS: int = 10
+    REPORT_CACHE_DIR: Optional[str] = None
+    REPORT_CACHE_MAX_AGE_SECONDS: int = 86400
+    REPORT_CACHE_MAX_BYTES: int = 1073741824
+
+    # How often token revocations written by other workers are picked up (see app/utils/revocation.py)
+    REVOCATION_SYNC_INTERVAL_SECONDS: int = 5
+
+    # Cross-worker change notifications over LISTEN/NOTIFY (see app/utils/change_feed.py).
+    # LISTEN needs a session-level connection: behind a transaction-pooling proxy
+    # point CHANGE_FEED_DATABASE_URL at Postgres directly.
+    CHANGE_FEED_ENABLED: bool = True
+    CHANGE_FEED_CHANNEL: str = "trace_changes"
+    CHANGE_FEED_DATABASE_URL: Optional[str] = None
+    CHANGE_FEED_MAX_BACKOFF_SECONDS: int = 30
+    CHANGE_FEED_HEALTHCHECK_SECONDS: int = 30
 
     DB_HOST: str
     DB_PORT: str
@@ -12,6 +77,19 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
 
+    # Connection pool (applies to both the sync and the async engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Async sessions one request may use at once for independent read queries
+    # (see app/utils/parallel_queries.py); keep it below DB_POOL_SIZE
+    PARALLEL_QUERY_LIMIT: int = 4
+    # Set when connecting through a transaction-pooling proxy (e.g. PgBouncer in
+    # pool_mode=transaction): disables server-side prepared statement caching
+    DB_TRANSACTION_POOLING: bool = False
+
     SMTP_HOST: str
     SMTP_PORT: str
     SMTP_USER: str
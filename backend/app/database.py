@@ -1,9 +1,15 @@
 import os
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from urllib.parse import quote_plus
+from uuid import uuid4
 
+from app.config import settings
+from app.utils.pool_metrics import (InstrumentedAsyncQueuePool,
+                                    InstrumentedQueuePool, instrument)
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 load_dotenv(dotenv_path=".env")
@@ -15,9 +21,46 @@ DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+# Behind a transaction-pooling proxy consecutive statements may land on different
+# server connections, so asyncpg must not cache named prepared statements.
+# psycopg2 never prepares server-side, and neither engine sets session-level state.
+ASYNC_CONNECT_ARGS = {}
+if settings.DB_TRANSACTION_POOLING:
+    ASYNC_CONNECT_ARGS = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+# Sync engine: used by routes that still run in the threadpool, Alembic and background flushes
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
+instrument(engine, "sync")
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+# Async engine: used by `async def` routes via get_async_db
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=ASYNC_CONNECT_ARGS,
+    **POOL_OPTIONS
+)
+instrument(async_engine, "async")
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # Dependency to provide a DB session for each request
@@ -26,4 +69,10 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async counterpart of get_db. Sync helpers written against Session
+# can still be called with `await db.run_sync(fn, ...)`.
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,20 +1,34 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, async_engine, engine
 from app.middleware.auth_middleware import AuthMiddleware
 from app.routes import (
     activity_logs_routes,
     admin_analytics_routes,
+    admin_metrics_routes,
     admin_reports_routes,
     event_attendance_routes,
     events_routes,
     gts_responses_routes,
     notifications_routes,
+    stream_routes,
     users_routes
 )
+from app.utils.activity_logger import activity_log_writer
+from app.utils.analytics_rollup import ensure_built
+from app.utils.change_feed import change_feed
+from app.utils.hashing_service import hashing_service
+from app.utils.live_counters import run_counter_publisher
+from app.utils.presence import presence, run_presence_flusher
+from app.utils.report_jobs import report_jobs
+from app.utils.revocation import revocation_list, run_revocation_sync
+from starlette.concurrency import run_in_threadpool
 
 # Load environment variables
 load_dotenv()
@@ -22,11 +36,40 @@ load_dotenv()
 # Initialize database tables
 Base.metadata.create_all(bind=engine)
 
+# Background workers started and stopped with the app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    presence_task = asyncio.create_task(
+        run_presence_flusher(settings.PRESENCE_FLUSH_INTERVAL_SECONDS)
+    )
+    await run_in_threadpool(revocation_list.sync)
+    await run_in_threadpool(ensure_built)
+    await run_in_threadpool(report_jobs.cleanup)
+    revocation_task = asyncio.create_task(
+        run_revocation_sync(settings.REVOCATION_SYNC_INTERVAL_SECONDS)
+    )
+    counters_task = asyncio.create_task(run_counter_publisher(1))
+    feed_task = asyncio.create_task(change_feed.run()) if settings.CHANGE_FEED_ENABLED else None
+    try:
+        yield
+    finally:
+        presence_task.cancel()
+        revocation_task.cancel()
+        counters_task.cancel()
+        if feed_task is not None:
+            feed_task.cancel()
+        await run_in_threadpool(presence.flush)
+        await run_in_threadpool(activity_log_writer.shutdown)
+        await report_jobs.shutdown()
+        await async_engine.dispose()
+        await run_in_threadpool(hashing_service.shutdown)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="TRACE System Prototype",
     description="Backend API for TRACE System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Middleware
@@ -37,17 +80,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors read by the frontend (see notifications_routes.py)
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-More-After"],
 )
 
 # Register routers
 routers = [
     activity_logs_routes.router,
     admin_analytics_routes.router,
+    admin_metrics_routes.router,
     admin_reports_routes.router,
     events_routes.router,
     event_attendance_routes.router,
     gts_responses_routes.router,
     notifications_routes.router,
+    stream_routes.router,
     users_routes.router
 ]
 
@@ -1,13 +1,18 @@
 import logging
-from datetime import datetime
+import re
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers, QueryParams
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.users_models import UserRole, Users
+from app.utils.presence import presence
+from app.utils.principal_cache import Principal, principal_cache
+from app.utils.revocation import revocation_list
 from app.utils.security import decode_access_token
+from app.utils.stream_tickets import redeem_stream_ticket
+from sqlalchemy import select
 
 # Configure logger
 logging.basicConfig(
@@ -17,8 +22,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger("auth_middleware")
 
+class RedactQueryCredentials(logging.Filter):
+    """Masks token= and ticket= query parameters in uvicorn's access log lines"""
+    PATTERN = re.compile(r"([?&](?:token|ticket)=)[^&\s]*")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access args: (client_addr, method, full_path, http_version, status_code)
+        if isinstance(record.args, tuple) and len(record.args) == 5:
+            args = list(record.args)
+            args[2] = self.PATTERN.sub(r"\1[redacted]", str(args[2]))
+            record.args = tuple(args)
+        return True
+
+logging.getLogger("uvicorn.access").addFilter(RedactQueryCredentials())
+
 PUBLIC_ROUTES = [
     "/users/login",
+    "/users/token/refresh",
     "/users/register",
     "/users/check-email",
     "/users/check-username",
@@ -26,58 +46,104 @@ PUBLIC_ROUTES = [
     "/users/check-phone"
 ]
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        method = request.method
+# str.startswith() accepts a tuple and checks every prefix in C
+PUBLIC_ROUTE_PREFIXES = tuple(PUBLIC_ROUTES)
+
+# EventSource cannot set headers, so these routes also accept a single-use
+# ?ticket= from POST /stream/ticket; access tokens are never read from the URL
+TICKET_ROUTES = ("/stream",)
+
+async def load_principal(username: str):
+    """Fetch the user row for a principal cache miss"""
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(Users).where(Users.username == username))
+
+class AuthMiddleware:
+    """
+    Pure ASGI authentication middleware.
+    Validates the Bearer token, resolves the principal and stores it in
+    scope["state"] (visible as request.state) for get_current_user.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
 
         # Skip authentication for public routes
-        if any(path.startswith(route) for route in PUBLIC_ROUTES):
+        if path.startswith(PUBLIC_ROUTE_PREFIXES):
             logger.debug(f"Public route accessed: {method} {path}")
-            return await call_next(request)
-
-        token = request.headers.get("Authorization")
-        if not token or not token.startswith("Bearer "):
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get("Authorization")
+        ticket = None
+        if not token and path in TICKET_ROUTES:
+            ticket = QueryParams(scope["query_string"]).get("ticket")
+        if not ticket and (not token or not token.startswith("Bearer ")):
             logger.warning(f"Unauthorized access attempt: {method} {path}")
-            return JSONResponse({"detail": "Authorization required"}, status_code=401)
+            response = JSONResponse({"detail": "Authorization required"}, status_code=401)
+            await response(scope, receive, send)
+            return
 
-        token = token[7:]
-        db = SessionLocal()
+        state = scope.setdefault("state", {})
 
         try:
-            payload = decode_access_token(token)
+            if ticket:
+                payload = await redeem_stream_ticket(ticket)
+            else:
+                payload = decode_access_token(token[7:])
             username = payload.get("sub")
             role = payload.get("role", "unknown")
 
             if not username:
                 raise ValueError("Missing username in token payload")
 
-            # Validate user existence
-            user = db.query(Users).filter(Users.username == username).first()
-            if not user:
-                logger.warning(f"Invalid user token: {username}")
-                return JSONResponse({"detail": "Invalid user"}, status_code=401)
+            # Validate user existence, reading through the principal cache
+            principal = principal_cache.get(username)
+            if principal is None:
+                user = await load_principal(username)
+                if not user:
+                    logger.warning(f"Invalid user token: {username}")
+                    response = JSONResponse({"detail": "Invalid user"}, status_code=401)
+                    await response(scope, receive, send)
+                    return
+                principal = Principal.from_user(user)
+                principal_cache.set(principal)
+                # Hand the loaded row to get_current_user so it is not fetched twice
+                state["user"] = user
+
+            # Logged-out tokens and tokens issued before a block/archive; checked in memory
+            if revocation_list.is_revoked(payload, principal.id):
+                logger.warning(f"Revoked token used: {username}")
+                response = JSONResponse({"detail": "Token has been revoked"}, status_code=401)
+                await response(scope, receive, send)
+                return
 
             # Role restriction check
-            if path.startswith("/admin") and user.role != UserRole.admin:
+            if path.startswith("/admin") and principal.role != UserRole.admin:
                 logger.warning(f"Unauthorized admin access: {username}")
-                return JSONResponse({"detail": "Admins only"}, status_code=403)
+                response = JSONResponse({"detail": "Admins only"}, status_code=403)
+                await response(scope, receive, send)
+                return
 
-            # Update last_seen only if > 10s difference to reduce DB writes
-            now = datetime.utcnow()
-            if not user.last_seen or (now - user.last_seen).total_seconds() > 10:
-                old_seen = user.last_seen
-                user.last_seen = now
-                db.commit()
-                logger.debug(f"{username} last_seen updated ({old_seen} → {now})")
+            # Record last_seen in memory; presence.flush() persists it in bulk
+            presence.touch(principal.id)
 
+            state["principal"] = principal
+            state["token_payload"] = payload
             logger.info(f"{method} {path} | user={username} | role={role} | OK")
 
         except Exception as e:
             logger.error(f"Auth error for {method} {path}: {str(e)}")
-            return JSONResponse({"detail": "Invalid or expired token"}, status_code=401)
-
-        finally:
-            db.close()
+            response = JSONResponse({"detail": "Invalid or expired token"}, status_code=401)
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -2,8 +2,12 @@ from app.database import Base
 
 # Import all models so Alembic and SQLAlchemy see them
 from app.models.activity_logs_models import ActivityLog
+from app.models.analytics_rollups_models import AlumniRollup, GTSRollup
 from app.models.event_attendance_models import EventAttendance
 from app.models.events_models import Events
 from app.models.gts_responses_models import GTSResponses
+from app.models.refresh_tokens_models import RefreshToken
+from app.models.report_jobs_models import ReportJob
+from app.models.token_revocations_models import TokenRevocation
 from app.models.trainings_models import Training
 from app.models.users_models import Users
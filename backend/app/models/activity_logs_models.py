@@ -1,7 +1,7 @@
 import enum
 
 from app.database import Base
-from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, func
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,10 @@ class ActionType(str, enum.Enum):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Keyset pagination of /notifications on (created_at, id)
+        Index("ix_activity_logs_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default="uuid_generate_v4()")
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
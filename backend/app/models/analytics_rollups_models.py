@@ -0,0 +1,25 @@
+from app.database import Base
+from sqlalchemy import Column, Integer, String
+
+# Rollups are maintained by app/utils/analytics_rollup.py. Alumni without a
+# course are stored under course '' and responses without a submission date
+# under year 0, since both columns are part of the primary key.
+
+class AlumniRollup(Base):
+    """Alumni counts per course"""
+    __tablename__ = "analytics_alumni_rollup"
+
+    course = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    active = Column(Integer, nullable=False, default=0)
+    pending = Column(Integer, nullable=False, default=0)
+
+class GTSRollup(Base):
+    """GTS response counts per (course of the respondent, year submitted)"""
+    __tablename__ = "analytics_gts_rollup"
+
+    course = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    responses = Column(Integer, nullable=False, default=0)
+    employed = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
@@ -2,12 +2,16 @@ from datetime import datetime
 from uuid import uuid4
 
 from app.database import Base
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 class EventAttendance(Base):
     __tablename__ = "event_attendance"
+    __table_args__ = (
+        # Per-user attendance lookups and the per-event counts of /admin/analytics/attendance
+        Index("ix_event_attendance_event_id_user_id", "event_id", "user_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
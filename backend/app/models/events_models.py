@@ -2,12 +2,17 @@ from datetime import datetime
 from uuid import uuid4
 
 from app.database import Base
-from sqlalchemy import Column, Date, DateTime, ForeignKey, String, Text, Time
+from sqlalchemy import (Column, Date, DateTime, ForeignKey, Index, String, Text,
+                        Time)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 class Events(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Date range filters of /admin/analytics/attendance
+        Index("ix_events_start_date", "start_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     title = Column(String, nullable=False)
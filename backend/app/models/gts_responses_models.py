@@ -1,14 +1,20 @@
 import uuid
 
 from app.database import Base
-from sqlalchemy import (Boolean, Column, Date, ForeignKey, Integer, Numeric,
-                        String, Text)
+from sqlalchemy import (Boolean, Column, Date, ForeignKey, Index, Integer,
+                        Numeric, String, Text, and_)
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 class GTSResponses(Base):
     __tablename__ = "gts_responses"
+    __table_args__ = (
+        # Range filters of /admin/reports/gts
+        Index("ix_gts_responses_year_graduated", "year_graduated"),
+        Index("ix_gts_responses_submitted_at", "submitted_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
@@ -84,3 +90,20 @@ class GTSResponses(Base):
         back_populates="gts_response",
         cascade="all, delete-orphan"
     )
+
+    # A response counts as complete when these answers are all present (truthy)
+    @hybrid_property
+    def is_complete(self):
+        return all([self.degree, self.year_graduated, self.occupation, self.is_employed, self.full_name])
+
+    @is_complete.inplace.expression
+    @classmethod
+    def _is_complete_expression(cls):
+        # SQL form of the same check: NULL, '', 0, an empty array and false all fail
+        return and_(
+            func.coalesce(cls.degree, "") != "",
+            func.coalesce(cls.year_graduated, 0) != 0,
+            func.coalesce(func.cardinality(cls.occupation), 0) > 0,
+            cls.is_employed.is_(True),
+            func.coalesce(cls.full_name, "") != "",
+        )
@@ -0,0 +1,34 @@
+from uuid import uuid4
+
+from app.database import Base
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+class ReportJob(Base):
+    """
+    A report rendered in the background (see app/utils/report_jobs.py).
+    Jobs with the same artifact_key produce the same file, which is stored
+    once in the artifact cache.
+    """
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # Finds a queued or running job for the same artifact
+        Index("ix_report_jobs_artifact_key_status", "artifact_key", "status"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    report_type = Column(String, nullable=False)
+    format = Column(String(8), nullable=False)
+    filters = Column(JSONB, nullable=False, default=dict)
+    artifact_key = Column(String(32), nullable=False)
+    # queued, running, done or failed
+    status = Column(String(16), nullable=False, default="queued")
+    # True when an existing artifact was reused without rendering
+    from_cache = Column(Boolean, nullable=False, default=False)
+    error = Column(Text, nullable=True)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # Refreshed while the job is queued or running; a stale one means its worker died
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,21 @@
+from uuid import uuid4
+
+from app.database import Base
+from sqlalchemy import Column, DateTime, ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+class TokenRevocation(Base):
+    """
+    Either a single revoked access token (jti) or a per-user cutoff
+    (user_id + not_before): tokens issued at or before not_before are invalid.
+    Rows can be deleted once expires_at passes, since every token they
+    could match has expired by then.
+    """
+    __tablename__ = "token_revocations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    jti = Column(String(32), unique=True, nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    not_before = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
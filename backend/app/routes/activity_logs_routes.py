@@ -6,6 +6,7 @@ from app.models.activity_logs_models import ActivityLog
 from app.schemas.activity_logs_schemas import (ActivityLogCreate,
                                                ActivityLogResponse)
 from app.utils.auth import get_current_user
+from app.utils.event_bus import event_bus
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -36,6 +37,7 @@ def create_activity_log(
         db.add(new_log)
         db.commit()
         db.refresh(new_log)
+        event_bus.bump("activity")
         return new_log
     except Exception as e:
         db.rollback()
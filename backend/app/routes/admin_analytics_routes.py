@@ -1,13 +1,23 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.activity_logs_models import ActivityLog
+from app.models.analytics_rollups_models import AlumniRollup, GTSRollup
+from app.models.event_attendance_models import EventAttendance
 from app.models.events_models import Events
 from app.models.gts_responses_models import GTSResponses
 from app.models.users_models import Users
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import extract, func
-from sqlalchemy.orm import Session
+from app.utils.parallel_queries import gather_queries, server_timing
+from app.utils.presence import presence
+from app.utils.response_cache import (analytics_cache, attendance_cache, cube_cache,
+                                       distribution_cache)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import (ARRAY, BigInteger, Float, Integer, case, cast, extract, func,
+                        literal, or_, select, true, tuple_)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(
     prefix="/admin/analytics",
@@ -15,8 +25,8 @@ router = APIRouter(
 )
 
 @router.get("/")
-def get_admin_analytics(
-    db: Session = Depends(get_db),
+async def get_admin_analytics(
+    request: Request,
     start_year: int = Query(None, description="Filter analytics from this year onward"),
     end_year: int = Query(None, description="Filter analytics up to this year"),
     department: str = Query(None, description="Filter by course name"),
@@ -25,148 +35,541 @@ def get_admin_analytics(
     Returns full analytics dataset for the Admin Dashboard with optional filters:
     - start_year / end_year (for time range)
     - department (to filter alumni/GTS data by course)
+
+    Responses are cached per filter combination and carry an ETag; a poll
+    with a matching If-None-Match gets 304 without touching the database.
     """
+    # Empty and zero filters mean "no filter", so they share one cache entry
+    filters = (start_year or None, end_year or None, department or None)
+    timings = {}
+
+    async def compute():
+        results, query_timings = await gather_queries(analytics_queries(*filters))
+        timings.update(query_timings)
+        return build_analytics(results, *filters)
 
     try:
-        filters = []
-        gts_filters = []
-
-        # Handle year filtering (use extract for PostgreSQL)
-        if start_year:
-            gts_filters.append(extract("year", GTSResponses.submitted_at) >= start_year)
-        if end_year:
-            gts_filters.append(extract("year", GTSResponses.submitted_at) <= end_year)
-
-        # Handle department filtering (now using 'course')
-        if department:
-            filters.append(Users.course == department)
-
-        # Alumni-specific filters (role + department)
-        alumni_filters = [Users.role == 'alumni'] + filters
-
-        # BASIC COUNTS (unchanged)
-        total_alumni = db.query(func.count(Users.id)).filter(*alumni_filters).scalar()
-        active_alumni = db.query(func.count(Users.id)).filter(Users.is_active == True, *alumni_filters).scalar()
-        pending_approvals = db.query(func.count(Users.id)).filter(Users.is_approved == False, *alumni_filters).scalar()
-
-        # EMPLOYMENT RATE (unchanged - based on all responses)
-        total_responses = (
-            db.query(func.count(GTSResponses.id))
-            .join(Users, Users.id == GTSResponses.user_id)
-            .filter(*gts_filters, *filters)
-            .scalar()
-        )
-        employed_count = (
-            db.query(func.count(GTSResponses.id))
-            .join(Users, Users.id == GTSResponses.user_id)
-            .filter(GTSResponses.is_employed == True, *gts_filters, *filters)
-            .scalar()
-        )
-        employment_rate = (employed_count / total_responses * 100) if total_responses else 0
-
-        # GTS COMPLETION (updated to check for complete submissions)
-        def is_gts_complete(response):
-            # Define required fields for "completion" (adjust as needed)
-            required_fields = ['degree', 'year_graduated', 'occupation', 'is_employed', 'full_name']
-            return all(getattr(response, field, None) for field in required_fields)
-        
-        complete_responses = (
-            db.query(GTSResponses)
-            .join(Users, Users.id == GTSResponses.user_id)
-            .filter(*gts_filters, *filters)
-            .all()
-        )
-        gts_completed = sum(1 for r in complete_responses if is_gts_complete(r))
+        cached = await analytics_cache.get_or_compute(filters, compute)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # ACTIVE EVENTS (unchanged)
-        active_events = db.query(func.count(Events.id)).scalar()
+    response = analytics_cache.respond(request, cached)
+    response.headers["Server-Timing"] = server_timing(timings) if timings else "cache;desc=hit"
+    return response
 
-        # DEPARTMENTS (unchanged)
-        departments = db.query(Users.course).filter(*alumni_filters).distinct().count()
+def analytics_queries(start_year: Optional[int], end_year: Optional[int], department: Optional[str]) -> dict:
+    """The independent reads behind the analytics payload, run concurrently by gather_queries()"""
+    # Counts come from the rollup tables (see app/utils/analytics_rollup.py), which
+    # hold a handful of (course, year) buckets regardless of how many users and
+    # responses there are
+    alumni_query = select(AlumniRollup)
+    gts_query = select(GTSRollup)
+    if start_year:
+        gts_query = gts_query.where(GTSRollup.year >= start_year)
+    if end_year:
+        gts_query = gts_query.where(GTSRollup.year <= end_year)
+    if department:
+        alumni_query = alumni_query.where(AlumniRollup.course == department)
+        gts_query = gts_query.where(GTSRollup.course == department)
 
-        # RECENT LOGINS (unchanged)
-        last_7_days = datetime.utcnow() - timedelta(days=7)
-        recent_logins = (
-            db.query(func.count(Users.id))
-            .filter(Users.last_seen >= last_7_days, *alumni_filters) 
-            .scalar()
-        )
+    # RECENT LOGINS - time based, so still counted live
+    last_7_days = datetime.utcnow() - timedelta(days=7)
+    recently_seen = presence.seen_since(last_7_days)
+    alumni_filters = [Users.role == 'alumni']
+    if department:
+        alumni_filters.append(Users.course == department)
+    recent_logins_query = select(func.count(Users.id)).where(
+        or_(Users.last_seen >= last_7_days, Users.id.in_(recently_seen)), *alumni_filters
+    )
 
-        # EMPLOYMENT TREND (unchanged)
-        employment_trend = (
-            db.query(
-                extract("year", GTSResponses.submitted_at).label("year"),
-                func.count(GTSResponses.id).label("employed"),
-            )
-            .join(Users, Users.id == GTSResponses.user_id)
-            .filter(GTSResponses.is_employed == True, *gts_filters, *filters)
-            .group_by(extract("year", GTSResponses.submitted_at))
-            .order_by(extract("year", GTSResponses.submitted_at))
-            .all()
-        )
-        employment_trend_data = [{"year": int(y), "employed": e} for y, e in employment_trend]
-
-        # EVENT PARTICIPATION TREND
-        event_trend = (
-            db.query(
-                extract("month", Events.start_date).label("month"),  
-                func.count(Events.id).label("attendance"),
-            )
-            .group_by(extract("month", Events.start_date)) 
-            .order_by(extract("month", Events.start_date))
-            .all()
-        )
-        event_chart_data = [
-            {"month": datetime(2024, int(m), 1).strftime("%b"), "attendance": a}
-            for m, a in event_trend
-        ]
-
-        # GTS COMPLETION BY DEPARTMENT (updated to only count complete responses)
-        gts_by_department = (
-            db.query(Users.course, func.count(GTSResponses.id))
-            .join(GTSResponses, GTSResponses.user_id == Users.id)
-            .filter(*filters)
-            .filter(GTSResponses.id.in_([r.id for r in complete_responses if is_gts_complete(r)]))
-            .group_by(Users.course)
-            .all()
+    # EVENTS - total plus the per-month chart from one grouped query
+    event_month = extract("month", Events.start_date)
+    event_trend_query = (
+        select(event_month.label("month"), func.count(Events.id).label("attendance"))
+        .group_by(event_month)
+        .order_by(event_month)
+    )
+
+    # RECENT ACTIVITIES (unchanged)
+    recent_activities_query = (
+        select(ActivityLog.description, ActivityLog.created_at)
+        .order_by(ActivityLog.created_at.desc())
+        .limit(5)
+    )
+
+    async def all_scalars(db, stmt):
+        return (await db.scalars(stmt)).all()
+
+    async def all_rows(db, stmt):
+        return (await db.execute(stmt)).all()
+
+    return {
+        "alumni": lambda db: all_scalars(db, alumni_query),
+        "logins": lambda db: db.scalar(recent_logins_query),
+        "gts": lambda db: all_scalars(db, gts_query),
+        "events": lambda db: all_rows(db, event_trend_query),
+        "activities": lambda db: all_rows(db, recent_activities_query),
+    }
+
+def build_analytics(results: dict, start_year: Optional[int], end_year: Optional[int], department: Optional[str]) -> dict:
+    # ALUMNI COUNTS
+    alumni_buckets = results["alumni"]
+    total_alumni = sum(b.total for b in alumni_buckets)
+    active_alumni = sum(b.active for b in alumni_buckets)
+    pending_approvals = sum(b.pending for b in alumni_buckets)
+    # Alumni without a course count as one more department, like SELECT DISTINCT course
+    departments = sum(1 for b in alumni_buckets if b.total)
+
+    # GTS RESPONSES - employment rate, completion, employment trend and
+    # completion by department are all folded from the buckets
+    gts_buckets = results["gts"]
+    total_responses = sum(b.responses for b in gts_buckets)
+    employed_count = sum(b.employed for b in gts_buckets)
+    employment_rate = (employed_count / total_responses * 100) if total_responses else 0
+    gts_completed = sum(b.completed for b in gts_buckets)
+
+    employed_by_year = defaultdict(int)
+    complete_by_dept = defaultdict(int)
+    for b in gts_buckets:
+        # Year 0 holds responses without a submission date
+        if b.employed and b.year:
+            employed_by_year[b.year] += b.employed
+        if b.completed:
+            complete_by_dept[b.course] += b.completed
+
+    employment_trend_data = [
+        {"year": year, "employed": employed} for year, employed in sorted(employed_by_year.items())
+    ]
+    gts_by_dept_data = [
+        {"dept": dept or "Unspecified", "value": count} for dept, count in complete_by_dept.items()
+    ]
+
+    event_trend = results["events"]
+    active_events = sum(a for _, a in event_trend)
+    event_chart_data = [
+        {"month": datetime(2024, int(m), 1).strftime("%b"), "attendance": a}
+        for m, a in event_trend
+    ]
+
+    activities_data = [
+        {"description": desc, "timestamp": ts.strftime("%Y-%m-%d %H:%M")} for desc, ts in results["activities"]
+    ]
+
+    # FINAL RESPONSE
+    return {
+        "filters": {
+            "start_year": start_year,
+            "end_year": end_year,
+            "department": department,
+        },
+        "summary": {
+            "totalAlumni": total_alumni,
+            "activeAlumni": active_alumni,
+            "pendingApprovals": pending_approvals,
+            "employmentRate": round(employment_rate, 1),
+            "gtsCompleted": gts_completed,
+            "activeEvents": active_events,
+            "departments": departments,
+            "recentLogins": results["logins"],
+        },
+        "employmentTrend": employment_trend_data,
+        "chartData": event_chart_data,
+        "gtsByDept": gts_by_dept_data,
+        "recentActivities": activities_data,
+    }
+
+# Dimensions and measures the cube endpoint accepts, by public name
+CUBE_DIMENSIONS = {
+    "course": Users.course,
+    "batch_year": Users.batch_year,
+    "sex": GTSResponses.sex,
+    "year_graduated": GTSResponses.year_graduated,
+    "year_submitted": cast(extract("year", GTSResponses.submitted_at), Integer),
+    "employment_status": GTSResponses.employment_status,
+    "job_sector": GTSResponses.job_sector,
+    "place_of_work": GTSResponses.place_of_work,
+    "job_related_to_course": GTSResponses.job_related_to_course,
+}
+@dataclass(frozen=True)
+class CubeMeasure:
+    """
+    Aggregated in two steps: `partials` per finest-grain group (one pass over
+    the responses), then combine(*partials) over the subtotal groups.
+    """
+    partials: tuple
+    combine: Callable
+
+def counted(condition=None) -> CubeMeasure:
+    count = func.count(GTSResponses.id)
+    if condition is not None:
+        count = count.filter(condition)
+    return CubeMeasure((count,), lambda n: cast(func.sum(n), BigInteger))
+
+def averaged(column, digits: int) -> CubeMeasure:
+    return CubeMeasure(
+        (func.sum(column), func.count(column)),
+        lambda total, n: func.round(func.sum(total) / func.nullif(func.sum(n), 0), digits),
+    )
+
+CUBE_MEASURES = {
+    "responses": counted(),
+    "employed": counted(GTSResponses.is_employed.is_(True)),
+    "unemployed": counted(GTSResponses.is_employed.is_(False)),
+    "completed": counted(GTSResponses.is_complete),
+    "job_related": counted(GTSResponses.job_related_to_course.is_(True)),
+    "avg_months_to_first_job": averaged(GTSResponses.months_to_first_job, 1),
+    "avg_first_job_salary": averaged(GTSResponses.first_job_salary, 2),
+}
+CUBE_TOTALS = {
+    # every combination of the dimensions, down to the grand total
+    "cube": func.cube,
+    # subtotals along the dimension order only: (a, b, c), (a, b), (a), ()
+    "rollup": func.rollup,
+}
+CUBE_MAX_DIMENSIONS = 5
+
+def parse_names(value: str, allowed: dict, kind: str) -> tuple:
+    names = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {kind}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
         )
-        gts_by_dept_data = [
-            {"dept": dept or "Unspecified", "value": count} for dept, count in gts_by_department
-        ]
-
-        # RECENT ACTIVITIES (unchanged)
-        recent_activities = (
-            db.query(ActivityLog.description, ActivityLog.created_at)
-            .order_by(ActivityLog.created_at.desc())
-            .limit(5)
-            .all()
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail=f"Duplicate {kind}")
+    return names
+
+# Employment breakdown over any combination of dimensions, in a single grouped query
+@router.get("/cube")
+async def get_analytics_cube(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    dims: str = Query(..., description=f"Comma separated dimensions: {', '.join(CUBE_DIMENSIONS)}"),
+    measures: str = Query("responses", description=f"Comma separated measures: {', '.join(CUBE_MEASURES)}"),
+    totals: str = Query("cube", description="Subtotals to include: cube, rollup or none"),
+    start_year: int = Query(None, description="Only responses submitted from this year onward"),
+    end_year: int = Query(None, description="Only responses submitted up to this year"),
+    department: str = Query(None, description="Filter by course name"),
+):
+    """
+    Returns the breakdown as columns rather than rows:
+
+        {"dims": [...], "measures": [...], "rows": n,
+         "columns": {"<dim>": [...], ..., "<measure>": [...], ..., "grouping": [...]}}
+
+    With totals=cube or rollup the result also holds subtotal rows. In those
+    rows the rolled up dimensions are null; `grouping` tells them apart from
+    real nulls: bit (len(dims) - 1 - i) is set when dims[i] is rolled up, so
+    0 marks the full breakdown and 2**len(dims) - 1 the grand total.
+    """
+    dim_names = parse_names(dims, CUBE_DIMENSIONS, "dimensions")
+    measure_names = parse_names(measures, CUBE_MEASURES, "measures")
+    if not dim_names or not measure_names:
+        raise HTTPException(status_code=400, detail="At least one dimension and one measure are required")
+    if len(dim_names) > CUBE_MAX_DIMENSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {CUBE_MAX_DIMENSIONS} dimensions")
+    if totals not in CUBE_TOTALS and totals != "none":
+        raise HTTPException(status_code=400, detail="totals must be cube, rollup or none")
+
+    key = (dim_names, measure_names, totals, start_year or None, end_year or None, department or None)
+
+    async def compute():
+        return await compute_cube(db, *key)
+
+    cached = await cube_cache.get_or_compute(key, compute)
+    return cube_cache.respond(request, cached)
+
+async def compute_cube(
+    db: AsyncSession,
+    dim_names: tuple,
+    measure_names: tuple,
+    totals: str,
+    start_year: Optional[int],
+    end_year: Optional[int],
+    department: Optional[str],
+) -> dict:
+    # Finest grain first: one hash aggregate over the responses leaves a few
+    # thousand groups at most, and the subtotals are summed from those instead
+    # of re-sorting every response once per grouping set
+    dim_columns = [CUBE_DIMENSIONS[name] for name in dim_names]
+    partials = [
+        partial.label(f"{name}_{i}")
+        for name in measure_names
+        for i, partial in enumerate(CUBE_MEASURES[name].partials)
+    ]
+    year_submitted = CUBE_DIMENSIONS["year_submitted"]
+    finest = (
+        select(*[column.label(name) for name, column in zip(dim_names, dim_columns)], *partials)
+        .select_from(GTSResponses)
+        .join(Users, Users.id == GTSResponses.user_id)
+        .group_by(*dim_columns)
+    )
+    if start_year:
+        finest = finest.where(year_submitted >= start_year)
+    if end_year:
+        finest = finest.where(year_submitted <= end_year)
+    if department:
+        finest = finest.where(Users.course == department)
+    finest = finest.subquery()
+
+    dims_out = [finest.c[name] for name in dim_names]
+    measures_out = []
+    for name in measure_names:
+        measure = CUBE_MEASURES[name]
+        columns = [finest.c[f"{name}_{i}"] for i in range(len(measure.partials))]
+        measures_out.append(measure.combine(*columns).label(name))
+    group_by = [CUBE_TOTALS[totals](*dims_out)] if totals in CUBE_TOTALS else dims_out
+    grouping = func.grouping(*dims_out) if totals in CUBE_TOTALS else literal(0)
+
+    stmt = (
+        select(*dims_out, *measures_out, grouping.label("grouping"))
+        .group_by(*group_by)
+        .order_by(grouping, *dims_out)
+    )
+
+    rows = (await db.execute(stmt)).all()
+    names = [*dim_names, *measure_names, "grouping"]
+    columns = {name: list(values) for name, values in zip(names, zip(*rows))} if rows else {name: [] for name in names}
+    return {
+        "dims": list(dim_names),
+        "measures": list(measure_names),
+        "totals": totals,
+        "rows": len(rows),
+        "columns": columns,
+    }
+
+# Attendance funnel stages, each a count over event_attendance rows
+FUNNEL_COUNTS = {
+    "registered": func.count(EventAttendance.id).filter(EventAttendance.status == "registered"),
+    "declined": func.count(EventAttendance.id).filter(EventAttendance.status == "declined"),
+    "qr_issued": func.count(EventAttendance.id).filter(EventAttendance.qr_token.isnot(None)),
+    "scanned": func.count(EventAttendance.id).filter(EventAttendance.scanned_at.isnot(None)),
+}
+
+def percent(part: int, whole: int) -> float:
+    return round(part / whole * 100, 1) if whole else 0.0
+
+def funnel(row) -> dict:
+    counts = {name: getattr(row, name) for name in FUNNEL_COUNTS}
+    return {
+        **counts,
+        # Share of registrants who generated a QR code / were scanned in
+        "qr_rate": percent(counts["qr_issued"], counts["registered"]),
+        "attendance_rate": percent(counts["scanned"], counts["registered"]),
+        # Share of issued QR codes that were actually used
+        "scan_rate": percent(counts["scanned"], counts["qr_issued"]),
+        "decline_rate": percent(counts["declined"], counts["registered"] + counts["declined"]),
+    }
+
+# Registered/declined/QR issued/scanned counts and conversion rates per event, per month and overall
+@router.get("/attendance")
+async def get_attendance_analytics(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    start_date: date = Query(None, description="Only events starting on or after this date"),
+    end_date: date = Query(None, description="Only events starting on or before this date"),
+):
+    key = (start_date, end_date)
+
+    async def compute():
+        return await compute_attendance(db, start_date, end_date)
+
+    cached = await attendance_cache.get_or_compute(key, compute)
+    return attendance_cache.respond(request, cached)
+
+def attendance_funnel_query(start_date: Optional[date], end_date: Optional[date]):
+    # Each selected event counts its own attendance rows through a LATERAL
+    # subquery, an index range scan on ix_event_attendance_event_id_user_id,
+    # so a date filter only reads the attendance of the events it selects.
+    # The per-event rows are then summed over three grouping sets: per event,
+    # per month of the event's start date, and overall.
+    counts = (
+        select(*[count.label(name) for name, count in FUNNEL_COUNTS.items()])
+        .where(EventAttendance.event_id == Events.id)
+        .lateral("counts")
+    )
+
+    month = func.date_trunc("month", Events.start_date)
+    per_event = (Events.id, Events.title, Events.start_date)
+    grouping = func.grouping(Events.id, month)
+    stmt = (
+        select(
+            *per_event,
+            month.label("month"),
+            *[cast(func.coalesce(func.sum(counts.c[name]), 0), BigInteger).label(name) for name in FUNNEL_COUNTS],
+            grouping.label("grouping"),
         )
-        activities_data = [
-            {"description": desc, "timestamp": ts.strftime("%Y-%m-%d %H:%M")} for desc, ts in recent_activities
-        ]
+        .select_from(Events)
+        .join(counts, true())
+        .group_by(func.grouping_sets(tuple_(*per_event), tuple_(month), tuple_()))
+        .order_by(grouping, Events.start_date, Events.title, month)
+    )
+    if start_date:
+        stmt = stmt.where(Events.start_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Events.start_date <= end_date)
+    return stmt
+
+async def compute_attendance(db: AsyncSession, start_date: Optional[date], end_date: Optional[date]) -> dict:
+    events, months, overall = [], [], None
+    for row in (await db.execute(attendance_funnel_query(start_date, end_date))).all():
+        # grouping: 1 = per event (month rolled up), 2 = per month, 3 = overall
+        if row.grouping == 1:
+            events.append({
+                "event_id": row.id,
+                "title": row.title,
+                "start_date": row.start_date,
+                **funnel(row),
+            })
+        elif row.grouping == 2:
+            months.append({"month": row.month.strftime("%Y-%m"), **funnel(row)})
+        else:
+            overall = funnel(row)
 
-        # FINAL RESPONSE
+    return {
+        "filters": {"start_date": start_date, "end_date": end_date},
+        "overall": overall,
+        "months": months,
+        "events": events,
+    }
+
+EPOCH = date(1970, 1, 1)
+
+# Numeric tracer fields the distributions endpoint accepts. Dates are measured
+# in days since EPOCH inside the query and converted back in the response.
+DISTRIBUTION_FIELDS = {
+    "months_to_first_job": (GTSResponses.months_to_first_job, "months"),
+    "first_job_salary": (GTSResponses.first_job_salary, "amount"),
+    "job_start_date": (GTSResponses.job_start_date - EPOCH, "date"),
+    "year_graduated": (GTSResponses.year_graduated, "year"),
+}
+
+def parse_percentiles(value: str) -> tuple:
+    try:
+        percentiles = tuple(sorted({float(p) for p in value.split(",") if p.strip()}))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="percentiles must be numbers between 0 and 100")
+    if not percentiles or any(p < 0 or p > 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be numbers between 0 and 100")
+    return percentiles
+
+# Histograms, percentiles and mean/stddev of numeric GTS fields, computed in Postgres
+@router.get("/distributions")
+async def get_distributions(
+    request: Request,
+    fields: str = Query(",".join(DISTRIBUTION_FIELDS), description=f"Comma separated fields: {', '.join(DISTRIBUTION_FIELDS)}"),
+    bins: int = Query(10, ge=1, le=100, description="Number of equal-width histogram bins"),
+    percentiles: str = Query("10,25,50,75,90", description="Comma separated percentiles (0-100)"),
+    course: str = Query(None, description="Filter by the respondent's course"),
+    year_graduated: int = Query(None, description="Filter by graduation year"),
+):
+    field_names = parse_names(fields, DISTRIBUTION_FIELDS, "fields")
+    if not field_names:
+        raise HTTPException(status_code=400, detail="At least one field is required")
+    key = (field_names, bins, parse_percentiles(percentiles), course or None, year_graduated)
+
+    async def compute():
+        queries = {name: distribution_query(name, *key[1:]) for name in field_names}
+        results, _ = await gather_queries(queries)
         return {
-            "filters": {
-                "start_year": start_year,
-                "end_year": end_year,
-                "department": department,
-            },
-            "summary": {
-                "totalAlumni": total_alumni,
-                "activeAlumni": active_alumni,
-                "pendingApprovals": pending_approvals,
-                "employmentRate": round(employment_rate, 1),
-                "gtsCompleted": gts_completed,
-                "activeEvents": active_events,
-                "departments": departments,
-                "recentLogins": recent_logins,
-            },
-            "employmentTrend": employment_trend_data,
-            "chartData": event_chart_data,
-            "gtsByDept": gts_by_dept_data,
-            "recentActivities": activities_data,
+            "filters": {"course": course or None, "year_graduated": year_graduated},
+            "fields": {name: results[name] for name in field_names},
         }
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    cached = await distribution_cache.get_or_compute(key, compute)
+    return distribution_cache.respond(request, cached)
+
+def distribution_query(
+    name: str,
+    bins: int,
+    percentiles: tuple,
+    course: Optional[str],
+    year_graduated: Optional[int],
+):
+    """
+    One statement per field: a CTE of the non-null values, their summary
+    statistics, and a width_bucket histogram between the minimum and maximum.
+    Returns a gather_queries() callable producing the field's JSON.
+    """
+    column, unit = DISTRIBUTION_FIELDS[name]
+    values = (
+        select(cast(column, Float).label("x"))
+        .select_from(GTSResponses)
+        .where(column.isnot(None))
+    )
+    if course:
+        values = values.join(Users, Users.id == GTSResponses.user_id).where(Users.course == course)
+    if year_graduated:
+        values = values.where(GTSResponses.year_graduated == year_graduated)
+    values = values.cte("values")
+
+    x = values.c.x
+    stats = select(
+        func.count(x).label("count"),
+        func.avg(x).label("mean"),
+        func.stddev_samp(x).label("stddev"),
+        func.min(x).label("min"),
+        func.max(x).label("max"),
+        func.percentile_cont(literal([p / 100 for p in percentiles], ARRAY(Float))).within_group(x).label("percentiles"),
+    ).cte("stats")
+
+    # width_bucket puts the maximum itself in bucket bins + 1; fold it into the last bin
+    bucket = case(
+        (stats.c.max > stats.c.min, func.least(func.width_bucket(x, stats.c.min, stats.c.max, bins), bins)),
+        else_=1,
+    )
+    histogram = (
+        select(bucket.label("bucket"), func.count().label("n"))
+        .select_from(values)
+        .join(stats, true())
+        .group_by(bucket)
+        .cte("histogram")
+    )
+    stmt = (
+        select(stats, histogram.c.bucket, histogram.c.n)
+        .select_from(stats)
+        .outerjoin(histogram, true())
+        .order_by(histogram.c.bucket)
+    )
+
+    async def run(db: AsyncSession) -> dict:
+        rows = (await db.execute(stmt)).all()
+        return summarize_distribution(rows, unit, bins, percentiles)
+
+    return run
+
+def summarize_distribution(rows, unit: str, bins: int, percentiles: tuple) -> dict:
+    first = rows[0]
+    if not first.count:
+        return {"unit": unit, "count": 0, "mean": None, "stddev": None, "min": None, "max": None,
+                "percentiles": {}, "histogram": []}
+
+    # Dates are reported as ISO dates; their spread (stddev) stays in days
+    def value(v: float):
+        if unit == "date":
+            return (EPOCH + timedelta(days=round(v))).isoformat()
+        return round(v, 2)
+
+    low, high = first.min, first.max
+    width = (high - low) / bins if high > low else 0
+    counts = {row.bucket: row.n for row in rows if row.bucket is not None}
+    histogram = [
+        {
+            "from": value(low + i * width),
+            "to": value(low + (i + 1) * width if i < bins - 1 else high),
+            "count": counts.get(i + 1, 0),
+        }
+        for i in range(bins if width else 1)
+    ]
+
+    return {
+        "unit": unit,
+        "count": first.count,
+        "mean": value(first.mean),
+        "stddev": round(first.stddev, 2) if first.stddev is not None else None,
+        "min": value(low),
+        "max": value(high),
+        "percentiles": {f"p{p:g}": value(v) for p, v in zip(percentiles, first.percentiles)},
+        "histogram": histogram,
+    }
@@ -0,0 +1,65 @@
+from app.utils.activity_logger import activity_log_writer
+from app.utils.change_feed import change_feed
+from app.utils.event_bus import event_bus
+from app.utils.hashing_service import hashing_service
+from app.utils.pool_metrics import pool_status
+from app.utils.principal_cache import principal_cache
+from app.utils.report_jobs import report_jobs
+from app.utils.response_cache import analytics_cache, cube_cache
+from app.utils.revocation import revocation_list
+from fastapi import APIRouter
+
+router = APIRouter(
+    prefix="/admin/metrics",
+    tags=["Admin Metrics"]
+)
+
+# Hit/miss counters of the authentication principal cache
+@router.get("/principal-cache")
+def get_principal_cache_metrics():
+    return principal_cache.stats()
+
+# Connection pool occupancy plus checkout wait/hold histograms per engine
+@router.get("/pool")
+def get_pool_metrics():
+    return pool_status()
+
+# Password hashing queue depth, rejections and latency
+@router.get("/hashing")
+def get_hashing_metrics():
+    return hashing_service.stats()
+
+# Size of the in-memory token revocation list and rejected request count
+@router.get("/revocations")
+def get_revocation_metrics():
+    return revocation_list.stats()
+
+# Activity log write-behind queue depth and batch counters
+@router.get("/activity-log")
+def get_activity_log_metrics():
+    return activity_log_writer.stats()
+
+# Open /stream connections and event bus counters
+@router.get("/stream")
+def get_stream_metrics():
+    return event_bus.stats()
+
+# LISTEN/NOTIFY connection state and cross-worker message counters
+@router.get("/change-feed")
+def get_change_feed_metrics():
+    return change_feed.stats()
+
+# Hit ratio, entry count and 304 responses of the /admin/analytics/ response cache
+@router.get("/analytics-cache")
+def get_analytics_cache_metrics():
+    return analytics_cache.stats()
+
+# Same counters for the /admin/analytics/cube response cache
+@router.get("/cube-cache")
+def get_cube_cache_metrics():
+    return cube_cache.stats()
+
+# Report job pool occupancy, outcomes and artifact cache size
+@router.get("/report-jobs")
+def get_report_job_metrics():
+    return report_jobs.stats()
@@ -1,39 +1,150 @@
+import os
 from tempfile import NamedTemporaryFile
+from datetime import date
+from uuid import UUID
 
-from app.database import get_db
-from app.models.events_models import Events
-from app.models.gts_responses_models import GTSResponses
-from app.models.users_models import Users
-from app.utils.report_utils import generate_csv_report, generate_pdf_report
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from app.database import get_async_db
+from app.models.report_jobs_models import ReportJob
+from app.schemas.report_jobs_schemas import ReportFilters, ReportJobCreate, ReportJobOut
+from app.utils.report_jobs import report_jobs
+from app.utils.report_utils import (REPORT_QUERIES, render_report, stream_csv_report,
+                                    unsupported_filters)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 router = APIRouter(
     prefix="/admin/reports",
     tags=["Admin Reports"]
 )
 
+def report_filters(
+    course: str = Query(None, description="alumni, gts: course"),
+    start_year: int = Query(None, description="alumni: batch year, gts: graduation year, from"),
+    end_year: int = Query(None, description="alumni: batch year, gts: graduation year, up to"),
+    employment_status: str = Query(None, description="gts: employment status"),
+    start_date: date = Query(None, description="events: start date, gts: submission date, from"),
+    end_date: date = Query(None, description="events: start date, gts: submission date, up to"),
+) -> ReportFilters:
+    try:
+        return ReportFilters(
+            course=course,
+            start_year=start_year,
+            end_year=end_year,
+            employment_status=employment_status,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False, include_context=False))
+
+def applied_filters(report_type: str, filters: ReportFilters) -> dict:
+    applied = filters.applied()
+    unsupported = unsupported_filters(report_type, applied)
+    if unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The {report_type} report cannot be filtered by {', '.join(unsupported)}",
+        )
+    return applied
+
+def job_out(job: ReportJob) -> ReportJobOut:
+    status, error = report_jobs.status(job)
+    return ReportJobOut(
+        id=job.id,
+        report_type=job.report_type,
+        format=job.format,
+        filters=job.filters,
+        status=status,
+        from_cache=job.from_cache,
+        error=error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        download_url=f"/admin/reports/jobs/{job.id}/download" if status == "done" else None,
+    )
+
+# Queue a report to be rendered in the background; poll it with GET /admin/reports/jobs/{job_id}
+@router.post("/jobs", response_model=ReportJobOut, status_code=202)
+async def create_report_job(
+    payload: ReportJobCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    principal = getattr(request.state, "principal", None)
+    job = await report_jobs.submit(
+        db,
+        payload.report_type,
+        payload.format,
+        applied_filters(payload.report_type, payload.filters),
+        principal.id if principal is not None else None,
+    )
+    if job.status == "done":
+        # An identical report was already rendered from the same data
+        response.status_code = 200
+    return job_out(job)
+
+# Status of a report job
+@router.get("/jobs/{job_id}", response_model=ReportJobOut)
+async def get_report_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    return job_out(await report_jobs.get(db, job_id))
+
+# Download the file of a finished report job
+@router.get("/jobs/{job_id}/download")
+async def download_report_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    job = await report_jobs.get(db, job_id)
+    status, error = report_jobs.status(job)
+    if status == "failed":
+        raise HTTPException(status_code=409, detail=f"Report generation failed: {error}")
+    if status != "done":
+        raise HTTPException(status_code=409, detail="Report is not ready yet")
+    path = report_jobs.artifacts.get(job.artifact_key, job.format)
+    if path is None:
+        raise HTTPException(status_code=410, detail="Report has expired, please generate it again")
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"{job.report_type}_report.{job.format}",
+    )
+
+# Filters are applied in the query, so only the matching rows are read
 @router.get("/{report_type}")
-def generate_report(report_type: str, format: str = "pdf", db: Session = Depends(get_db)):
-    valid_reports = ["alumni", "events", "gts"]
-    if report_type not in valid_reports:
+def generate_report(
+    report_type: str,
+    format: str = "pdf",
+    filters: ReportFilters = Depends(report_filters),
+):
+    if report_type not in REPORT_QUERIES:
         raise HTTPException(status_code=400, detail="Invalid report type")
     if format not in ["pdf", "csv"]:
         raise HTTPException(status_code=400, detail="Invalid format")
+    applied = applied_filters(report_type, filters)
+
+    filename = f"{report_type}_report.{format}"
+    if format == "csv":
+        # Streamed straight from the database cursor, nothing is written to disk
+        return StreamingResponse(
+            stream_csv_report(report_type, applied),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
 
-    # Fetch data based on type
-    if report_type == "alumni":
-        data = db.query(Users).filter(Users.role == "alumni", Users.deleted_at.is_(None)).all()
-    elif report_type == "events":
-        data = db.query(Events).all()
-    elif report_type == "gts":
-        data = db.query(GTSResponses).all()
-
-    # Generate file
-    with NamedTemporaryFile(delete=False, suffix=f".{format}") as tmp:
-        if format == "csv":
-            generate_csv_report(data, report_type, tmp.name)
-        else:
-            generate_pdf_report(data, report_type, tmp.name)
-        return FileResponse(tmp.name, media_type="application/octet-stream", filename=f"{report_type}_report.{format}")
+    # Large PDFs are better requested through POST /admin/reports/jobs
+    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        path = tmp.name
+    try:
+        render_report(report_type, format, applied, path)
+    except Exception:
+        os.remove(path)
+        raise
+    # The file is removed once it has been sent
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=filename,
+        background=BackgroundTask(os.remove, path),
+    )
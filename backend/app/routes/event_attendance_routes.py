@@ -7,9 +7,11 @@ from uuid import UUID
 
 import qrcode
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import events_models, event_attendance_models
 from app.models.activity_logs_models import ActionType
 from app.models.events_models import Events
@@ -17,6 +19,7 @@ from app.models.users_models import Users
 from app.routes.users_routes import get_current_user
 from app.schemas.event_attendance_schemas import AttendanceOut, QRScanRequest
 from app.utils.activity_logger import log_activity
+from app.utils.event_bus import notify_changed
 
 router = APIRouter(
     prefix="/attendance",
@@ -27,15 +30,14 @@ def require_role(user: Users, role: str):
     if user.role != role:
         raise HTTPException(status_code=403, detail=f"Only {role}s can perform this action.")
 
-def get_event(db: Session, event_id: UUID):
-    event = db.query(events_models.Events).filter_by(id=event_id).first()
+async def get_event(db: AsyncSession, event_id: UUID):
+    event = await db.scalar(select(events_models.Events).filter_by(id=event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found.")
     return event
 
-def log_event_action(db: Session, user: Users, action_type: ActionType, event: events_models.Events):
+def log_event_action(user: Users, action_type: ActionType, event: events_models.Events):
     log_activity(
-        db=db,
         user_id=str(user.id),
         action_type=action_type,
         description=f"{user.firstname} {user.lastname} {action_type.value.replace('_', ' ')} event '{event.title}'",
@@ -46,14 +48,15 @@ def log_event_action(db: Session, user: Users, action_type: ActionType, event: e
             "location": event.location,
             "start_date": event.start_date.isoformat(),
             "end_date": event.end_date.isoformat()
-        }
+        },
+        user=user
     )
 
-def get_attendance_record(db: Session, event_id: UUID, user_id: UUID, create_if_missing=False):
-    record = db.query(event_attendance_models.EventAttendance).filter_by(
+async def get_attendance_record(db: AsyncSession, event_id: UUID, user_id: UUID, create_if_missing=False):
+    record = await db.scalar(select(event_attendance_models.EventAttendance).filter_by(
         event_id=event_id,
         user_id=user_id
-    ).first()
+    ))
     if not record and create_if_missing:
         record = event_attendance_models.EventAttendance(
             event_id=event_id,
@@ -61,16 +64,20 @@ def get_attendance_record(db: Session, event_id: UUID, user_id: UUID, create_if_
             status="registered"
         )
         db.add(record)
-        db.commit()
-        db.refresh(record)
+        await db.commit()
+        await db.refresh(record)
     return record
 
 @router.post("/scan")
-def scan_qr(body: QRScanRequest, db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
+async def scan_qr(body: QRScanRequest, db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user)):
     require_role(current_user, "admin")
 
     # Fetch attendance record by QR token
-    record = db.query(event_attendance_models.EventAttendance).filter_by(qr_token=body.token).first()
+    record = await db.scalar(
+        select(event_attendance_models.EventAttendance)
+        .options(selectinload(event_attendance_models.EventAttendance.user))
+        .filter_by(qr_token=body.token)
+    )
     if not record:
         raise HTTPException(status_code=404, detail="QR code not found.")
 
@@ -81,7 +88,7 @@ def scan_qr(body: QRScanRequest, db: Session = Depends(get_db), current_user: Us
             raise HTTPException(status_code=400, detail="QR invalid")
 
     # Fetch the associated event
-    event = get_event(db, record.event_id)
+    event = await get_event(db, record.event_id)
 
     # Compare datetime safely
     now = datetime.now()
@@ -101,33 +108,35 @@ def scan_qr(body: QRScanRequest, db: Session = Depends(get_db), current_user: Us
     record.is_valid = False
     record.scanned_at = now
     record.attended_at = now
-    db.commit()
+    await db.commit()
+    notify_changed("attendance")
 
     return {"message": f"Attendance for {record.user.firstname} {record.user.lastname} validated successfully."}
 
 @router.post("/{event_id}", response_model=AttendanceOut)
-def attend_event(event_id: UUID, db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
+async def attend_event(event_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user)):
     require_role(current_user, "alumni")
-    event = get_event(db, event_id)
+    event = await get_event(db, event_id)
 
-    record = get_attendance_record(db, event_id, current_user.id, create_if_missing=True)
+    record = await get_attendance_record(db, event_id, current_user.id, create_if_missing=True)
 
-    log_event_action(db, current_user, ActionType.attend_event, event)
+    log_event_action(current_user, ActionType.attend_event, event)
+    notify_changed("attendance")
     return record
 
 @router.post("/{event_id}/accept")
-def generate_qr_code(event_id: UUID, db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
+async def generate_qr_code(event_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user)):
     require_role(current_user, "alumni")
-    event = get_event(db, event_id)
+    event = await get_event(db, event_id)
 
-    record = get_attendance_record(db, event_id, current_user.id)
+    record = await get_attendance_record(db, event_id, current_user.id)
     if not record:
         raise HTTPException(status_code=400, detail="You must attend the event before generating a QR code.")
 
     if not record.qr_token:
         record.qr_token = str(uuid.uuid4())
-        db.commit()
-        db.refresh(record)
+        await db.commit()
+        await db.refresh(record)
 
     qr_data = json.dumps({"token": record.qr_token})
     buf = io.BytesIO()
@@ -137,11 +146,11 @@ def generate_qr_code(event_id: UUID, db: Session = Depends(get_db), current_user
     return {"qr_code": qr_b64, "token": record.qr_token}
 
 @router.post("/{event_id}/decline")
-def decline_event(event_id: UUID, db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
+async def decline_event(event_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user)):
     require_role(current_user, "alumni")
-    event = get_event(db, event_id)
+    event = await get_event(db, event_id)
 
-    record = get_attendance_record(db, event_id, current_user.id)
+    record = await get_attendance_record(db, event_id, current_user.id)
     if not record:
         record = event_attendance_models.EventAttendance(
             event_id=event_id,
@@ -152,13 +161,16 @@ def decline_event(event_id: UUID, db: Session = Depends(get_db), current_user: U
     else:
         record.status = "declined"
 
-    db.commit()
-    db.refresh(record)
+    await db.commit()
+    await db.refresh(record)
 
-    log_event_action(db, current_user, ActionType.decline_event, event)
+    log_event_action(current_user, ActionType.decline_event, event)
+    notify_changed("attendance")
     return record
 
 @router.get("/my-status")
-def get_my_attendance_status(db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
-    records = db.query(event_attendance_models.EventAttendance).filter_by(user_id=current_user.id).all()
+async def get_my_attendance_status(db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user)):
+    records = (await db.scalars(
+        select(event_attendance_models.EventAttendance).filter_by(user_id=current_user.id)
+    )).all()
     return [{"event_id": str(r.event_id), "status": r.status} for r in records]
@@ -1,13 +1,16 @@
 from datetime import datetime
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.events_models import Events
 from app.models.users_models import Users
 from app.routes.users_routes import get_current_user
 from app.schemas.events_schemas import EventCreate, EventOut
+from app.utils.event_bus import notify_changed
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 router = APIRouter(
     prefix="/events",
@@ -16,9 +19,9 @@ router = APIRouter(
 
 # Create Event (Admin only)
 @router.post("/create-event", response_model=EventOut)
-def create_event(
+async def create_event(
     event_in: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
     if current_user.role != "admin":
@@ -39,15 +42,16 @@ def create_event(
     )
 
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.commit()
+    await db.refresh(new_event)
+    notify_changed("events")
     
     return new_event
 
 # Get All Events (Admin + Alumni)
 @router.get("/", response_model=list[EventOut])
-def get_events(
-    db: Session = Depends(get_db),
+async def get_events(
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
     if current_user.role not in {"admin", "alumni"}:
@@ -55,11 +59,12 @@ def get_events(
 
     creator = aliased(Users)
     results = (
-        db.query(Events, creator.firstname, creator.lastname)
-        .join(creator, Events.created_by == creator.id)
-        .order_by(Events.start_date.asc())
-        .all()
-    )
+        await db.execute(
+            select(Events, creator.firstname, creator.lastname)
+            .join(creator, Events.created_by == creator.id)
+            .order_by(Events.start_date.asc())
+        )
+    ).all()
 
     event_list = []
     for event, firstname, lastname in results:
@@ -72,41 +77,43 @@ def get_events(
 
 # Update Event (Admin only)
 @router.put("/{event_id}", response_model=EventOut)
-def update_event(
+async def update_event(
     event_id: UUID,
     event_in: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    event = db.query(Events).filter(Events.id == event_id).first()
+    event = await db.scalar(select(Events).where(Events.id == event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
     for field, value in event_in.dict(exclude_unset=True).items():
         setattr(event, field, value)
 
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    notify_changed("events")
     
     return event
 
 # Delete Event (Admin only)
 @router.delete("/{event_id}")
-def delete_event(
+async def delete_event(
     event_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    event = db.query(Events).filter(Events.id == event_id).first()
+    event = await db.scalar(select(Events).where(Events.id == event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
+    notify_changed("events")
     return {"message": "Event deleted successfully"}
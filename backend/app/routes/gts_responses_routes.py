@@ -11,6 +11,7 @@ from app.schemas.gts_responses_schemas import (
     GTSResponsesOut, GTSResponsesPersonalUpdate, GTSResponsesProblemsUpdate,
     GTSResponsesServicesUpdate, GTSResponsesTrainingUpdate)
 from app.utils.auth import get_current_user
+from app.utils.event_bus import notify_changed
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, selectinload
 
@@ -82,6 +83,7 @@ def create_initial_gts_response(
     )
     db.add(gts_responses)
     db.commit()
+    notify_changed("gts")
     db.refresh(gts_responses)
     
     gts_responses.occupation = parse_pg_array(gts_responses.occupation)
@@ -124,6 +126,8 @@ def update_gts_response(
         setattr(gts, key, value)
         
     db.commit()
+        
+    notify_changed("gts")
     db.refresh(gts)
     
     gts.occupation = parse_pg_array(gts.occupation)
@@ -151,6 +155,8 @@ def update_educational_info(
         setattr(gts, key, value)
         
     db.commit()
+        
+    notify_changed("gts")
     db.refresh(gts)
     
     gts.occupation = parse_pg_array(gts.occupation)
@@ -203,6 +209,8 @@ def update_trainings_info(
             db.delete(training)
     
     db.commit()
+    
+    notify_changed("gts")
     db.refresh(gts)
     
     gts.occupation = parse_pg_array(gts.occupation)
@@ -230,6 +238,8 @@ def update_employment_info(
         setattr(gts, key, value)
         
     db.commit()
+        
+    notify_changed("gts")
     db.refresh(gts)
     
     gts.occupation = parse_pg_array(gts.occupation)
@@ -257,6 +267,8 @@ def update_job_satisfaction(
         setattr(gts, key, value)
 
     db.commit()
+
+    notify_changed("gts")
     db.refresh(gts)
     return gts
 
@@ -280,6 +292,8 @@ def update_services_from_csu(
         setattr(gts, key, value)
 
     db.commit()
+
+    notify_changed("gts")
     db.refresh(gts)
     return gts
 
@@ -303,5 +317,7 @@ def update_problems_issues(
         setattr(gts, key, value)
 
     db.commit()
+
+    notify_changed("gts")
     db.refresh(gts)
     return gts
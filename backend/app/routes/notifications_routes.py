@@ -1,42 +1,154 @@
-from typing import List
+import base64
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from app.database import get_db
-from app.models.activity_logs_models import ActivityLog
-from app.schemas.activity_logs_schemas import ActivityLogResponse
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from app.database import get_async_db
+from app.models.activity_logs_models import ActionType, ActivityLog
+from app.schemas.activity_logs_schemas import (ActivityLogResponse,
+                                               NotificationBulkRequest)
+from app.utils.event_bus import event_bus
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 router = APIRouter(
     prefix="/notifications", 
     tags=["Notifications"]
 )
 
+# Opaque keyset cursor: base64 of "<created_at isoformat>|<id>"
+def encode_cursor(log: ActivityLog) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/", response_model=List[ActivityLogResponse])
-def get_notifications(db: Session = Depends(get_db)):
-    """Return all activity logs (acts as notifications) ordered by newest first"""
-    logs = db.query(ActivityLog).order_by(ActivityLog.created_at.desc()).all()
+async def get_notifications(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Cursor; return entries older than it (next page)"),
+    after: Optional[str] = Query(None, description="Cursor; return entries newer than it"),
+    since: Optional[datetime] = Query(None, description="Only entries created after this time (for polling)"),
+    action_type: Optional[List[ActionType]] = Query(None),
+    is_read: Optional[bool] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Return activity logs (acts as notifications) ordered by newest first,
+    keyset-paginated on (created_at, id).
+    X-Next-Cursor is set when older entries remain (pass it as `before`);
+    X-Prev-Cursor points at the newest entry returned (pass it as `after` to poll).
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+
+    key = tuple_(ActivityLog.created_at, ActivityLog.id)
+    # The response carries no user data, so skip the joined relationships
+    stmt = select(ActivityLog).options(noload(ActivityLog.user), noload(ActivityLog.target_user))
+
+    if action_type:
+        stmt = stmt.where(ActivityLog.action_type.in_(action_type))
+    if is_read is not None:
+        # Rows from before is_read existed hold NULL, which means unread
+        stmt = stmt.where(ActivityLog.is_read.is_(True) if is_read else ActivityLog.is_read.isnot(True))
+    if date_from:
+        stmt = stmt.where(ActivityLog.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(ActivityLog.created_at <= date_to)
+    if since:
+        stmt = stmt.where(ActivityLog.created_at > since)
+
+    if after:
+        # Walk forward from the cursor, then flip back to newest-first
+        stmt = stmt.where(key > tuple_(*decode_cursor(after)))
+        stmt = stmt.order_by(ActivityLog.created_at.asc(), ActivityLog.id.asc())
+    else:
+        if before:
+            stmt = stmt.where(key < tuple_(*decode_cursor(before)))
+        stmt = stmt.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+
+    logs = (await db.scalars(stmt.limit(limit + 1))).all()
+    has_more = len(logs) > limit
+    logs = list(logs[:limit])
+
+    if after:
+        logs.reverse()
+        # More newer entries than fit in one page: the client should poll again right away
+        if has_more:
+            response.headers["X-More-After"] = "true"
+    elif has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(logs[-1])
+
+    if logs:
+        response.headers["X-Prev-Cursor"] = encode_cursor(logs[0])
+    elif after:
+        response.headers["X-Prev-Cursor"] = after
+
     return logs
 
 
+def bulk_condition(request: NotificationBulkRequest):
+    """WHERE clause shared by the bulk endpoints: the given ids, or everything at or before `up_to`"""
+    if (request.ids is None) == (request.up_to is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or up_to")
+    if request.ids is not None:
+        return ActivityLog.id.in_(request.ids)
+    return tuple_(ActivityLog.created_at, ActivityLog.id) <= tuple_(*decode_cursor(request.up_to))
+
+# Mark many notifications as read with a single UPDATE
+@router.patch("/read")
+async def mark_notifications_read(request: NotificationBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        update(ActivityLog)
+        # NULL (rows from before is_read existed) is unread too
+        .where(bulk_condition(request), ActivityLog.is_read.isnot(True))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return {"updated": result.rowcount}
+
+# Delete many notifications with a single DELETE
+@router.delete("/")
+async def delete_notifications(request: NotificationBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        delete(ActivityLog)
+        .where(bulk_condition(request))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    event_bus.bump("activity")
+    return {"deleted": result.rowcount}
+
 @router.patch("/{notif_id}/read")
-def mark_notification_read(notif_id: UUID, db: Session = Depends(get_db)):
-    notif = db.query(ActivityLog).filter_by(id=notif_id).first()
+async def mark_notification_read(notif_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    notif = await db.scalar(select(ActivityLog).filter_by(id=notif_id))
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
 
     notif.is_read = True
-    db.commit()
-    db.refresh(notif)
+    await db.commit()
+    await db.refresh(notif)
     return {"message": "Notification marked as read"}
 
 
 @router.delete("/{notif_id}")
-def delete_notification(notif_id: UUID, db: Session = Depends(get_db)):
-    notif = db.query(ActivityLog).filter_by(id=notif_id).first()
+async def delete_notification(notif_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    notif = await db.scalar(select(ActivityLog).filter_by(id=notif_id))
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    db.delete(notif)
-    db.commit()
+    await db.delete(notif)
+    await db.commit()
+    event_bus.bump("activity")
     return {"message": "Notification deleted"}
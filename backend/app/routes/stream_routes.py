@@ -0,0 +1,106 @@
+import asyncio
+import json
+from typing import Optional
+
+from app.config import settings
+from app.models.users_models import UserRole
+from app.utils.event_bus import StreamEvent, event_bus
+from app.utils.live_counters import live_counters
+from app.utils.stream_tickets import create_stream_ticket
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+router = APIRouter(
+    prefix="/stream",
+    tags=["Stream"]
+)
+
+# Counters are dashboard data; everything else mirrors what GET /notifications exposes
+ADMIN_ONLY_EVENTS = {"counters"}
+
+def format_event(event: StreamEvent) -> str:
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data, default=str)}\n\n"
+
+def format_control(event_type: str, data: dict = None) -> str:
+    # Control messages carry no id so they do not move the client's Last-Event-ID
+    return f"event: {event_type}\ndata: {json.dumps(data or {}, default=str)}\n\n"
+
+# EventSource cannot send headers, and an access token in the URL would end up in
+# access logs, so clients trade their token for a ticket and connect with ?ticket=.
+# Each ticket works once; fetch a new one for every (re)connect.
+@router.post("/ticket")
+async def issue_stream_ticket(request: Request):
+    return {
+        "ticket": create_stream_ticket(request.state.token_payload),
+        "expires_in": settings.STREAM_TICKET_TTL_SECONDS,
+    }
+
+# Server-Sent Events: new notifications, dashboard counters and "invalidate" hints.
+# Authenticated with a ticket from POST /stream/ticket (or the Authorization header).
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Resume point when reconnecting manually"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    principal = request.state.principal
+    is_admin = principal.role == UserRole.admin
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    # Reject with a real 503 while we still can; the generator subscribes lazily so a
+    # client that disconnects before the body starts never leaves a subscription behind
+    event_bus.check_capacity()
+
+    def visible(event: StreamEvent) -> bool:
+        return is_admin or event.type not in ADMIN_ONLY_EVENTS
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        # Bounded lifetime: clients reconnect (resuming from Last-Event-ID), which
+        # re-runs authentication and lets the process shut down promptly
+        closes_at = loop.time() + settings.STREAM_MAX_DURATION_SECONDS
+        try:
+            subscription, backlog, needs_reset = event_bus.subscribe(resume_from)
+        except HTTPException:
+            # Lost the race for the last slot since check_capacity()
+            yield format_control("busy")
+            return
+        try:
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n"
+            if needs_reset:
+                yield format_control("reset")
+            for event in backlog:
+                if visible(event):
+                    yield format_event(event)
+            if is_admin and (resume_from is None or needs_reset):
+                yield format_control("counters", await live_counters.snapshot())
+
+            while loop.time() < closes_at:
+                if await request.is_disconnected():
+                    break
+                if subscription.overflowed:
+                    # Too far behind to deliver everything; ask the client to refetch
+                    yield format_control("reset")
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.STREAM_HEARTBEAT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if visible(event):
+                    yield format_event(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering (nginx) so events are flushed immediately
+            "X-Accel-Buffering": "no",
+        },
+    )
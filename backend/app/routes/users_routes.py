@@ -4,26 +4,39 @@ from typing import List, Optional
 from uuid import UUID
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.activity_logs_models import ActionType
 from app.models.gts_responses_models import GTSResponses
 from app.models.users_models import UserRole, Users
-from app.schemas.users_schemas import (AdminUserCreate, AlumniRegister,
+from app.schemas.users_schemas import (AdminDashboardOut, AdminUserCreate,
+                                       AlumniRegister,
                                        ChangePasswordRequest,
                                        EmailCheckRequest, EmailCheckResponse,
                                        PhoneCheckRequest, PhoneCheckResponse,
-                                       PaginatedUserResponse, TokenResponse,
-                                       UserLogin, UsernameCheckRequest,
+                                       PaginatedUserResponse, RefreshTokenRequest,
+                                       TokenResponse, UserLogin,
+                                       UsernameCheckRequest,
                                        UsernameCheckResponse, UserOut,
                                        UserPendingApprovalOut, UserProfileOut)
 from app.utils.activity_logger import log_activity
 from app.utils.auth import get_current_user
 from app.utils.email_sender import send_email
-from app.utils.security import (create_access_token, hash_password,
-                                verify_password)
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from app.utils.event_bus import event_bus, notify_changed
+from app.utils.hashing_service import hashing_service
+from app.utils.live_counters import count_users
+from app.utils.parallel_queries import gather_queries, server_timing
+from app.utils.presence import presence
+from app.utils.principal_cache import principal_cache
+from app.utils.refresh_tokens import (issue_refresh_token, prune_user_tokens,
+                                      revoke_token_family, revoke_user_tokens,
+                                      rotate_refresh_token)
+from app.utils.revocation import revocation_list, revoke_token, revoke_user
+from app.utils.security import create_access_token
+from fastapi import (APIRouter, BackgroundTasks, Body, Depends, HTTPException,
+                     Query, Request, Response)
+from sqlalchemy import delete, func, or_, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 router = APIRouter(
@@ -33,9 +46,9 @@ router = APIRouter(
 
 # Email check
 @router.post("/check-email", response_model=EmailCheckResponse, tags=["public"])
-def check_email_availability(
+async def check_email_availability(
     request: EmailCheckRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     email = request.email.strip().lower()
     
@@ -46,10 +59,10 @@ def check_email_availability(
             message="Invalid Email Format"
         )
         
-    existing_user = db.query(Users).filter(
+    existing_user = await db.scalar(select(Users).where(
         Users.email.ilike(email),
         Users.deleted_at.is_(None)
-    ).first()
+    ))
         
     if existing_user:
         return EmailCheckResponse(
@@ -64,9 +77,9 @@ def check_email_availability(
 
 # Username check
 @router.post("/check-username", response_model=UsernameCheckResponse, tags=["public"])
-def check_username_availability(
+async def check_username_availability(
     request: UsernameCheckRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     username = request.username.strip()
 
@@ -76,10 +89,10 @@ def check_username_availability(
             message="Username must be at least 3 characters"
         )
 
-    existing_user = db.query(Users).filter(
+    existing_user = await db.scalar(select(Users).where(
         Users.username.ilike(username),
         Users.deleted_at.is_(None)
-    ).first()
+    ))
         
     if existing_user:
         return UsernameCheckResponse(
@@ -94,9 +107,9 @@ def check_username_availability(
 
 # Phone number check
 @router.post("/check-phone", response_model=PhoneCheckResponse, tags=["public"])
-def check_phone_availability(
+async def check_phone_availability(
     request: PhoneCheckRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     contact_number = request.contact_number.strip()
     
@@ -113,10 +126,10 @@ def check_phone_availability(
             message="Invalid phone number format"
         )
         
-    existing_user = db.query(Users).filter(
+    existing_user = await db.scalar(select(Users).where(
         Users.contact_number == contact_number,
         Users.deleted_at.is_(None)
-    ).first()
+    ))
         
     if existing_user:
         return PhoneCheckResponse(
@@ -129,16 +142,25 @@ def check_phone_availability(
         message="Phone number is available"
     )
 
-# Login with username or email; returns JWT token and user role
+# Login with username or email; returns JWT token, refresh token and user role
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(Users).where(
         (Users.username == credentials.identifier) | (Users.email == credentials.identifier)
-    ).first()
+    ))
 
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username/email or password")
+
+    valid, new_hash = await hashing_service.verify_and_update(credentials.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username/email or password")
 
+    # Argon2 parameters changed since this hash was made; store an upgraded one
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
     if not user.is_active or user.deleted_at:
         raise HTTPException(status_code=403, detail="Access Denied!")
 
@@ -147,55 +169,97 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
+    # Every login starts a new refresh token family
+    await prune_user_tokens(db, user.id)
+    _, refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
+
     log_activity(
-        db=db,
         user_id=user.id,
         action_type=ActionType.login,
         description=f"{user.role.value.capitalize()} - {user.firstname} {user.lastname} logged in",
         created_at=datetime.now(timezone.utc),
+        user=user,
+    )
+    # Online count may change; live counters pick this up
+    event_bus.bump("presence")
+
+    return TokenResponse(
+        token=token,
+        refresh_token=refresh_token,
+        role=user.role,
+        username=user.username,
+        is_approved=user.is_approved,
+    )
+
+# Exchange a refresh token for a new access token; the refresh token is rotated
+@router.post("/token/refresh", response_model=TokenResponse, tags=["public"])
+async def refresh_access_token(payload: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    user, refresh_token = await rotate_refresh_token(db, payload.refresh_token)
+
+    token = create_access_token(
+        data={"sub": user.username, "role": user.role.value},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
     return TokenResponse(
         token=token,
+        refresh_token=refresh_token,
         role=user.role,
         username=user.username,
         is_approved=user.is_approved,
     )
 
-# Logout endpoint
+# Logout endpoint; revokes the session's refresh token family when it is sent
 @router.post("/logout", status_code=200)
-def logout(
-    db: Session = Depends(get_db),
+async def logout(
+    request: Request,
+    payload: Optional[RefreshTokenRequest] = Body(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
+    if payload is not None:
+        await revoke_token_family(db, payload.refresh_token, current_user.id)
+
+    # The access token itself stops working immediately, not at its expiry
+    revocation = None
+    token_payload = getattr(request.state, "token_payload", None)
+    if token_payload is not None:
+        revocation = revoke_token(db, token_payload)
+
+    await db.commit()
+    if revocation is not None:
+        revocation_list.add(revocation)
+
     log_activity(
-        db=db,
         user_id=current_user.id,
         action_type=ActionType.logout,
         description=f"{current_user.role.value.capitalize()} - {current_user.firstname} {current_user.lastname} logged out",
-        created_at=datetime.now(timezone.utc)
+        created_at=datetime.now(timezone.utc),
+        user=current_user
     )
+    event_bus.bump("presence")
     
     return {"message": "Logged out successfully"}
 
 # Admin-only route to create Admin accounts (limits: 2 Admins)
 @router.post("/admin/create-user", response_model=UserOut, status_code=201)
-def create_user_as_admin(
+async def create_user_as_admin(
     user_data: AdminUserCreate,
     background_tasks: BackgroundTasks,
     current_user: Users = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Only admins can create users")
 
      # Check for existing email/username
-    if db.query(Users).filter(Users.email == user_data.email, Users.deleted_at.is_(None)).first():
+    if await db.scalar(select(Users).where(Users.email == user_data.email, Users.deleted_at.is_(None))):
         raise HTTPException(status_code=400, detail="Email already registered")
-    if db.query(Users).filter(Users.username == user_data.username, Users.deleted_at.is_(None)).first():
+    if await db.scalar(select(Users).where(Users.username == user_data.username, Users.deleted_at.is_(None))):
         raise HTTPException(status_code=400, detail="Username already registered")
     
-    admin_count = db.query(Users).filter(Users.role == UserRole.admin).count()
+    admin_count = await db.scalar(select(func.count(Users.id)).where(Users.role == UserRole.admin))
 
     if user_data.role == UserRole.admin and admin_count >= 2:
         raise HTTPException(status_code=400, detail="Maximum number of Admins (2) reached")
@@ -206,7 +270,7 @@ def create_user_as_admin(
     new_user = Users(
         username=user_data.username,
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hashing_service.hash(user_data.password),
         lastname=user_data.lastname,
         firstname=user_data.firstname,
         middle_initial=user_data.middle_initial,
@@ -216,18 +280,16 @@ def create_user_as_admin(
         is_approved=True 
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    try:
-        log_activity(
-            db=db,
-            user_id=current_user.id,
-            action_type=ActionType.register,
-            description=f"Admin created account for {new_user.firstname} {new_user.lastname} ({new_user.role.value})",
-            target_user_id=new_user.id
-        )
-    except Exception as e:
-         print(f"Error logging activity: {e}")
+    await db.commit()
+    await db.refresh(new_user)
+    notify_changed("users")
+    log_activity(
+        user_id=current_user.id,
+        action_type=ActionType.register,
+        description=f"Admin created account for {new_user.firstname} {new_user.lastname} ({new_user.role.value})",
+        target_user_id=new_user.id,
+        user=current_user
+    )
     role_display_name = {
         UserRole.admin: "Administrator",
     }
@@ -255,15 +317,15 @@ def create_user_as_admin(
 
 # Public endpoint for alumni registration (requires admin approval)
 @router.post("/register/alumni", tags=["public"], response_model=UserOut)
-def register_alumni(
+async def register_alumni(
     user_data: AlumniRegister,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check for existing email/username
-    if db.query(Users).filter(Users.email == user_data.email, Users.deleted_at.is_(None)).first():
+    if await db.scalar(select(Users).where(Users.email == user_data.email, Users.deleted_at.is_(None))):
         raise HTTPException(status_code=400, detail="Email already registered")
-    if db.query(Users).filter(Users.username == user_data.username, Users.deleted_at.is_(None)).first():
+    if await db.scalar(select(Users).where(Users.username == user_data.username, Users.deleted_at.is_(None))):
         raise HTTPException(status_code=400, detail="Username already registered")
 
     try:
@@ -271,7 +333,7 @@ def register_alumni(
         new_user = Users(
             username=user_data.username,
             email=user_data.email,
-            password_hash=hash_password(user_data.password),
+            password_hash=await hashing_service.hash(user_data.password),
             lastname=user_data.lastname,
             firstname=user_data.firstname,
             middle_initial=user_data.middle_initial,
@@ -287,21 +349,21 @@ def register_alumni(
             is_approved=False,
         )
         db.add(new_user)
-        db.flush()
-    
-        # Log alumni self-registration
-        log_activity(
-            db=db,
-            user_id=new_user.id,
-            action_type=ActionType.register,
-            description=f"Alumni {new_user.firstname} {new_user.lastname} registered an account"
-        )
-        db.commit()
+        await db.commit()
+        notify_changed("users")
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
+    # Log alumni self-registration; queued only once the user row exists
+    log_activity(
+        user_id=new_user.id,
+        action_type=ActionType.register,
+        description=f"Alumni {new_user.firstname} {new_user.lastname} registered an account",
+        user=new_user
+    )
+
     # Send confirmation email
     subject = "TRACE System - Registration Received"
     body = f"""\
@@ -317,23 +379,26 @@ def register_alumni(
 
     return new_user
 
+# Unapproved alumni registrations
+PENDING_ALUMNI = select(Users).where(Users.role == UserRole.alumni, Users.is_approved == False)
+
 # List all unapproved alumni registrations
 @router.get("/pending-alumni", response_model=List[UserPendingApprovalOut])
-def get_pending_alumni(db: Session = Depends(get_db)):
-    pending_alumni = db.query(Users).filter(Users.role == UserRole.alumni, Users.is_approved == False).all()
+async def get_pending_alumni(db: AsyncSession = Depends(get_async_db)):
+    pending_alumni = (await db.scalars(PENDING_ALUMNI)).all()
     return pending_alumni
 
 # List approved, non-archived users with optional filters (role, course, batch year)
 @router.get("/registered-users", response_model=PaginatedUserResponse)
-def get_registered_users(
+async def get_registered_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     role: Optional[str] = None,
     course: Optional[str] = None,
     batch_year: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(Users).filter(
+    query = select(Users).where(
         Users.is_approved == True,
         Users.deleted_at.is_(None)
     )
@@ -342,19 +407,19 @@ def get_registered_users(
     if role:
         try:
             role_enum = UserRole(role)
-            query = query.filter(Users.role == role_enum)
+            query = query.where(Users.role == role_enum)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid role")
 
     if course:
-        query = query.filter(Users.course == course)
+        query = query.where(Users.course == course)
     if batch_year:
-        query = query.filter(Users.batch_year == batch_year)
+        query = query.where(Users.batch_year == batch_year)
 
     # Pagination
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
     pages = (total + limit - 1) // limit
-    users = query.offset((page - 1) * limit).limit(limit).all()
+    users = (await db.scalars(query.offset((page - 1) * limit).limit(limit))).all()
 
     # Determine online status (active in last 5 minutes)
     now = datetime.utcnow()
@@ -362,8 +427,9 @@ def get_registered_users(
 
     users_out = []
     for user in users:
+        last_seen = max(filter(None, [presence.last_seen(user.id), user.last_seen]), default=None)
         user_data = UserProfileOut.from_orm(user).dict()
-        user_data["is_online"] = user.last_seen and user.last_seen > five_minutes_ago
+        user_data["is_online"] = last_seen and last_seen > five_minutes_ago
         user_data["is_active"] = user.is_active
         users_out.append(user_data)
 
@@ -377,81 +443,95 @@ def get_registered_users(
 
 # Set user as inactive (block); user must not be archived
 @router.patch("/{user_id}/block", status_code=204)
-def block_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.id == user_id).first()
+async def block_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(Users).where(Users.id == user_id))
     if not user or user.deleted_at:
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = False
-    db.commit() 
+    await revoke_user_tokens(db, user.id)
+    revocation = revoke_user(db, user.id)
+    await db.commit() 
+    revocation_list.add(revocation)
+    notify_changed("users")
+    principal_cache.invalidate(user.username)
     # Log blocking action
     log_activity(
-        db=db,
         user_id=str(user.id),
         action_type=ActionType.update,
         description=f"Blocked user - {user.firstname} {user.lastname}",
-        target_user_id=str(user.id)
+        target_user_id=str(user.id),
+        user=user
     )
  
 # Reactivate a previously blocked user
 @router.patch("/{user_id}/unblock", status_code=204)
-def unblock_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.id == user_id).first()
+async def unblock_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(Users).where(Users.id == user_id))
     if not user or user.deleted_at:
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = True
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.username)
+    notify_changed("users")
     log_activity(
-        db=db,
         user_id=str(user.id),
         action_type=ActionType.update,
         description=f"Unblocked user - {user.firstname} {user.lastname}",
-        target_user_id=str(user.id)
+        target_user_id=str(user.id),
+        user=user
     )
 
 # Archive user by setting deleted_at timestamp
 @router.delete("/{user_id}/archive", status_code=204)
-def archive_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.id == user_id).first()
+async def archive_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(Users).where(Users.id == user_id))
     if not user or user.deleted_at:
         raise HTTPException(status_code=404, detail="User not found")
     user.deleted_at = datetime.utcnow()
-    db.commit()
+    await revoke_user_tokens(db, user.id)
+    revocation = revoke_user(db, user.id)
+    await db.commit()
+    revocation_list.add(revocation)
+    notify_changed("users")
+    principal_cache.invalidate(user.username)
     log_activity(
-        db=db,
         user_id=str(user.id),
         action_type=ActionType.delete,
         description=f"Archived user - {user.firstname} {user.lastname}",
-        target_user_id=str(user.id)
+        target_user_id=str(user.id),
+        user=user
     )
     
 # Unarchive a user by unsetting deleted_at
 @router.patch("/{user_id}/unarchive", status_code=204)
-def unarchive_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.id == user_id).first()
+async def unarchive_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(Users).where(Users.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.deleted_at:
         raise HTTPException(status_code=400, detail="User is not archived")
     user.deleted_at = None  # Unset the timestamp
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.username)
+    notify_changed("users")
     # Log unarchiving action
     log_activity(
-        db=db,
         user_id=str(user.id),
         action_type=ActionType.update,
         description=f"Unarchived user - {user.firstname} {user.lastname}",
-        target_user_id=str(user.id)
+        target_user_id=str(user.id),
+        user=user
     )    
 
 # Approve pending user (typically alumni registration)
 @router.patch("/{user_id}/approve", status_code=status.HTTP_204_NO_CONTENT)
-def approve_user(
+async def approve_user(
     user_id: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
-    user = db.query(Users).filter(Users.id == UUID(user_id)).first()
+    user = await db.scalar(select(Users).where(Users.id == UUID(user_id)))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.is_approved:
@@ -459,7 +539,7 @@ def approve_user(
 
     try:
         user.is_approved = True
-        existing_gts = db.query(GTSResponses).filter(GTSResponses.user_id == user.id).first()
+        existing_gts = await db.scalar(select(GTSResponses).where(GTSResponses.user_id == user.id))
 
         if existing_gts:
             full_name = f"{user.firstname} {user.middle_initial + '.' if user.middle_initial else ''} {user.lastname} {user.name_extension or ''}".strip()
@@ -478,18 +558,20 @@ def approve_user(
             )
             db.add(gts_response)
 
-        db.commit()
+        await db.commit()
+        principal_cache.invalidate(user.username)
+        notify_changed("users", "gts")
 
         log_activity(
-            db=db,
             user_id=current_user.id,
             action_type=ActionType.approve,
             description=f"Approved alumni account of {user.firstname} {user.lastname}",
-            target_user_id=user.id
+            target_user_id=user.id,
+            user=current_user
         )
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to approve user: {str(e)}")
 
     subject = "Your Alumni Account Has Been Approved"
@@ -507,34 +589,36 @@ def approve_user(
 
 # Decline pending user by deleting record (only if not yet approved)
 @router.patch("/{user_id}/decline", status_code=status.HTTP_204_NO_CONTENT)
-def decline_user(
+async def decline_user(
     user_id: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
-    user = db.query(Users).filter(Users.id == UUID(user_id)).first()
+    user = await db.scalar(select(Users).where(Users.id == UUID(user_id)))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.is_approved:
         raise HTTPException(status_code=400, detail="User already approved, can't decline")
     try:
-        db.query(GTSResponses).filter(GTSResponses.user_id == user.id).delete()
+        await db.execute(delete(GTSResponses).where(GTSResponses.user_id == user.id))
+        await db.delete(user)
+        await db.commit()
+        principal_cache.invalidate(user.username)
+        notify_changed("users", "gts")
 
+        # The declined user row is gone, so the entry carries no target_user_id
         log_activity(
-            db=db,
             user_id=current_user.id, 
             action_type=ActionType.decline,
             description=f"Declined alumni registration of {user.firstname} {user.lastname}",
-            target_user_id=user.id,
-            meta_data=None
+            target_user_id=None,
+            meta_data=None,
+            user=current_user
         )
         
-        db.delete(user)
-        db.commit()
-        
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to decline user: {str(e)}")
         
     subject = "Alumni Registration Status"
@@ -552,10 +636,10 @@ def decline_user(
 
 # Get total user count and counts per role
 @router.get("/stats")
-def get_user_stats(db: Session = Depends(get_db)):
-    total_users = db.query(Users).count()
-    admins = db.query(Users).filter(Users.role == UserRole.admin).count()
-    alumni = db.query(Users).filter(Users.role == UserRole.alumni).count()
+async def get_user_stats(db: AsyncSession = Depends(get_async_db)):
+    total_users = await db.scalar(select(func.count(Users.id)))
+    admins = await db.scalar(select(func.count(Users.id)).where(Users.role == UserRole.admin))
+    alumni = await db.scalar(select(func.count(Users.id)).where(Users.role == UserRole.alumni))
     
     return {
         "total_users": total_users,
@@ -564,49 +648,53 @@ def get_user_stats(db: Session = Depends(get_db)):
     }
 # Count users who are active and not archived (i.e., not blocked or soft-deleted)
 @router.get("/active")
-def get_active_users(db: Session = Depends(get_db)):
-    active_users = db.query(Users).filter(Users.is_active == True, Users.deleted_at.is_(None)).count()
+async def get_active_users(db: AsyncSession = Depends(get_async_db)):
+    active_users = await db.scalar(
+        select(func.count(Users.id)).where(Users.is_active == True, Users.deleted_at.is_(None))
+    )
     return {"active_users": active_users}
 
 # Count users who are blocked (inactive) but not archived
 @router.get("/blocked")
-def get_blocked_users(db: Session = Depends(get_db)):
-    blocked_users = db.query(Users).filter(Users.is_active == False, Users.deleted_at.is_(None)).count()
+async def get_blocked_users(db: AsyncSession = Depends(get_async_db)):
+    blocked_users = await db.scalar(
+        select(func.count(Users.id)).where(Users.is_active == False, Users.deleted_at.is_(None))
+    )
     return {"blocked_users": blocked_users}
 
 # Count soft-deleted users (i.e., users with a non-null deleted_at)
 @router.get("/archived")
-def get_archived_count(db: Session = Depends(get_db)):
-    archived_users = db.query(Users).filter(Users.deleted_at.isnot(None)).count()
+async def get_archived_count(db: AsyncSession = Depends(get_async_db)):
+    archived_users = await db.scalar(select(func.count(Users.id)).where(Users.deleted_at.isnot(None)))
     return {"archived_users": archived_users}
 
 # List archived users (soft-deleted) with optional filters (role, course, batch year)
 @router.get("/archived-users", response_model=PaginatedUserResponse)
-def get_archived_users(
+async def get_archived_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     role: Optional[str] = None,
     course: Optional[str] = None,
     batch_year: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(Users).filter(Users.deleted_at.isnot(None))
+    query = select(Users).where(Users.deleted_at.isnot(None))
 
     if role:
         try:
             role_enum = UserRole(role)
-            query = query.filter(Users.role == role_enum)
+            query = query.where(Users.role == role_enum)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid role")
 
     if course:
-        query = query.filter(Users.course == course)
+        query = query.where(Users.course == course)
     if batch_year:
-        query = query.filter(Users.batch_year == batch_year)
+        query = query.where(Users.batch_year == batch_year)
 
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
     pages = (total + limit - 1) // limit
-    users = query.offset((page - 1) * limit).limit(limit).all()
+    users = (await db.scalars(query.offset((page - 1) * limit).limit(limit))).all()
 
     users_out = []
     for user in users:
@@ -622,49 +710,95 @@ def get_archived_users(
         "pages": pages
     }
 
-# Get users active in the last 5 minutes, not blocked or archived, with valid roles
-@router.get("/online", response_model=List[UserOut])
-def get_online_users(db: Session = Depends(get_db)):    
+# Users active in the last 5 minutes, not blocked or archived, with valid roles
+def online_users_query():
     five_minutes_ago = datetime.utcnow() - timedelta(minutes=5)
-    online_users = db.query(Users).filter(
-        Users.last_seen >= five_minutes_ago,
+    recently_seen = presence.seen_since(five_minutes_ago)
+    return select(Users).where(
+        or_(Users.last_seen >= five_minutes_ago, Users.id.in_(recently_seen)),
         Users.is_active == True,
         Users.is_approved == True,
         Users.deleted_at.is_(None),
         Users.role.in_([UserRole.admin, UserRole.alumni])
-    ).all()
+    )
+
+# Get users active in the last 5 minutes, not blocked or archived, with valid roles
+@router.get("/online", response_model=List[UserOut])
+async def get_online_users(db: AsyncSession = Depends(get_async_db)):    
+    online_users = (await db.scalars(online_users_query())).all()
 
     return online_users
 
 # Get current user
 @router.get("/me", response_model=UserProfileOut)
-def get_current_user_profile(current_user: Users = Depends(get_current_user)):
+async def get_current_user_profile(current_user: Users = Depends(get_current_user)):
     return current_user
 
-@router.post("/change-password", status_code=200)
-def change_password(
+# Everything the admin dashboard loads at once (counters, online and pending users,
+# current user); the reads run concurrently on separate pooled connections
+@router.get("/dashboard", response_model=AdminDashboardOut)
+async def get_admin_dashboard(response: Response, current_user: Users = Depends(get_current_user)):
+    if current_user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view the dashboard")
+
+    online = online_users_query()
+
+    async def all_scalars(db, stmt):
+        return (await db.scalars(stmt)).all()
+
+    results, timings = await gather_queries({
+        "counters": count_users,
+        "online": lambda db: all_scalars(db, online),
+        "pending": lambda db: all_scalars(db, PENDING_ALUMNI),
+    })
+    response.headers["Server-Timing"] = server_timing(timings)
+    return {**results, "me": current_user}
+
+# Changing the password signs out every other session; the caller gets a fresh token pair
+@router.post("/change-password", response_model=TokenResponse)
+async def change_password(
     request: ChangePasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Users = Depends(get_current_user)
 ):
-    if not verify_password(request.current_password, current_user.password_hash):
-        raise HTTPException(status_code=400, detail="Current password is incorrect")
-
     if request.new_password != request.confirm_new_password:
         raise HTTPException(status_code=400, detail="New passwords do not match")
 
-    if verify_password(request.new_password, current_user.password_hash):
+    valid, _ = await hashing_service.verify(request.current_password, current_user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+    # Same password is a plain comparison once the current one is verified
+    if request.new_password == request.current_password:
         raise HTTPException(status_code=400, detail="New password cannot be the same as the current password")
 
-    current_user.password_hash = hash_password(request.new_password)
-    db.commit()
+    current_user.password_hash = await hashing_service.hash(request.new_password)
+    await revoke_user_tokens(db, current_user.id)
+    revocation = revoke_user(db, current_user.id)
+    await db.commit()
+    revocation_list.add(revocation)
+    principal_cache.invalidate(current_user.username)
+
+    # Issued after the cutoff above, so these stay valid
+    token = create_access_token(
+        data={"sub": current_user.username, "role": current_user.role.value},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    _, refresh_token = await issue_refresh_token(db, current_user.id)
+    await db.commit()
 
     log_activity(
-        db=db,
         user_id=current_user.id,
         action_type=ActionType.update,
         description=f"{current_user.role.value.capitalize()} changed their password",
-        target_user_id=current_user.id
+        target_user_id=current_user.id,
+        user=current_user
     )
 
-    return {"message": "Password changed successfully"}
+    return TokenResponse(
+        token=token,
+        refresh_token=refresh_token,
+        role=current_user.role,
+        username=current_user.username,
+        is_approved=current_user.is_approved,
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -32,4 +32,9 @@ class ActivityLogResponse(ActivityLogBase):
         from_attributes = True
         json_encoders = {
             datetime: lambda v: v.astimezone(timezone.utc).isoformat()
-        }
\ No newline at end of file
+        }
+
+# Bulk mark-as-read / delete: either explicit ids or every entry up to a cursor
+class NotificationBulkRequest(BaseModel):
+    ids: Optional[List[UUID]] = None
+    up_to: Optional[str] = None
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, field_validator, model_validator
+
+class ReportFilters(BaseModel):
+    # alumni and gts (the respondent's course)
+    course: Optional[str] = None
+    # Inclusive; batch year for alumni, graduation year for gts
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    # gts only
+    employment_status: Optional[str] = None
+    # Inclusive; start date for events, submission date for gts
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @field_validator("course", "employment_status", mode="before")
+    def blank_to_none(cls, v):
+        if isinstance(v, str):
+            return v.strip() or None
+        return v
+
+    @model_validator(mode="after")
+    def validate_ranges(self):
+        if self.start_year is not None and self.end_year is not None and self.end_year < self.start_year:
+            raise ValueError('end_year must be on or after start_year')
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError('end_date must be on or after start_date')
+        return self
+
+    def applied(self) -> dict:
+        """The filters that are set, as stored with report jobs"""
+        return self.model_dump(mode="json", exclude_none=True)
+
+class ReportJobCreate(BaseModel):
+    report_type: Literal["alumni", "events", "gts"]
+    format: Literal["pdf", "csv"] = "pdf"
+    filters: ReportFilters = ReportFilters()
+
+class ReportJobOut(BaseModel):
+    id: UUID
+    report_type: str
+    format: str
+    filters: dict
+    # queued, running, done or failed
+    status: str
+    # True when an existing file was reused without rendering
+    from_cache: bool
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Set once the report is ready
+    download_url: Optional[str] = None
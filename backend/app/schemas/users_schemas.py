@@ -47,8 +47,12 @@ class ChangePasswordRequest(BaseModel):
 class AdminResetPasswordRequest(BaseModel):
     new_password: str = Field(..., min_length=6)
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
 class TokenResponse(BaseModel):
     token: str
+    refresh_token: Optional[str] = None
     role: UserRole
     is_approved: bool
     username: str
@@ -166,4 +170,20 @@ class PaginatedUserResponse(BaseModel):
     pages: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DashboardCountersOut(BaseModel):
+    total_users: int
+    admins: int
+    alumni: int
+    active_users: int
+    blocked_users: int
+    archived_users: int
+    pending_alumni: int
+    online_users: int
+
+class AdminDashboardOut(BaseModel):
+    counters: DashboardCountersOut
+    online: List[UserOut]
+    pending: List[UserPendingApprovalOut]
+    me: UserProfileOut
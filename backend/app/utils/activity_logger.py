@@ -1,51 +1,288 @@
+import logging
+import queue
+import threading
+import time
 from datetime import datetime, timezone
+from uuid import UUID
 
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
 from app.models.activity_logs_models import ActionType, ActivityLog
-from app.models.users_models import Users
-from sqlalchemy.orm import Session
+from app.models.users_models import UserRole, Users
+from app.utils.change_feed import Change, change_feed, publish_changes
+from app.utils.event_bus import event_bus
+from sqlalchemy import insert, select
+from sqlalchemy.orm import noload
+
+logger = logging.getLogger("activity_logger")
+
+# Actions still recorded for alumni whose registration is not yet approved
+UNAPPROVED_ALLOWED_ACTIONS = {ActionType.register, ActionType.login, ActionType.update}
+
+# The writer announces the inserted ids itself, so the generic bulk-statement hook is skipped
+INSERT_STATEMENT = insert(ActivityLog).execution_options(change_feed=False)
+
+def announce_inserts(db, ids: list) -> None:
+    publish_changes(db, [Change(ActivityLog.__tablename__, "i", [str(log_id) for log_id in ids])])
+
+def publish_notifications(rows: list, ids: list) -> None:
+    """Pushes stored entries to /stream listeners, shaped like ActivityLogResponse"""
+    # Silent version bump (no "invalidate" event): recent activities are part of cached analytics
+    event_bus.bump("activity")
+    for row, log_id in zip(rows, ids):
+        event_bus.publish("notification", {
+            "id": log_id,
+            "action_type": row["action_type"].value,
+            "description": row["description"],
+            "user_id": row["user_id"],
+            "target_user_id": row["target_user_id"],
+            "meta_data": row["meta_data"],
+            "is_read": False,
+            "created_at": row["created_at"].isoformat(),
+        })
+
+class ActivityLogWriter:
+    """
+    Write-behind queue for activity_logs.
+    log_activity() only enqueues; a background thread drains the queue and
+    writes each batch with a single multi-row INSERT once `batch_size`
+    entries are waiting or `flush_interval` seconds have passed.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue_size: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.written = 0
+        self.filtered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def enqueue(self, entry: dict) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            logger.error(f"Activity log queue full, dropped {entry['action_type']} entry")
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self) -> list:
+        """Blocks until `batch_size` entries are queued or the flush interval elapses"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self) -> list:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def flush(self) -> int:
+        """Writes everything currently queued; returns the number of rows inserted"""
+        written = 0
+        batch = self._drain()
+        while batch:
+            chunk, batch = batch[:self.batch_size], batch[self.batch_size:]
+            written += self._write(chunk)
+        return written
+
+    def shutdown(self) -> None:
+        """Stops the writer thread and persists whatever is still queued"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _write(self, batch: list) -> int:
+        with self._flush_lock:
+            db = SessionLocal()
+            try:
+                rows = self._filter_unapproved(db, batch)
+                if not rows:
+                    return 0
+                try:
+                    ids = db.scalars(
+                        INSERT_STATEMENT.returning(ActivityLog.id, sort_by_parameter_order=True),
+                        rows,
+                    ).all()
+                    announce_inserts(db, ids)
+                    db.commit()
+                except Exception as e:
+                    # One bad row (e.g. a user deleted meanwhile) must not lose the whole batch
+                    db.rollback()
+                    logger.warning(f"Batch insert of {len(rows)} activity logs failed, retrying row by row: {getattr(e, 'orig', e)}")
+                    return self._write_one_by_one(db, rows)
+
+                self.batches += 1
+                self.written += len(rows)
+                publish_notifications(rows, ids)
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                self.failed += len(batch)
+                logger.error(f"Failed to write {len(batch)} activity logs: {getattr(e, 'orig', e)}")
+                return 0
+            finally:
+                db.close()
+
+    def _write_one_by_one(self, db, rows: list) -> int:
+        written = 0
+        for row in rows:
+            try:
+                log_id = db.scalar(INSERT_STATEMENT.returning(ActivityLog.id), [row])
+                announce_inserts(db, [log_id])
+                db.commit()
+                written += 1
+                publish_notifications([row], [log_id])
+            except Exception as e:
+                db.rollback()
+                # Typically the user was deleted (e.g. declined) before the entry was flushed
+                self.failed += 1
+                logger.warning(f"Dropped activity log for user {row['user_id']}: {getattr(e, 'orig', e)}")
+        self.written += written
+        return written
+
+    def _filter_unapproved(self, db, batch: list) -> list:
+        """
+        Drops entries of unapproved alumni except for the allowed actions.
+        Entries logged with the user object were checked on enqueue; the rest
+        are resolved with one query per batch.
+        """
+        unchecked = set()
+        for entry in batch:
+            if entry.pop("_unchecked") and entry["action_type"] not in UNAPPROVED_ALLOWED_ACTIONS:
+                unchecked.add(entry["user_id"])
+
+        unapproved = set()
+        if unchecked:
+            unapproved = set(db.scalars(
+                select(Users.id).where(
+                    Users.id.in_(unchecked),
+                    Users.role == UserRole.alumni,
+                    Users.is_approved.is_(False),
+                )
+            ))
+
+        rows = []
+        for entry in batch:
+            if entry["user_id"] in unapproved and entry["action_type"] not in UNAPPROVED_ALLOWED_ACTIONS:
+                self.filtered += 1
+                continue
+            rows.append(entry)
+        return rows
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "written": self.written,
+            "batches": self.batches,
+            "filtered": self.filtered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+activity_log_writer = ActivityLogWriter(
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+    max_queue_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+)
+
+# Entries written by other workers are loaded once and pushed to this worker's streams
+async def _forward_remote_logs(change: Change) -> None:
+    if change.op == "d":
+        event_bus.bump("activity")
+    if change.op != "i" or not change.ids:
+        return
+    async with AsyncSessionLocal() as db:
+        logs = (await db.scalars(
+            select(ActivityLog)
+            .options(noload("*"))
+            .where(ActivityLog.id.in_(change.ids))
+            .order_by(ActivityLog.created_at, ActivityLog.id)
+        )).all()
+    publish_notifications(
+        [
+            {
+                "action_type": log.action_type,
+                "description": log.description,
+                "user_id": log.user_id,
+                "target_user_id": log.target_user_id,
+                "meta_data": log.meta_data,
+                "created_at": log.created_at,
+            }
+            for log in logs
+        ],
+        [log.id for log in logs],
+    )
+
+change_feed.on("activity_logs", _forward_remote_logs)
 
 def log_activity(
-    db: Session,
-    user_id: str,
+    user_id,
     action_type: ActionType,
     description: str,
-    target_user_id: str = None,
+    target_user_id=None,
     meta_data: dict = None,
-    created_at: datetime = None
+    created_at: datetime = None,
+    user: Users = None
 ):
     """
-    Creates a new activity log entry in the database.
-    Automatically handles DB commit and rollback safety.
-    
-    Automatically filters out activity logs for unapproved alumni users,
-    except for specific actions (register, login, update before approval).
+    Queues a new activity log entry; it is written asynchronously in a batch.
+    Never touches the caller's session.
+
+    Activity of unapproved alumni users is filtered out, except for specific
+    actions (register, login, update before approval). Pass the `user` that
+    `user_id` refers to when it is at hand so no lookup is needed.
     """
-    try: 
-        if created_at is None:
-            created_at = datetime.now(timezone.utc)
-        
-        user = db.query(Users).filter(Users.id == user_id).first()
-        
-        if user and user.role.value == "alumni" and not user.is_approved:
-            allowed_actions = {ActionType.register, ActionType.login, ActionType.update}
-            if action_type not in allowed_actions:
-                return None
-                
-        log_entry = ActivityLog(
-            user_id=user_id,
-            action_type=action_type,
-            description=description,
-            target_user_id=target_user_id,
-            meta_data=meta_data,
-            created_at=created_at
-        )
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-        
-        return log_entry
-    
-    except Exception as e:
-        db.rollback()
-        print(f"[ActivityLog Error] Failed to log activity: {e}")
-        return None
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+
+    if user is not None:
+        if user.role == UserRole.alumni and not user.is_approved and action_type not in UNAPPROVED_ALLOWED_ACTIONS:
+            activity_log_writer.filtered += 1
+            return
+
+    activity_log_writer.enqueue({
+        "user_id": UUID(str(user_id)),
+        "action_type": action_type,
+        "description": description,
+        "target_user_id": UUID(str(target_user_id)) if target_user_id else None,
+        "meta_data": meta_data,
+        "created_at": created_at,
+        "is_read": False,
+        "_unchecked": user is None,
+    })
@@ -0,0 +1,273 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from app.database import SessionLocal
+from app.models.analytics_rollups_models import AlumniRollup, GTSRollup
+from app.models.gts_responses_models import GTSResponses
+from app.models.users_models import UserRole, Users
+from sqlalchemy import (Integer, bindparam, cast, delete, event, exists, extract, func,
+                        insert, select, text)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("analytics_rollup")
+
+# Rollup keys; see analytics_rollups_models.py for the '' and 0 placeholders
+COURSE_KEY = func.coalesce(Users.course, "")
+YEAR_KEY = func.coalesce(cast(extract("year", GTSResponses.submitted_at), Integer), 0)
+
+# Attributes that can move a row between rollup buckets or change its counts
+USER_ATTRIBUTES = ("course", "role", "is_active", "is_approved")
+GTS_ATTRIBUTES = ("user_id", "submitted_at", "is_employed", "degree", "year_graduated", "occupation", "full_name")
+
+@dataclass
+class Tally:
+    """Signed per-bucket counts; old state is added with -1, new state with +1"""
+    alumni: dict = field(default_factory=lambda: defaultdict(lambda: [0, 0, 0]))
+    gts: dict = field(default_factory=lambda: defaultdict(lambda: [0, 0, 0]))
+
+    def add_alumni(self, row, sign: int) -> None:
+        counts = self.alumni[row.course]
+        counts[0] += sign
+        counts[1] += sign * bool(row.is_active)
+        counts[2] += sign * (row.is_approved is False)
+
+    def add_gts(self, row, sign: int) -> None:
+        counts = self.gts[(row.course, row.year)]
+        counts[0] += sign
+        counts[1] += sign * bool(row.employed)
+        counts[2] += sign * bool(row.completed)
+
+@dataclass
+class Changes:
+    """Rows touched by one flush or bulk statement"""
+    user_ids: set = field(default_factory=set)
+    gts_ids: set = field(default_factory=set)
+    # Users whose responses all change bucket (course changed, user deleted)
+    moved_user_ids: set = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.user_ids or self.gts_ids or self.moved_user_ids)
+
+# Statements are built once; the id lists are expanding parameters
+USER_ROWS = select(COURSE_KEY.label("course"), Users.role, Users.is_active, Users.is_approved).where(
+    Users.id.in_(bindparam("ids", expanding=True))
+)
+GTS_ROWS = (
+    select(
+        COURSE_KEY.label("course"),
+        YEAR_KEY.label("year"),
+        GTSResponses.is_employed.is_(True).label("employed"),
+        GTSResponses.is_complete.label("completed"),
+    )
+    .join(Users, Users.id == GTSResponses.user_id)
+)
+GTS_ROWS_BY_USER = GTS_ROWS.where(GTSResponses.user_id.in_(bindparam("ids", expanding=True)))
+GTS_ROWS_BY_ID = GTS_ROWS.where(GTSResponses.id.in_(bindparam("ids", expanding=True)))
+# Responses of moved users are already counted through their user
+GTS_ROWS_BY_ID_EXCEPT_USERS = GTS_ROWS_BY_ID.where(
+    GTSResponses.user_id.notin_(bindparam("user_ids", expanding=True))
+)
+
+# FOR UPDATE variants used for the "before" snapshot
+LOCKED = {
+    USER_ROWS: USER_ROWS.with_for_update(),
+    **{
+        stmt: stmt.with_for_update(of=[GTSResponses, Users])
+        for stmt in (GTS_ROWS_BY_USER, GTS_ROWS_BY_ID, GTS_ROWS_BY_ID_EXCEPT_USERS)
+    },
+}
+
+def _upsert(model, counters):
+    table = model.__table__
+    stmt = pg_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[column for column in table.primary_key],
+        set_={column: table.c[column] + stmt.excluded[column] for column in counters},
+    )
+
+ALUMNI_UPSERT = _upsert(AlumniRollup, ("total", "active", "pending"))
+GTS_UPSERT = _upsert(GTSRollup, ("responses", "employed", "completed"))
+
+def _tally(conn, changes: Changes, tally: Tally, sign: int, lock: bool) -> None:
+    """
+    Adds the current state of the changed rows to `tally`. With lock=True the
+    rows are locked FOR UPDATE, so concurrent writers serialize on them and
+    each computes its delta against the state it replaces.
+    """
+    def rows(stmt, **params):
+        return conn.execute(LOCKED[stmt] if lock else stmt, params)
+
+    if changes.user_ids:
+        for row in rows(USER_ROWS, ids=list(changes.user_ids)):
+            if row.role == UserRole.alumni:
+                tally.add_alumni(row, sign)
+
+    if changes.moved_user_ids:
+        for row in rows(GTS_ROWS_BY_USER, ids=list(changes.moved_user_ids)):
+            tally.add_gts(row, sign)
+
+    if changes.gts_ids:
+        if changes.moved_user_ids:
+            result = rows(GTS_ROWS_BY_ID_EXCEPT_USERS, ids=list(changes.gts_ids), user_ids=list(changes.moved_user_ids))
+        else:
+            result = rows(GTS_ROWS_BY_ID, ids=list(changes.gts_ids))
+        for row in result:
+            tally.add_gts(row, sign)
+
+def _apply(conn, tally: Tally) -> None:
+    """Adds the deltas to the rollup rows; keys are sorted so concurrent writers lock them in the same order"""
+    alumni = [
+        {"course": course, "total": total, "active": active, "pending": pending}
+        for course, (total, active, pending) in sorted(tally.alumni.items())
+        if total or active or pending
+    ]
+    if alumni:
+        conn.execute(ALUMNI_UPSERT, alumni)
+
+    gts = [
+        {"course": course, "year": year, "responses": responses, "employed": employed, "completed": completed}
+        for (course, year), (responses, employed, completed) in sorted(tally.gts.items())
+        if responses or employed or completed
+    ]
+    if gts:
+        conn.execute(GTS_UPSERT, gts)
+
+def _changed(obj, attributes) -> bool:
+    state = sa_inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in attributes)
+
+@event.listens_for(Session, "before_flush")
+def _snapshot_before_flush(session, flush_context, instances):
+    changes = Changes()
+    for obj in session.dirty:
+        if isinstance(obj, Users) and _changed(obj, USER_ATTRIBUTES):
+            changes.user_ids.add(obj.id)
+            if _changed(obj, ("course",)):
+                changes.moved_user_ids.add(obj.id)
+        elif isinstance(obj, GTSResponses) and _changed(obj, GTS_ATTRIBUTES):
+            changes.gts_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Users):
+            changes.user_ids.add(obj.id)
+            changes.moved_user_ids.add(obj.id)
+        elif isinstance(obj, GTSResponses):
+            changes.gts_ids.add(obj.id)
+
+    has_new = any(isinstance(obj, (Users, GTSResponses)) for obj in session.new)
+    if not changes and not has_new:
+        return
+
+    tally = Tally()
+    if changes:
+        _tally(session.connection(), changes, tally, -1, lock=True)
+    session.info["analytics_rollup"] = (changes, tally)
+
+@event.listens_for(Session, "after_flush")
+def _apply_after_flush(session, flush_context):
+    pending = session.info.pop("analytics_rollup", None)
+    if pending is None:
+        return
+    changes, tally = pending
+    # Primary keys of new rows are only assigned during the flush
+    for obj in session.new:
+        if isinstance(obj, Users):
+            changes.user_ids.add(obj.id)
+        elif isinstance(obj, GTSResponses):
+            changes.gts_ids.add(obj.id)
+
+    conn = session.connection()
+    _tally(conn, changes, tally, +1, lock=False)
+    _apply(conn, tally)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement(orm_execute_state):
+    # ORM-enabled update()/delete() bypass the flush: snapshot the matched rows
+    # around the statement. Statements that cannot affect the rollups opt out
+    # with .execution_options(analytics_rollup=False).
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get("analytics_rollup") is False:
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in (Users, GTSResponses):
+        return
+
+    conn = orm_execute_state.session.connection()
+    matched = select(model.id)
+    if orm_execute_state.statement.whereclause is not None:
+        matched = matched.where(orm_execute_state.statement.whereclause)
+    ids = set(conn.execute(matched).scalars())
+    if not ids:
+        return
+
+    changes = Changes(user_ids=ids, moved_user_ids=ids) if model is Users else Changes(gts_ids=ids)
+    tally = Tally()
+    _tally(conn, changes, tally, -1, lock=True)
+    result = orm_execute_state.invoke_statement()
+    _tally(conn, changes, tally, +1, lock=False)
+    _apply(conn, tally)
+    return result
+
+def rebuild(db: Session) -> dict:
+    """Recomputes both rollup tables from users and gts_responses"""
+    # Writers queue up on the rollup rows until the rebuilt tables are committed,
+    # then apply their deltas on top, so nothing is counted twice or lost
+    db.execute(text("LOCK TABLE analytics_alumni_rollup, analytics_gts_rollup IN EXCLUSIVE MODE"))
+    db.execute(delete(AlumniRollup))
+    db.execute(delete(GTSRollup))
+
+    db.execute(insert(AlumniRollup).from_select(
+        ["course", "total", "active", "pending"],
+        select(
+            COURSE_KEY,
+            func.count(Users.id),
+            func.count(Users.id).filter(Users.is_active.is_(True)),
+            func.count(Users.id).filter(Users.is_approved.is_(False)),
+        )
+        .where(Users.role == UserRole.alumni)
+        .group_by(COURSE_KEY),
+    ))
+    db.execute(insert(GTSRollup).from_select(
+        ["course", "year", "responses", "employed", "completed"],
+        select(
+            COURSE_KEY,
+            YEAR_KEY,
+            func.count(GTSResponses.id),
+            func.count(GTSResponses.id).filter(GTSResponses.is_employed.is_(True)),
+            func.count(GTSResponses.id).filter(GTSResponses.is_complete),
+        )
+        .join(Users, Users.id == GTSResponses.user_id)
+        .group_by(COURSE_KEY, YEAR_KEY),
+    ))
+    db.commit()
+    return {
+        "alumni_buckets": db.scalar(select(func.count()).select_from(AlumniRollup)),
+        "gts_buckets": db.scalar(select(func.count()).select_from(GTSRollup)),
+    }
+
+def ensure_built() -> None:
+    """Builds the rollups on startup when they are empty but there is data to count"""
+    db = SessionLocal()
+    try:
+        empty = not db.scalar(select(exists().select_from(AlumniRollup))) and not db.scalar(
+            select(exists().select_from(GTSRollup))
+        )
+        if empty and db.scalar(select(exists().where(Users.role == UserRole.alumni))):
+            logger.info(f"Built analytics rollups: {rebuild(db)}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to build analytics rollups: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.utils.analytics_rollup
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt analytics rollups: {rebuild(db)}")
+    finally:
+        db.close()
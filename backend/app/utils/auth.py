@@ -1,34 +1,55 @@
 import jwt
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.users_models import Users
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import PyJWTError as JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Users:
+# Async so it shares the request's AsyncSession with `async def` routes;
+# sync routes can depend on it too and read the returned user's columns.
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Users:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials or token expired",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get("sub")
-        if username is None:
+    # AuthMiddleware already verified the token and resolved the principal
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        if principal.deleted_at or not principal.is_active:
+            raise HTTPException(status_code=403, detail="User is blocked or deleted")
+
+        loaded_user = getattr(request.state, "user", None)
+        if loaded_user is not None:
+            # Attach the row loaded by the middleware without another SELECT
+            user = await db.merge(loaded_user, load=False)
+        else:
+            user = await db.get(Users, principal.id)
+    else:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM]
+            )
+            username: str = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
-    user = db.query(Users).filter(Users.username == username).first()
+        user = await db.scalar(select(Users).where(Users.username == username))
+
     if user is None:
         raise credentials_exception
 
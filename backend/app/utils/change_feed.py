@@ -0,0 +1,265 @@
+import asyncio
+import inspect
+import json
+import logging
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from uuid import uuid4
+
+import asyncpg
+from app.config import settings
+from app.database import DATABASE_URL
+from sqlalchemy import ARRAY, Text, bindparam, event, text
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("change_feed")
+
+# Tables whose writes are announced to the other workers
+WATCHED_TABLES = {
+    "users",
+    "events",
+    "event_attendance",
+    "gts_responses",
+    "activity_logs",
+    "token_revocations",
+}
+
+# Column changes that are not worth a message on their own (presence bookkeeping)
+IGNORED_COLUMNS = {"last_seen", "updated_at"}
+
+# NOTIFY payloads are limited to 8000 bytes; 150 UUIDs plus framing stay well below
+IDS_PER_MESSAGE = 150
+
+# Identifies this process so it can skip its own messages
+ORIGIN = uuid4().hex[:12]
+
+@dataclass(frozen=True)
+class Change:
+    table: str
+    # "i" (insert), "u" (update) or "d" (delete)
+    op: str
+    # Primary keys as strings; None when unknown (bulk UPDATE/DELETE), meaning
+    # any row of the table may have changed
+    ids: Optional[List[str]]
+
+def encode_payload(changes: List[Change]) -> str:
+    """
+    Message format (JSON, compact separators):
+
+        {"v": 1, "o": "<origin>", "c": [{"t": "<table>", "op": "i|u|d", "ids": ["<id>", ...] | null}, ...]}
+
+    v  format version
+    o  id of the sending process; receivers ignore their own messages
+    c  changes made by one flush or bulk statement; large id lists are split
+       over several messages
+    """
+    return json.dumps(
+        {"v": 1, "o": ORIGIN, "c": [{"t": c.table, "op": c.op, "ids": c.ids} for c in changes]},
+        separators=(",", ":"),
+    )
+
+def decode_payload(payload: str):
+    """Returns (origin, changes)"""
+    message = json.loads(payload)
+    return message["o"], [Change(c["t"], c["op"], c["ids"]) for c in message["c"]]
+
+def pack_messages(changes: List[Change]) -> List[str]:
+    """Encodes `changes` into as few payloads as possible, each within the NOTIFY size limit"""
+    messages, current, room = [], [], IDS_PER_MESSAGE
+    for change in changes:
+        if change.ids is None:
+            current.append(change)
+            continue
+        ids = change.ids
+        while ids:
+            if room == 0:
+                messages.append(current)
+                current, room = [], IDS_PER_MESSAGE
+            chunk, ids = ids[:room], ids[room:]
+            current.append(Change(change.table, change.op, chunk))
+            room -= len(chunk)
+    if current:
+        messages.append(current)
+    return [encode_payload(message) for message in messages]
+
+NOTIFY_STATEMENT = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+).bindparams(bindparam("payloads", type_=ARRAY(Text)))
+
+def publish_changes(session: Session, changes: List[Change]) -> None:
+    """
+    Queues NOTIFY messages in the session's current transaction. Postgres
+    delivers them only if the transaction commits, so rolled back writes are
+    never announced.
+    """
+    if not settings.CHANGE_FEED_ENABLED or not changes:
+        return
+    session.connection().execute(
+        NOTIFY_STATEMENT,
+        {"channel": settings.CHANGE_FEED_CHANNEL, "payloads": pack_messages(changes)},
+    )
+
+def _has_relevant_changes(obj) -> bool:
+    state = sa_inspect(obj)
+    return any(
+        state.attrs[attr.key].history.has_changes()
+        for attr in state.mapper.column_attrs
+        if attr.key not in IGNORED_COLUMNS
+    )
+
+@event.listens_for(Session, "after_flush")
+def _announce_flush(session, flush_context):
+    grouped = defaultdict(list)
+    for op, objects in (("i", session.new), ("u", session.dirty), ("d", session.deleted)):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table not in WATCHED_TABLES:
+                continue
+            if op == "u" and not _has_relevant_changes(obj):
+                continue
+            grouped[(table, op)].append(str(obj.id))
+    publish_changes(session, [Change(table, op, ids) for (table, op), ids in grouped.items()])
+
+@event.listens_for(Session, "do_orm_execute")
+def _announce_bulk_statement(orm_execute_state):
+    # ORM-enabled insert()/update()/delete() bypass the flush; the affected ids are
+    # unknown here. Statements that announce themselves opt out with
+    # .execution_options(change_feed=False).
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get("change_feed") is False:
+        return
+    mapper = orm_execute_state.bind_mapper
+    table = mapper.local_table.name if mapper is not None else None
+    if table not in WATCHED_TABLES:
+        return
+    op = "i" if orm_execute_state.is_insert else "u" if orm_execute_state.is_update else "d"
+    publish_changes(orm_execute_state.session, [Change(table, op, None)])
+
+class ChangeListener:
+    """
+    Consumes the change feed on a dedicated asyncpg connection (LISTEN needs
+    a session-level connection, so it does not come from the pools).
+    Messages from other workers are dispatched to the handlers registered
+    with on(). If the connection drops it reconnects with exponential
+    backoff; messages sent meanwhile are lost, so on_resync() handlers run
+    after every reconnect to drop whatever they cached.
+    """
+
+    def __init__(self, channel: str, dsn: str, max_backoff: float, healthcheck_interval: float):
+        self.channel = channel
+        self.dsn = dsn
+        self.max_backoff = max_backoff
+        self.healthcheck_interval = healthcheck_interval
+        self._handlers: dict[str, list[Callable]] = defaultdict(list)
+        self._resync_handlers: list[Callable] = []
+        self.connected = False
+        self.received = 0
+        self.own = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.last_message_at: Optional[datetime] = None
+
+    def on(self, table: str, handler: Callable) -> None:
+        """Registers handler(change) for `table`; it may be a coroutine function"""
+        self._handlers[table].append(handler)
+
+    def on_resync(self, handler: Callable) -> None:
+        """Registers handler() to run after a reconnect, when messages may have been missed"""
+        self._resync_handlers.append(handler)
+
+    async def run(self) -> None:
+        backoff = 1.0
+        first_connect = True
+        while True:
+            conn = None
+            try:
+                queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+                conn = await asyncpg.connect(self.dsn)
+                conn.add_termination_listener(lambda _: queue.put_nowait(None))
+                await conn.add_listener(self.channel, lambda *args: queue.put_nowait(args[-1]))
+                self.connected = True
+                backoff = 1.0
+                logger.info(f"Listening for changes on '{self.channel}'")
+                if not first_connect:
+                    self.reconnects += 1
+                    await self._resync()
+                first_connect = False
+                await self._consume(conn, queue)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change feed connection lost: {e}; reconnecting in {backoff:.0f}s")
+            finally:
+                self.connected = False
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+
+            # Jitter keeps workers from reconnecting in lockstep after a database restart
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _consume(self, conn, queue: asyncio.Queue) -> None:
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=self.healthcheck_interval)
+            except asyncio.TimeoutError:
+                # A half-open TCP connection never reports termination; probe it
+                await conn.fetchval("SELECT 1", timeout=5)
+                continue
+            if payload is None:
+                raise ConnectionError("connection terminated")
+            await self._dispatch(payload)
+
+    async def _dispatch(self, payload: str) -> None:
+        self.received += 1
+        self.last_message_at = datetime.now(timezone.utc)
+        try:
+            origin, changes = decode_payload(payload)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Malformed change feed message: {e}")
+            return
+        if origin == ORIGIN:
+            self.own += 1
+            return
+        for change in changes:
+            for handler in self._handlers.get(change.table, ()):
+                await self._call(handler, change)
+
+    async def _resync(self) -> None:
+        for handler in self._resync_handlers:
+            await self._call(handler)
+
+    async def _call(self, handler: Callable, *args) -> None:
+        try:
+            result = handler(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Change feed handler {getattr(handler, '__name__', handler)} failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.CHANGE_FEED_ENABLED,
+            "origin": ORIGIN,
+            "channel": self.channel,
+            "connected": self.connected,
+            "received": self.received,
+            "own": self.own,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "last_message_at": self.last_message_at,
+        }
+
+change_feed = ChangeListener(
+    channel=settings.CHANGE_FEED_CHANNEL,
+    dsn=settings.CHANGE_FEED_DATABASE_URL or DATABASE_URL,
+    max_backoff=settings.CHANGE_FEED_MAX_BACKOFF_SECONDS,
+    healthcheck_interval=settings.CHANGE_FEED_HEALTHCHECK_SECONDS,
+)
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.config import settings
+from app.utils.change_feed import Change, change_feed
+from fastapi import HTTPException
+
+@dataclass(frozen=True)
+class StreamEvent:
+    id: int
+    type: str
+    data: dict
+
+class Subscription:
+    """One /stream connection; events are delivered to its queue on the event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[StreamEvent]" = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind; the stream then asks it to resync
+        self.overflowed = False
+
+    def deliver(self, event: StreamEvent) -> None:
+        # Runs on self.loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+class EventBus:
+    """
+    In-process pub/sub feeding the /stream endpoint.
+    publish() may be called from any thread. Every event gets an increasing id
+    and is kept in a ring buffer of `replay_size` entries so reconnecting
+    clients can resume from their Last-Event-ID.
+    """
+
+    def __init__(self, max_connections: int, replay_size: int, queue_size: int):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self._buffer: "deque[StreamEvent]" = deque(maxlen=replay_size)
+        self._subscribers: set[Subscription] = set()
+        self._next_id = 1
+        # Bumped by notify_changed(); lets background publishers detect changes cheaply
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.rejected = 0
+        self.overflows = 0
+
+    def publish(self, event_type: str, data: dict) -> None:
+        with self._lock:
+            event = StreamEvent(self._next_id, event_type, data)
+            self._next_id += 1
+            self._buffer.append(event)
+            self.published += 1
+            for subscription in self._subscribers:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # Loop already closed (shutdown); the subscription is going away
+                    pass
+
+    def check_capacity(self) -> None:
+        with self._lock:
+            if len(self._subscribers) >= self.max_connections:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many open streams",
+                    headers={"Retry-After": "5"},
+                )
+
+    def subscribe(self, last_event_id: Optional[int] = None):
+        """
+        Registers a connection and returns (subscription, backlog, needs_reset).
+        `backlog` holds the buffered events after `last_event_id`; `needs_reset`
+        is True when some of them have already been evicted.
+        """
+        loop = asyncio.get_running_loop()
+        self.check_capacity()
+        with self._lock:
+            subscription = Subscription(loop, self.queue_size)
+            self._subscribers.add(subscription)
+
+            backlog: List[StreamEvent] = []
+            needs_reset = False
+            if last_event_id is not None:
+                oldest = self._buffer[0].id if self._buffer else self._next_id
+                # Ids from a previous process (higher than anything issued) also force a reset
+                needs_reset = last_event_id + 1 < oldest or last_event_id >= self._next_id
+                backlog = [event for event in self._buffer if event.id > last_event_id]
+            return subscription, backlog, needs_reset
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if subscription.overflowed:
+                self.overflows += 1
+
+    def bump(self, resource: str) -> None:
+        with self._lock:
+            self._versions[resource] = self._versions.get(resource, 0) + 1
+
+    def version(self, resource: str) -> int:
+        with self._lock:
+            return self._versions.get(resource, 0)
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": len(self._subscribers),
+                "max_connections": self.max_connections,
+                "published": self.published,
+                "last_event_id": self._next_id - 1,
+                "buffered": len(self._buffer),
+                "rejected": self.rejected,
+                "overflows": self.overflows,
+            }
+
+event_bus = EventBus(
+    max_connections=settings.STREAM_MAX_CONNECTIONS,
+    replay_size=settings.STREAM_REPLAY_SIZE,
+    queue_size=settings.STREAM_QUEUE_SIZE,
+)
+
+def notify_changed(*resources: str) -> None:
+    """
+    Tells connected clients that data behind `resources` (e.g. "users",
+    "events") changed so they refetch it instead of polling.
+    """
+    for resource in resources:
+        event_bus.bump(resource)
+        event_bus.publish("invalidate", {"resource": resource})
+
+# Writes made by other workers reach this worker's streams through the change feed
+TABLE_RESOURCES = {
+    "users": "users",
+    "events": "events",
+    "event_attendance": "attendance",
+    "gts_responses": "gts",
+}
+
+def _forward_change(change: Change) -> None:
+    notify_changed(TABLE_RESOURCES[change.table])
+
+for table in TABLE_RESOURCES:
+    change_feed.on(table, _forward_change)
+
+# Changes may have been missed while the feed was disconnected; clients refetch everything
+change_feed.on_resync(lambda: event_bus.publish("reset", {}))
@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+from app.config import settings
+from app.utils.pool_metrics import Histogram
+from app.utils.security import hash_password, ph
+from argon2.exceptions import InvalidHashError, VerificationError
+from fastapi import HTTPException
+
+# Executed inside the worker processes
+def _hash(password: str) -> str:
+    return hash_password(password)
+
+def _verify(hashed_password: str, plain_password: str) -> Tuple[bool, bool]:
+    try:
+        ph.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, ph.check_needs_rehash(hashed_password)
+
+class HashingService:
+    """
+    Runs Argon2 on a dedicated process pool so a burst of logins cannot
+    starve the request threadpool. At most `workers + queue_size` jobs are
+    accepted at once; anything beyond that is rejected with 503.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.latency = Histogram()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy, please try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.latency.observe((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> Tuple[bool, bool]:
+        """Returns (is_valid, needs_rehash) for the current Argon2 parameters"""
+        if not hashed_password:
+            return False, False
+        return await self._submit(_verify, hashed_password, plain_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, str]:
+        """
+        Verifies the password and, if the stored hash was made with outdated
+        parameters, returns a fresh hash to persist (otherwise None).
+        """
+        valid, needs_rehash = await self.verify(plain_password, hashed_password)
+        if valid and needs_rehash:
+            self.rehashed += 1
+            return True, await self.hash(plain_password)
+        return valid, None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "queued": max(self.in_flight - self.workers, 0),
+                "max_in_flight": self.max_in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "latency": self.latency.snapshot(),
+            }
+
+hashing_service = HashingService(
+    workers=settings.HASH_WORKERS,
+    queue_size=settings.HASH_QUEUE_SIZE,
+)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.database import AsyncSessionLocal
+from app.models.users_models import UserRole, Users
+from app.utils.event_bus import event_bus
+from app.utils.presence import presence
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger("live_counters")
+
+# Online status drifts without any write (users simply go quiet), so counters
+# are also recomputed this often while someone is listening
+ONLINE_REFRESH_SECONDS = 30
+
+# Resources whose invalidation can change a counter
+WATCHED_RESOURCES = ("users", "presence")
+
+async def count_users(db: AsyncSession) -> dict:
+    """All dashboard user counters in a single aggregate query"""
+    five_minutes_ago = datetime.utcnow() - timedelta(minutes=5)
+    not_archived = Users.deleted_at.is_(None)
+    online = or_(Users.last_seen >= five_minutes_ago, Users.id.in_(presence.seen_since(five_minutes_ago)))
+
+    stmt = select(
+        func.count(Users.id).label("total_users"),
+        func.count(Users.id).filter(Users.role == UserRole.admin).label("admins"),
+        func.count(Users.id).filter(Users.role == UserRole.alumni).label("alumni"),
+        func.count(Users.id).filter(Users.is_active.is_(True), not_archived).label("active_users"),
+        func.count(Users.id).filter(Users.is_active.is_(False), not_archived).label("blocked_users"),
+        func.count(Users.id).filter(Users.deleted_at.isnot(None)).label("archived_users"),
+        func.count(Users.id).filter(
+            Users.role == UserRole.alumni, Users.is_approved.is_(False), not_archived
+        ).label("pending_alumni"),
+        func.count(Users.id).filter(
+            online, Users.is_active.is_(True), Users.is_approved.is_(True), not_archived
+        ).label("online_users"),
+    )
+    row = (await db.execute(stmt)).one()
+    return dict(row._mapping)
+
+async def compute_counters() -> dict:
+    async with AsyncSessionLocal() as db:
+        return await count_users(db)
+
+class LiveCounters:
+    """Publishes a "counters" stream event whenever the dashboard numbers change"""
+
+    def __init__(self):
+        self.current: Optional[dict] = None
+        self._seen_versions: Optional[tuple] = None
+        self._last_refresh = 0.0
+
+    async def snapshot(self) -> dict:
+        if self.current is None:
+            self.current = await compute_counters()
+        return self.current
+
+    async def refresh(self) -> None:
+        counters = await compute_counters()
+        if counters != self.current:
+            self.current = counters
+            event_bus.publish("counters", counters)
+
+    async def tick(self, now: float) -> None:
+        versions = tuple(event_bus.version(resource) for resource in WATCHED_RESOURCES)
+        stale = now - self._last_refresh >= ONLINE_REFRESH_SECONDS
+        if versions == self._seen_versions and not stale:
+            return
+        # Nobody is listening: skip the query but remember to recompute on the next connect
+        if not event_bus.has_subscribers():
+            self.current = None
+            return
+        self._seen_versions = versions
+        self._last_refresh = now
+        await self.refresh()
+
+live_counters = LiveCounters()
+
+async def run_counter_publisher(interval_seconds: float):
+    """Background task: coalesces user changes into at most one counters query per interval"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await live_counters.tick(loop.time())
+        except Exception as e:
+            logger.error(f"Failed to refresh dashboard counters: {e}")
@@ -0,0 +1,48 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.config import settings
+from app.database import async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+Query = Callable[[AsyncSession], Awaitable[Any]]
+
+async def gather_queries(queries: Dict[str, Query]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Runs independent read queries concurrently, each on its own pooled
+    connection, so a request waits for the slowest query rather than the
+    sum of all of them. Returns ({name: result}, {name: milliseconds}).
+
+    At most PARALLEL_QUERY_LIMIT connections are checked out per call so one
+    request cannot drain the pool. Timings include waiting for a connection.
+    """
+    semaphore = asyncio.Semaphore(settings.PARALLEL_QUERY_LIMIT)
+    timings: Dict[str, float] = {}
+
+    async def run(name: str, query: Query):
+        async with semaphore:
+            started = time.perf_counter()
+            async with async_engine.connect() as conn:
+                # Each query is its own snapshot anyway; autocommit skips the
+                # BEGIN/ROLLBACK round trips a session would add per connection
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                async with AsyncSession(bind=conn) as db:
+                    result = await query(db)
+            timings[name] = (time.perf_counter() - started) * 1000
+            return result
+
+    tasks = [asyncio.ensure_future(run(name, query)) for name, query in queries.items()]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # Don't leave the other queries holding connections
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return dict(zip(queries, results)), timings
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Formats timings as a Server-Timing header value (shown in the browser's network panel)"""
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
@@ -0,0 +1,129 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (milliseconds) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+            self.total += 1
+            self.sum_ms += value_ms
+            self.max_ms = max(self.max_ms, value_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={b}ms" for b in self.bounds] + [f">{self.bounds[-1]}ms"]
+            return {
+                "count": self.total,
+                "avg_ms": round(self.sum_ms / self.total, 3) if self.total else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait = Histogram()
+        self.held = Histogram()
+
+class _InstrumentedPoolMixin:
+    """Times every connection checkout, including the wait for a free slot"""
+    metrics: PoolMetrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.wait.observe((time.perf_counter() - started) * 1000)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+_registry: dict[str, tuple[object, PoolMetrics]] = {}
+
+def instrument(engine, name: str) -> PoolMetrics:
+    """Attach checkout/checkin listeners to the engine's pool and register it for pool_status()"""
+    pool = engine.pool
+    metrics = PoolMetrics(name)
+    pool.metrics = metrics
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.held.observe((time.perf_counter() - started) * 1000)
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    _registry[name] = (engine, metrics)
+    return metrics
+
+def pool_status() -> dict:
+    """Current occupancy and checkout histograms for every instrumented pool"""
+    status = {}
+    for name, (engine, metrics) in _registry.items():
+        # Read engine.pool each time: dispose() swaps in a recreated pool
+        pool = engine.pool
+        current = {
+            "pool_class": type(pool).__name__,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "connects": metrics.connects,
+            "invalidations": metrics.invalidations,
+            "wait": metrics.wait.snapshot(),
+            "held": metrics.held.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            current.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        status[name] = current
+    return status
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.models.users_models import Users
+from sqlalchemy import DateTime, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger("presence")
+
+# Flushed entries are kept this long so readers never see a gap between
+# the buffer being drained and the UPDATE becoming visible.
+RETENTION = timedelta(minutes=10)
+
+class PresenceTracker:
+    """
+    Write-behind buffer for Users.last_seen.
+    Requests record activity in memory with touch(); flush() persists every
+    pending timestamp in a single UPDATE ... FROM (VALUES ...) statement.
+    """
+
+    def __init__(self):
+        self._seen: dict[UUID, datetime] = {}
+        self._dirty: set[UUID] = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def touch(self, user_id: UUID, now: datetime = None) -> None:
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._seen[user_id] = now
+            self._dirty.add(user_id)
+
+    def last_seen(self, user_id: UUID) -> Optional[datetime]:
+        with self._lock:
+            return self._seen.get(user_id)
+
+    def seen_since(self, cutoff: datetime) -> List[UUID]:
+        with self._lock:
+            return [user_id for user_id, seen in self._seen.items() if seen >= cutoff]
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._dirty)
+
+    def flush(self) -> int:
+        """Persist buffered timestamps; returns the number of users written"""
+        with self._flush_lock:
+            with self._lock:
+                batch = [(user_id, self._seen[user_id]) for user_id in self._dirty]
+                self._dirty.clear()
+
+            if batch:
+                rows = values(
+                    column("id", PG_UUID(as_uuid=True)),
+                    column("last_seen", DateTime),
+                    name="presence",
+                ).data(batch)
+                stmt = (
+                    update(Users)
+                    .where(Users.id == rows.c.id)
+                    .values(last_seen=rows.c.last_seen)
+                    # Presence is per worker and never changes analytics counts or reports
+                    .execution_options(change_feed=False, analytics_rollup=False)
+                )
+
+                db = SessionLocal()
+                try:
+                    db.execute(stmt)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    with self._lock:
+                        self._dirty.update(user_id for user_id, _ in batch)
+                    logger.error(f"Failed to flush presence for {len(batch)} users: {e}")
+                    return 0
+                finally:
+                    db.close()
+
+            self._prune()
+            return len(batch)
+
+    def _prune(self) -> None:
+        cutoff = datetime.utcnow() - RETENTION
+        with self._lock:
+            stale = [
+                user_id for user_id, seen in self._seen.items()
+                if seen < cutoff and user_id not in self._dirty
+            ]
+            for user_id in stale:
+                del self._seen[user_id]
+
+presence = PresenceTracker()
+
+async def run_presence_flusher(interval_seconds: float):
+    """Background task: flush the presence buffer every `interval_seconds`"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_in_threadpool(presence.flush)
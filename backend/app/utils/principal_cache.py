@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.config import settings
+from app.models.users_models import UserRole, Users
+from app.utils.change_feed import Change, change_feed
+
+@dataclass(frozen=True)
+class Principal:
+    """Compact snapshot of the columns needed to authorize a request"""
+    id: UUID
+    username: str
+    role: UserRole
+    is_active: bool
+    deleted_at: Optional[datetime]
+    is_approved: bool
+
+    @classmethod
+    def from_user(cls, user: Users) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            is_active=bool(user.is_active),
+            deleted_at=user.deleted_at,
+            is_approved=bool(user.is_approved),
+        )
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of Principal snapshots keyed by username.
+    Entries expire after `ttl_seconds`; the least recently used entry
+    is evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, username: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._entries[username]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return principal
+
+    def set(self, principal: Principal) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.username] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def invalidate_ids(self, user_ids) -> None:
+        """Drops the entries of the given user ids (as strings)"""
+        user_ids = set(user_ids)
+        with self._lock:
+            for username in [
+                username for username, (_, principal) in self._entries.items()
+                if str(principal.id) in user_ids
+            ]:
+                del self._entries[username]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Users changed by another worker (blocked, archived, role change, ...)
+def _invalidate_changed_users(change: Change) -> None:
+    if change.ids is None:
+        principal_cache.clear()
+    else:
+        principal_cache.invalidate_ids(change.ids)
+
+change_feed.on("users", _invalidate_changed_users)
+change_feed.on_resync(principal_cache.clear)
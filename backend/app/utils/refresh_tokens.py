@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.config import settings
+from app.models.refresh_tokens_models import RefreshToken
+from app.models.users_models import Users
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+logger = logging.getLogger("refresh_tokens")
+
+def hash_refresh_token(raw_token: str) -> str:
+    # Refresh tokens are 384 random bits, so a plain digest is enough (no Argon2)
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+    )
+
+async def issue_refresh_token(
+    db: AsyncSession,
+    user_id: UUID,
+    family_id: Optional[UUID] = None,
+) -> Tuple[RefreshToken, str]:
+    """
+    Adds a new refresh token to the session and returns (row, raw_token).
+    A new family is started unless `family_id` is given. The caller commits.
+    """
+    raw_token = secrets.token_urlsafe(48)
+    row = RefreshToken(
+        id=uuid4(),
+        user_id=user_id,
+        family_id=family_id or uuid4(),
+        token_hash=hash_refresh_token(raw_token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    db.add(row)
+    return row, raw_token
+
+async def rotate_refresh_token(db: AsyncSession, raw_token: str) -> Tuple[Users, str]:
+    """
+    Exchanges a refresh token for a new one in the same family and returns
+    (user, new_raw_token). Presenting a token that was already rotated out
+    is treated as theft and the whole family is revoked, unless it was
+    rotated within the last REFRESH_TOKEN_REUSE_GRACE_SECONDS (another tab
+    refreshing at the same time); that request gets its own token in the
+    same family.
+    """
+    now = datetime.now(timezone.utc)
+
+    # Lock the row so two concurrent refreshes cannot both rotate it
+    current = await db.scalar(
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(raw_token))
+        .with_for_update()
+    )
+    if current is None:
+        raise _invalid_refresh_token()
+
+    if current.revoked_at is not None and not await _recently_rotated(db, current, now):
+        logger.warning(f"Refresh token reuse detected for user {current.user_id}; revoking family {current.family_id}")
+        await revoke_family(db, current.family_id)
+        await db.commit()
+        raise _invalid_refresh_token()
+
+    if current.expires_at <= now:
+        raise _invalid_refresh_token()
+
+    user = await db.get(Users, current.user_id)
+    if user is None or not user.is_active or user.deleted_at:
+        await revoke_family(db, current.family_id)
+        await db.commit()
+        raise HTTPException(status_code=403, detail="Access Denied!")
+
+    new_row, new_raw_token = await issue_refresh_token(db, user.id, family_id=current.family_id)
+    if current.revoked_at is None:
+        current.revoked_at = now
+        current.replaced_by = new_row.id
+    await db.commit()
+
+    return user, new_raw_token
+
+async def _recently_rotated(db: AsyncSession, token: RefreshToken, now: datetime) -> bool:
+    """True if `token` was rotated (not revoked) moments ago and its family is still live"""
+    if token.replaced_by is None:
+        return False
+    if now - token.revoked_at > timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+        return False
+    live = await db.scalar(
+        select(RefreshToken.id)
+        .where(RefreshToken.family_id == token.family_id, RefreshToken.revoked_at.is_(None))
+        .limit(1)
+    )
+    return live is not None
+
+async def revoke_family(db: AsyncSession, family_id: UUID) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+async def revoke_token_family(db: AsyncSession, raw_token: str, user_id: UUID) -> None:
+    """Revokes the family of `raw_token` if it belongs to `user_id` (used on logout)"""
+    family_id = await db.scalar(
+        select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == hash_refresh_token(raw_token),
+            RefreshToken.user_id == user_id,
+        )
+    )
+    if family_id is not None:
+        await revoke_family(db, family_id)
+
+async def revoke_user_tokens(db: AsyncSession, user_id: UUID) -> None:
+    """Revokes every outstanding refresh token of a user (block, archive, password change)"""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+async def prune_user_tokens(db: AsyncSession, user_id: UUID) -> None:
+    """Deletes a user's expired refresh tokens; called on login to keep the table small"""
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.expires_at <= datetime.now(timezone.utc),
+        )
+    )
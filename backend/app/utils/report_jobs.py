@@ -0,0 +1,352 @@
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.report_jobs_models import ReportJob
+from app.utils.pool_metrics import Histogram
+from app.utils.report_utils import fingerprint_query, render_report
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger("report_jobs")
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Rendering takes seconds to minutes
+JOB_BUCKETS_MS = (100, 500, 1000, 5000, 10000, 30000, 60000, 300000)
+
+def artifact_key(report_type: str, format: str, filters: dict, fingerprint: tuple) -> str:
+    """Content address of a report: the same request over the same data gives the same key"""
+    payload = json.dumps(
+        {"report": report_type, "format": format, "filters": filters, "fingerprint": fingerprint},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+class ArtifactCache:
+    """
+    Rendered reports on disk, one file per artifact key. Files are rendered
+    under a temporary name and renamed into place, so a reader never sees a
+    partial file and workers sharing the directory may render the same key
+    at once. evict() removes files older than `max_age_seconds`, then the
+    oldest ones until the total size is within `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: float, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def path(self, key: str, format: str) -> Path:
+        return self.directory / f"{key}.{format}"
+
+    def partial_path(self, key: str, format: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{key}.{format}.{uuid4().hex}.part"
+
+    def get(self, key: str, format: str) -> Optional[Path]:
+        """Path of the stored artifact, or None when it is missing or expired"""
+        path = self.path(key, format)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        return path if age < self.max_age_seconds else None
+
+    def _files(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return []
+        files = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def evict(self) -> int:
+        """Removes expired artifacts, then the oldest ones while over max_bytes"""
+        now = time.time()
+        files = self._files()
+        total = sum(size for _, size, path in files if not path.endswith(".part"))
+        removed = 0
+        for mtime, size, path in files:
+            partial = path.endswith(".part")
+            # Partial files belong to renders in progress unless they are expired
+            if now - mtime < self.max_age_seconds and (partial or total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            if not partial:
+                total -= size
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        files = [(size, path) for _, size, path in self._files() if not path.endswith(".part")]
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "files": len(files),
+                "bytes": sum(size for size, _ in files),
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "evictions": self.evictions,
+            }
+
+class ReportJobs:
+    """
+    Renders reports in the background on a dedicated process pool, so the
+    CPU-bound reportlab layout neither ties up a request thread nor holds
+    the GIL the API needs. Job state lives in the report_jobs table, so any
+    worker can answer polls and serve downloads.
+
+    Each process renders at most `workers` reports at once and accepts
+    `queue_size` more; beyond that submit() is rejected with 503. A request
+    whose artifact already exists, or is being rendered, is not rendered
+    again. Active jobs refresh heartbeat_at every `heartbeat_seconds`; one
+    that missed three heartbeats belonged to a worker that died.
+    """
+
+    def __init__(self, workers: int, queue_size: int, heartbeat_seconds: float, artifacts: ArtifactCache):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.artifacts = artifacts
+        self._executor = None
+        self._slots = asyncio.Semaphore(workers)
+        self._lock = threading.Lock()
+        # Strong references; the event loop only keeps weak ones
+        self._tasks: set = set()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.reused = 0
+        self.joined = 0
+        self.latency = Histogram(JOB_BUCKETS_MS)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _cutoff(self) -> datetime:
+        """Active jobs whose last heartbeat is older than this are dead"""
+        return datetime.now(timezone.utc) - timedelta(seconds=3 * self.heartbeat_seconds)
+
+    async def submit(self, db: AsyncSession, report_type: str, format: str, filters: dict, requested_by: Optional[UUID]) -> ReportJob:
+        """Creates a job for the report, or returns one that already covers it"""
+        fingerprint = tuple((await db.execute(fingerprint_query(report_type, filters))).one())
+        key = artifact_key(report_type, format, filters, fingerprint)
+        job = ReportJob(
+            report_type=report_type,
+            format=format,
+            filters=filters,
+            artifact_key=key,
+            requested_by=requested_by,
+        )
+
+        if self.artifacts.get(key, format) is not None:
+            with self._lock:
+                self.reused += 1
+            job.status = "done"
+            job.from_cache = True
+            job.finished_at = datetime.now(timezone.utc)
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+        active = await db.scalar(
+            select(ReportJob)
+            .where(
+                ReportJob.artifact_key == key,
+                ReportJob.status.in_(ACTIVE_STATUSES),
+                ReportJob.heartbeat_at > self._cutoff(),
+            )
+            .order_by(ReportJob.created_at.desc())
+            .limit(1)
+        )
+        if active is not None:
+            with self._lock:
+                self.joined += 1
+            return active
+
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many reports are being generated, please try again shortly",
+                    headers={"Retry-After": "5"},
+                )
+            self.in_flight += 1
+
+        try:
+            job.status = "queued"
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+
+        task = asyncio.create_task(self._run(job.id, report_type, format, filters, key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _set_status(self, job_id: UUID, **values) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(ReportJob).where(ReportJob.id == job_id).values(**values))
+            await db.commit()
+
+    async def _heartbeat(self, job_id: UUID) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self._set_status(job_id, heartbeat_at=datetime.now(timezone.utc))
+            except Exception as e:
+                logger.warning(f"Failed to refresh the heartbeat of report job {job_id}: {e}")
+
+    async def _run(self, job_id: UUID, report_type: str, format: str, filters: dict, key: str) -> None:
+        started = time.perf_counter()
+        partial = None
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            async with self._slots:
+                await self._set_status(job_id, status="running", started_at=datetime.now(timezone.utc))
+                partial = self.artifacts.partial_path(key, format)
+                # The thread only dispatches chunks to the worker processes and waits
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, render_report, report_type, format, filters, str(partial), self._get_executor()
+                )
+                os.replace(partial, self.artifacts.path(key, format))
+            await self._set_status(job_id, status="done", finished_at=datetime.now(timezone.utc))
+            with self._lock:
+                self.completed += 1
+        except BaseException as e:
+            if partial is not None and partial.exists():
+                partial.unlink(missing_ok=True)
+            with self._lock:
+                self.failed += 1
+            interrupted = isinstance(e, asyncio.CancelledError)
+            if not interrupted:
+                logger.error(f"Report job {job_id} ({report_type}, {format}) failed: {e}")
+            try:
+                await self._set_status(
+                    job_id,
+                    status="failed",
+                    error="Interrupted by a server restart" if interrupted else str(e) or type(e).__name__,
+                    finished_at=datetime.now(timezone.utc),
+                )
+            except Exception as status_error:
+                logger.error(f"Failed to record the failure of report job {job_id}: {status_error}")
+            if interrupted:
+                raise
+        finally:
+            heartbeat.cancel()
+            self.latency.observe((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self.in_flight -= 1
+        await run_in_threadpool(self.cleanup)
+
+    def cleanup(self) -> None:
+        """Evicts old artifacts and forgets jobs whose artifacts may be gone"""
+        self.artifacts.evict()
+        db = SessionLocal()
+        try:
+            expired = datetime.now(timezone.utc) - timedelta(seconds=self.artifacts.max_age_seconds)
+            db.execute(delete(ReportJob).where(ReportJob.created_at < expired))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to purge old report jobs: {e}")
+        finally:
+            db.close()
+
+    async def get(self, db: AsyncSession, job_id: UUID) -> ReportJob:
+        job = await db.get(ReportJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Report job not found")
+        return job
+
+    def status(self, job: ReportJob) -> Tuple[str, Optional[str]]:
+        """(status, error), reporting active jobs of dead workers as failed"""
+        if job.status in ACTIVE_STATUSES and job.heartbeat_at < self._cutoff():
+            return "failed", "Interrupted by a server restart"
+        return job.status, job.error
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Renders can take minutes; stop them rather than wait. The executor
+            # has no public API for it before Python 3.14 (terminate_workers).
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+            await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "queued": max(self.in_flight - self.workers, 0),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "reused": self.reused,
+                "joined": self.joined,
+                "latency": self.latency.snapshot(),
+            }
+        stats["artifacts"] = self.artifacts.stats()
+        return stats
+
+report_jobs = ReportJobs(
+    workers=settings.REPORT_WORKERS,
+    queue_size=settings.REPORT_QUEUE_SIZE,
+    heartbeat_seconds=settings.REPORT_JOB_HEARTBEAT_SECONDS,
+    artifacts=ArtifactCache(
+        directory=settings.REPORT_CACHE_DIR or os.path.join(tempfile.gettempdir(), "trace-reports"),
+        max_age_seconds=settings.REPORT_CACHE_MAX_AGE_SECONDS,
+        max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    ),
+)
@@ -1,10 +1,139 @@
 import csv
+import io
+import math
+import os
+import tempfile
+from concurrent.futures import Executor
+from datetime import date
+from typing import Iterator, Optional
 
+from app.config import settings
+from app.database import SessionLocal
+from app.models.events_models import Events
+from app.models.gts_responses_models import GTSResponses
+from app.models.users_models import UserRole, Users
+from pypdf import PdfWriter
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (PageBreak, Paragraph, SimpleDocTemplate, Table,
                                 TableStyle)
+from sqlalchemy import Numeric, Text, cast, func, literal_column, select, text
+from sqlalchemy.orm import Session
+
+# Only the columns each report prints are read
+REPORT_QUERIES = {
+    "alumni": select(
+        Users.username,
+        Users.email,
+        Users.firstname,
+        Users.middle_initial,
+        Users.lastname,
+        Users.name_extension,
+        Users.course,
+        Users.batch_year,
+        Users.is_active,
+    ).where(Users.role == UserRole.alumni, Users.deleted_at.is_(None)),
+    "events": select(
+        Events.title,
+        Events.description,
+        Events.location,
+        Events.start_date,
+        Events.end_date,
+        Events.start_time_startday,
+        Events.end_time_endday,
+        Events.created_by,
+    ),
+    "gts": select(
+        GTSResponses.full_name,
+        GTSResponses.degree,
+        GTSResponses.year_graduated,
+        GTSResponses.is_employed,
+        GTSResponses.employment_status,
+        GTSResponses.company_name,
+        GTSResponses.occupation,
+        GTSResponses.job_sector,
+        GTSResponses.job_related_to_course,
+        GTSResponses.submitted_at,
+    ),
+}
+
+# Unique sort key of each report; PDF chunks are ranges of it
+REPORT_KEYS = {
+    "alumni": Users.id,
+    "events": Events.id,
+    "gts": GTSResponses.id,
+}
+
+# Filters each report accepts (see ReportFilters): the column they apply to
+# and how they are labelled on the PDF
+REPORT_FILTERS = {
+    "alumni": {
+        "course": (Users.course, "Course"),
+        "year": (Users.batch_year, "Batch"),
+    },
+    "events": {
+        "date": (Events.start_date, "Starting"),
+    },
+    "gts": {
+        "course": (Users.course, "Course"),
+        "year": (GTSResponses.year_graduated, "Graduated"),
+        "employment_status": (GTSResponses.employment_status, "Employment status"),
+        "date": (GTSResponses.submitted_at, "Submitted"),
+    },
+}
+FILTER_KINDS = {
+    "course": "course",
+    "start_year": "year",
+    "end_year": "year",
+    "employment_status": "employment_status",
+    "start_date": "date",
+    "end_date": "date",
+}
+
+# PDF layout. Row heights are fixed, so every page holds exactly ROWS_PER_PAGE
+# rows; cell text that does not fit its column is shortened.
+PAGE_SIZE = landscape(A4)
+PAGE_WIDTH, PAGE_HEIGHT = PAGE_SIZE
+PAGE_MARGIN = 36
+# Report title drawn above the table on every page
+TITLE_HEIGHT = 28
+HEADER_FONT, HEADER_FONT_SIZE = "Helvetica-Bold", 9
+BODY_FONT, BODY_FONT_SIZE = "Helvetica", 8
+# Headers wrap onto up to three lines
+HEADER_ROW_HEIGHT = 32
+HEADER_LEADING = 10
+ROW_HEIGHT = 14
+CELL_PADDING = 4
+# SimpleDocTemplate's frame adds 6pt of padding on every side
+TABLE_WIDTH = PAGE_WIDTH - 2 * PAGE_MARGIN - 12
+TABLE_HEIGHT = PAGE_HEIGHT - 2 * PAGE_MARGIN - TITLE_HEIGHT - 12
+ROWS_PER_PAGE = int((TABLE_HEIGHT - HEADER_ROW_HEIGHT) // ROW_HEIGHT)
+# Rows used to size the columns
+PDF_SAMPLE_ROWS = 500
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 1), (-1, -1), BODY_FONT),
+    ('FONTSIZE', (0, 1), (-1, -1), BODY_FONT_SIZE),
+    ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+])
+HEADER_STYLE = ParagraphStyle(
+    "ReportHeader",
+    fontName=HEADER_FONT,
+    fontSize=HEADER_FONT_SIZE,
+    leading=HEADER_LEADING,
+    textColor=colors.whitesmoke,
+)
 
 def get_display_headers(report_type: str):
     """Return human-readable column headers for each report type"""
@@ -42,122 +171,324 @@ def get_display_headers(report_type: str):
     }
     return headers.get(report_type, {})
 
-def sanitize_data(data, report_type: str):
-    """Remove sensitive fields based on report type"""
+def sanitize_row(row, report_type: str) -> dict:
+    """Formats one report row, keeping only the fields shown in the report"""
     if report_type == "alumni":
-        return [
-            {
-                "username": row.username,
-                "email": row.email,
-                "full_name": f"{row.firstname} {row.middle_initial or ''}. {row.lastname} {row.name_extension or ''}".strip(),
-                "course": row.course,
-                "batch_year": row.batch_year,
-                "is_active": "Yes" if row.is_active else "No",
-            }
-            for row in data
-        ]
+        return {
+            "username": row.username,
+            "email": row.email,
+            "full_name": f"{row.firstname} {row.middle_initial or ''}. {row.lastname} {row.name_extension or ''}".strip(),
+            "course": row.course,
+            "batch_year": row.batch_year,
+            "is_active": "Yes" if row.is_active else "No",
+        }
     elif report_type == "events":
-        return [
-            {
-                "title": row.title,
-                "description": row.description or "N/A",
-                "location": row.location or "N/A",
-                "start_date": row.start_date.strftime("%Y-%m-%d") if row.start_date else "N/A",
-                "end_date": row.end_date.strftime("%Y-%m-%d") if row.end_date else "N/A",
-                "start_time": row.start_time_startday.strftime("%H:%M") if row.start_time_startday else "N/A",
-                "end_time": row.end_time_endday.strftime("%H:%M") if row.end_time_endday else "N/A",
-                "created_by": str(row.created_by),
-            }
-            for row in data
-        ]
+        return {
+            "title": row.title,
+            "description": row.description or "N/A",
+            "location": row.location or "N/A",
+            "start_date": row.start_date.strftime("%Y-%m-%d") if row.start_date else "N/A",
+            "end_date": row.end_date.strftime("%Y-%m-%d") if row.end_date else "N/A",
+            "start_time": row.start_time_startday.strftime("%H:%M") if row.start_time_startday else "N/A",
+            "end_time": row.end_time_endday.strftime("%H:%M") if row.end_time_endday else "N/A",
+            "created_by": str(row.created_by),
+        }
     elif report_type == "gts":
-        return [
-            {
-                "full_name": row.full_name or "N/A",
-                "degree": row.degree or "N/A",
-                "year_graduated": row.year_graduated or "N/A",
-                "is_employed": "Yes" if row.is_employed else "No" if row.is_employed is False else "N/A",
-                "employment_status": row.employment_status or "N/A",
-                "company_name": row.company_name or "N/A",
-                "occupation": ", ".join(row.occupation) if row.occupation else "N/A",
-                "job_sector": row.job_sector or "N/A",
-                "job_related_to_course": "Yes" if row.job_related_to_course else "No" if row.job_related_to_course is False else "N/A",
-                "submitted_at": row.submitted_at.strftime("%Y-%m-%d") if row.submitted_at else "N/A",
-            }
-            for row in data
-        ]
-    return []
+        return {
+            "full_name": row.full_name or "N/A",
+            "degree": row.degree or "N/A",
+            "year_graduated": row.year_graduated or "N/A",
+            "is_employed": "Yes" if row.is_employed else "No" if row.is_employed is False else "N/A",
+            "employment_status": row.employment_status or "N/A",
+            "company_name": row.company_name or "N/A",
+            "occupation": ", ".join(row.occupation) if row.occupation else "N/A",
+            "job_sector": row.job_sector or "N/A",
+            "job_related_to_course": "Yes" if row.job_related_to_course else "No" if row.job_related_to_course is False else "N/A",
+            "submitted_at": row.submitted_at.strftime("%Y-%m-%d") if row.submitted_at else "N/A",
+        }
+    return {}
+
+def unsupported_filters(report_type: str, filters: dict) -> list:
+    return [name for name in filters if FILTER_KINDS[name] not in REPORT_FILTERS[report_type]]
+
+def report_query(report_type: str, filters: Optional[dict] = None):
+    """
+    The report's query restricted by `filters` (ReportFilters.applied(),
+    dates as ISO strings), so only the matching rows are read
+    """
+    query = REPORT_QUERIES[report_type]
+    if not filters:
+        return query
+    columns = {kind: column for kind, (column, _) in REPORT_FILTERS[report_type].items()}
+    if "course" in filters:
+        if report_type == "gts":
+            # The course is the respondent's
+            query = query.join(Users, Users.id == GTSResponses.user_id)
+        query = query.where(columns["course"] == filters["course"])
+    if "employment_status" in filters:
+        query = query.where(columns["employment_status"] == filters["employment_status"])
+    if "start_year" in filters:
+        query = query.where(columns["year"] >= filters["start_year"])
+    if "end_year" in filters:
+        query = query.where(columns["year"] <= filters["end_year"])
+    if "start_date" in filters:
+        query = query.where(columns["date"] >= date.fromisoformat(filters["start_date"]))
+    if "end_date" in filters:
+        query = query.where(columns["date"] <= date.fromisoformat(filters["end_date"]))
+    return query
+
+def fingerprint_query(report_type: str, filters: Optional[dict] = None):
+    """
+    Row count and an order-independent hash of the report's rows (with their
+    sort key), so any change to what the report prints changes the result.
+    Computed when a report is requested; writers never touch shared state.
+    """
+    rows = report_query(report_type, filters).add_columns(REPORT_KEYS[report_type]).subquery("report_row")
+    row_hash = func.hashtextextended(cast(literal_column("report_row"), Text), 0)
+    return select(func.count(), func.coalesce(func.sum(cast(row_hash, Numeric)), 0)).select_from(rows)
 
-def generate_csv_report(data, report_type: str, filepath: str):
-    if not data:
-        with open(filepath, "w", newline="", encoding="utf-8") as f:
-            f.write("No data available")
-        return
+def describe_filters(report_type: str, filters: dict) -> str:
+    """One line summary of the filters, printed under the PDF title"""
+    labels = {kind: label for kind, (_, label) in REPORT_FILTERS[report_type].items()}
+    parts = []
+    for kind, value in (("course", filters.get("course")), ("employment_status", filters.get("employment_status"))):
+        if value is not None:
+            parts.append(f"{labels[kind]}: {value}")
+    for kind, start, end in (("year", "start_year", "end_year"), ("date", "start_date", "end_date")):
+        start, end = filters.get(start), filters.get(end)
+        if start is not None and end is not None:
+            parts.append(f"{labels[kind]}: {start}" if start == end else f"{labels[kind]}: {start} to {end}")
+        elif start is not None:
+            parts.append(f"{labels[kind]}: from {start}")
+        elif end is not None:
+            parts.append(f"{labels[kind]}: up to {end}")
+    return "    ".join(parts)
 
-    sanitized = sanitize_data(data, report_type)
+def stream_csv_report(report_type: str, filters: Optional[dict] = None) -> Iterator[str]:
+    """
+    Yields the CSV report REPORT_BATCH_SIZE rows at a time. Rows are read
+    through a server-side cursor, so memory stays flat however large the
+    table is. Uses its own session because the body is sent after the
+    request's dependencies have been closed.
+    """
     display_headers = get_display_headers(report_type)
-    
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        if sanitized:
-            # Map internal field names to display names
-            fieldnames = list(sanitized[0].keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            # Write custom headers
-            writer.writerow({field: display_headers.get(field, field) for field in fieldnames})
-            
-            # Write data
-            writer.writerows(sanitized)
-        else:
-            f.write("No data available")
-
-def generate_pdf_report(data, report_type: str, filepath: str):
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(display_headers))
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            report_query(report_type, filters),
+            execution_options={"yield_per": settings.REPORT_BATCH_SIZE},
+        )
+        empty = True
+        for rows in result.partitions():
+            if empty:
+                # Write custom headers
+                writer.writerow(display_headers)
+                empty = False
+            writer.writerows(sanitize_row(row, report_type) for row in rows)
+            yield flush()
+        if empty:
+            yield "No data available"
+    finally:
+        db.close()
+
+def chunk_query(report_type: str, filters: Optional[dict] = None, lower=None, upper=None):
+    """Rows of the report with lower <= key < upper, in key order"""
+    key = REPORT_KEYS[report_type]
+    query = report_query(report_type, filters)
+    if lower is not None:
+        query = query.where(key >= lower)
+    if upper is not None:
+        query = query.where(key < upper)
+    return query.order_by(key)
+
+def chunk_bounds(db: Session, report_type: str, filters: Optional[dict], chunk_rows: int):
+    """
+    Returns (first key of every chunk of `chunk_rows` rows, total rows).
+    Only keys are read, so chunks can be rendered without passing rows around.
+    """
+    key = REPORT_KEYS[report_type]
+    numbered = report_query(report_type, filters).with_only_columns(
+        key.label("key"),
+        func.row_number().over(order_by=key).label("n"),
+        func.count().over().label("total"),
+    ).subquery()
+    rows = db.execute(
+        select(numbered.c.key, numbered.c.total)
+        .where((numbered.c.n - 1) % chunk_rows == 0)
+        .order_by(numbered.c.key)
+    ).all()
+    return [row.key for row in rows], rows[0].total if rows else 0
+
+def fit_text(text: str, width: float, font: str, size: float) -> str:
+    """Shortens `text` with an ellipsis so it fits in `width` points"""
+    text_width = stringWidth(text, font, size)
+    if text_width <= width:
+        return text
+    cut = int(len(text) * width / text_width)
+    while cut > 0 and stringWidth(text[:cut] + "...", font, size) > width:
+        cut -= 1
+    return text[:cut] + "..."
+
+def column_widths(report_type: str, sample) -> list:
+    """
+    Fits the columns to the page width. Columns start from the width of
+    their header or widest value in `sample`, whichever is larger; when that
+    is too wide, they are shrunk proportionally, but not below the longest
+    word of their header (headers wrap).
+    """
+    natural, minimum = [], []
+    for header in get_display_headers(report_type).values():
+        natural.append(stringWidth(header, HEADER_FONT, HEADER_FONT_SIZE) + 2 * CELL_PADDING)
+        minimum.append(max(stringWidth(word, HEADER_FONT, HEADER_FONT_SIZE) for word in header.split()) + 2 * CELL_PADDING)
+    for record in sample:
+        for i, value in enumerate(record.values()):
+            natural[i] = max(natural[i], stringWidth(str(value), BODY_FONT, BODY_FONT_SIZE) + 2 * CELL_PADDING)
+
+    total, smallest = sum(natural), sum(minimum)
+    if total <= TABLE_WIDTH:
+        return [width * TABLE_WIDTH / total for width in natural]
+    if smallest >= TABLE_WIDTH:
+        return [width * TABLE_WIDTH / smallest for width in minimum]
+    shrink = (TABLE_WIDTH - smallest) / (total - smallest)
+    return [low + (width - low) * shrink for low, width in zip(minimum, natural)]
+
+def _draw_page_frame(title: str, subtitle: str, first_page: int, total_pages: int):
+    def draw(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(HEADER_FONT, 14)
+        canvas.drawString(PAGE_MARGIN, PAGE_HEIGHT - PAGE_MARGIN - 14, title)
+        canvas.setFont(BODY_FONT, BODY_FONT_SIZE)
+        if subtitle:
+            canvas.drawString(PAGE_MARGIN, PAGE_HEIGHT - PAGE_MARGIN - 14 - ROW_HEIGHT, subtitle)
+        canvas.drawRightString(
+            PAGE_WIDTH - PAGE_MARGIN,
+            PAGE_MARGIN / 2,
+            f"Page {first_page + canvas.getPageNumber() - 1} of {total_pages}",
+        )
+        canvas.restoreState()
+    return draw
+
+def render_pdf_chunk(report_type: str, filters: Optional[dict], lower, upper, snapshot: Optional[str], first_page: int, total_pages: int, widths: list, filepath: str) -> str:
+    """
+    Renders the matching rows between `lower` and `upper` as pages
+    `first_page` onwards, one table per page. Rows are read from the exported
+    `snapshot` when given. Runs in the report worker processes.
+    """
+    db = SessionLocal()
+    try:
+        if snapshot is not None:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            db.execute(text("SET TRANSACTION SNAPSHOT :snapshot"), {"snapshot": snapshot})
+        rows = db.execute(chunk_query(report_type, filters, lower, upper)).all()
+    finally:
+        db.close()
+
+    doc = SimpleDocTemplate(
+        filepath,
+        pagesize=PAGE_SIZE,
+        leftMargin=PAGE_MARGIN,
+        rightMargin=PAGE_MARGIN,
+        topMargin=PAGE_MARGIN + TITLE_HEIGHT,
+        bottomMargin=PAGE_MARGIN,
+    )
+    subtitle = fit_text(describe_filters(report_type, filters or {}), TABLE_WIDTH, BODY_FONT, BODY_FONT_SIZE)
+    draw = _draw_page_frame(f"{report_type.upper()} REPORT", subtitle, first_page, total_pages)
+    if not rows:
+        doc.build([Paragraph("No data available.", getSampleStyleSheet()["Normal"])], onFirstPage=draw, onLaterPages=draw)
+        return filepath
+
+    headers = [Paragraph(header, HEADER_STYLE) for header in get_display_headers(report_type).values()]
     elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph(f"<b>{report_type.upper()} REPORT</b>", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 20))
-    
-    if not data:
-        no_data = Paragraph("No data available.", styles['Normal'])
-        elements.append(no_data)
-        doc.build(elements)
-        return
-    
-    sanitized = sanitize_data(data, report_type)
-    
-    if not sanitized:
-        no_data = Paragraph("No data available.", styles['Normal'])
-        elements.append(no_data)
-        doc.build(elements)
-        return
-    
-    # Get display headers
-    display_headers = get_display_headers(report_type)
-    internal_fields = list(sanitized[0].keys())
-    
-    # Create table with display headers
-    headers = [display_headers.get(field, field) for field in internal_fields]
-    table_data = [headers] + [[str(row[field]) for field in internal_fields] for row in sanitized]
-    
-    # Create table
-    table = Table(table_data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('TOPPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
\ No newline at end of file
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        page_rows = [
+            [
+                fit_text(str(value), width - 2 * CELL_PADDING, BODY_FONT, BODY_FONT_SIZE)
+                for value, width in zip(sanitize_row(row, report_type).values(), widths)
+            ]
+            for row in rows[start:start + ROWS_PER_PAGE]
+        ]
+        if elements:
+            elements.append(PageBreak())
+        elements.append(Table(
+            [headers] + page_rows,
+            colWidths=widths,
+            rowHeights=[HEADER_ROW_HEIGHT] + [ROW_HEIGHT] * len(page_rows),
+            style=TABLE_STYLE,
+            repeatRows=1,
+        ))
+    doc.build(elements, onFirstPage=draw, onLaterPages=draw)
+    return filepath
+
+def merge_pdfs(paths: list, filepath: str) -> None:
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(filepath, "wb") as f:
+        writer.write(f)
+
+def write_pdf_report(report_type: str, filters: Optional[dict], filepath: str, executor: Optional[Executor] = None) -> None:
+    """
+    Renders the PDF in chunks of REPORT_PDF_CHUNK_PAGES pages and
+    concatenates them. Every page holds ROWS_PER_PAGE rows, so page numbers
+    are known up front and each chunk reads and lays out only its own rows:
+    memory depends on the chunk size, not the report size. With an
+    executor the chunks are rendered in parallel.
+    """
+    chunk_rows = settings.REPORT_PDF_CHUNK_PAGES * ROWS_PER_PAGE
+    db = SessionLocal()
+    try:
+        # Chunks import this transaction's snapshot, so together they see the
+        # same rows the page count was computed from, whatever is written
+        # meanwhile. The transaction stays open until they are rendered.
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        snapshot = db.scalar(text("SELECT pg_export_snapshot()"))
+        bounds, total = chunk_bounds(db, report_type, filters, chunk_rows)
+        sample = [
+            sanitize_row(row, report_type)
+            for row in db.execute(chunk_query(report_type, filters).limit(PDF_SAMPLE_ROWS))
+        ]
+        total_pages = max(math.ceil(total / ROWS_PER_PAGE), 1)
+        widths = column_widths(report_type, sample)
+        if len(bounds) <= 1:
+            render_pdf_chunk(report_type, filters, None, None, snapshot, 1, total_pages, widths, filepath)
+            return
+
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(filepath) or None, ignore_cleanup_errors=True) as tmp:
+            chunks = [
+                (report_type, filters, lower, upper, snapshot, i * settings.REPORT_PDF_CHUNK_PAGES + 1, total_pages, widths, os.path.join(tmp, f"{i}.pdf"))
+                for i, (lower, upper) in enumerate(zip(bounds, bounds[1:] + [None]))
+            ]
+            if executor is None:
+                merge_pdfs([render_pdf_chunk(*chunk) for chunk in chunks], filepath)
+                return
+            futures = [executor.submit(render_pdf_chunk, *chunk) for chunk in chunks]
+            try:
+                paths = [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+            executor.submit(merge_pdfs, paths, filepath).result()
+    finally:
+        db.close()
+
+def render_report(report_type: str, format: str, filters: Optional[dict], filepath: str, executor: Optional[Executor] = None) -> None:
+    """Writes the report to `filepath`, on `executor`'s processes when given"""
+    if format == "pdf":
+        write_pdf_report(report_type, filters, filepath, executor)
+    elif executor is not None:
+        executor.submit(write_csv_report, report_type, filters, filepath).result()
+    else:
+        write_csv_report(report_type, filters, filepath)
+
+def write_csv_report(report_type: str, filters: Optional[dict], filepath: str) -> None:
+    with open(filepath, "w", newline="", encoding="utf-8") as f:
+        f.writelines(stream_csv_report(report_type, filters))
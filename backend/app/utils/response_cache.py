@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from app.config import settings
+from app.utils.change_feed import change_feed
+from app.utils.event_bus import event_bus
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized JSON body plus its strong ETag (a digest of the bytes)"""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_payload(cls, payload) -> "CachedResponse":
+        body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized responses keyed by normalized request
+    parameters. An entry is served while it is younger than `ttl_seconds`
+    and none of `resources` changed since it was computed; writes report
+    changes through notify_changed() (app/utils/event_bus.py), which also
+    covers other workers via the change feed.
+
+    A cold key is computed by one request only: concurrent requests for the
+    same key wait for it and share the result. Used from `async def` routes;
+    the entry table is also guarded by a thread lock for the stats route.
+    """
+
+    def __init__(self, resources: Tuple[str, ...], max_size: int, ttl_seconds: float):
+        self.resources = resources
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, tuple, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> [asyncio.Lock held while computing, number of requests using it]
+        self._inflight: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.coalesced = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def _versions(self) -> tuple:
+        return tuple(event_bus.version(resource) for resource in self.resources)
+
+    def _lookup(self, key: Hashable, versions: tuple) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, entry_versions, response = entry
+        if expires_at < time.monotonic() or entry_versions != versions:
+            del self._entries[key]
+            self.stale += 1
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[object]]) -> CachedResponse:
+        """Returns the cached response for `key`, computing it with `await compute()` on a miss"""
+        with self._lock:
+            response = self._lookup(key, self._versions())
+            if response is not None:
+                self.hits += 1
+                return response
+            self.misses += 1
+            inflight = self._inflight.setdefault(key, [asyncio.Lock(), 0])
+            inflight[1] += 1
+
+        try:
+            async with inflight[0]:
+                # Versions are read before computing: a write that lands meanwhile
+                # leaves the entry outdated, so the next request recomputes
+                with self._lock:
+                    versions = self._versions()
+                    response = self._lookup(key, versions)
+                    if response is not None:
+                        self.coalesced += 1
+                if response is not None:
+                    return response
+
+                response = CachedResponse.from_payload(await compute())
+                if self.max_size > 0:
+                    with self._lock:
+                        self._entries[key] = (time.monotonic() + self.ttl_seconds, versions, response)
+                        self._entries.move_to_end(key)
+                        while len(self._entries) > self.max_size:
+                            self._entries.popitem(last=False)
+                            self.evictions += 1
+                return response
+        finally:
+            with self._lock:
+                inflight[1] -= 1
+                if inflight[1] == 0:
+                    del self._inflight[key]
+
+    def respond(self, request: Request, response: CachedResponse) -> Response:
+        """200 with the cached body, or 304 when the client already holds this ETag"""
+        # no-cache: clients keep the body but revalidate on every poll
+        headers = {"ETag": response.etag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if response.etag in tags or "*" in tags:
+                with self._lock:
+                    self.not_modified += 1
+                return Response(status_code=304, headers=headers)
+        return Response(content=response.body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "resources": list(self.resources),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "coalesced": self.coalesced,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "computing": len(self._inflight),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+# GET /admin/analytics/ - keyed by (start_year, end_year, department). Recent
+# logins are time based and only refresh with the TTL.
+analytics_cache = ResponseCache(
+    resources=("users", "gts", "events", "activity"),
+    max_size=settings.ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# GET /admin/analytics/cube - keyed by (dims, measures, totals, filters)
+cube_cache = ResponseCache(
+    resources=("users", "gts"),
+    max_size=settings.ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# GET /admin/analytics/attendance - keyed by the event date range
+attendance_cache = ResponseCache(
+    resources=("events", "attendance"),
+    max_size=settings.ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# GET /admin/analytics/distributions - keyed by (fields, bins, percentiles, filters)
+distribution_cache = ResponseCache(
+    resources=("users", "gts"),
+    max_size=settings.ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# Writes may have been missed while the change feed was disconnected
+for cache in (analytics_cache, cube_cache, attendance_cache, distribution_cache):
+    change_feed.on_resync(cache.clear)
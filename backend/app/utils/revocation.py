@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.token_revocations_models import TokenRevocation
+from app.utils.change_feed import Change, change_feed
+from sqlalchemy import delete, select
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger("revocation")
+
+class RevocationList:
+    """
+    In-memory view of the token_revocations table.
+    Revoked jtis and per-user cutoffs are held in dicts and evicted once they
+    expire; sync() merges rows written by other workers. Revocations are never
+    undone, so merging is always safe.
+    """
+
+    def __init__(self):
+        # jti -> expiry (epoch seconds)
+        self._jtis: dict[str, float] = {}
+        # user_id -> (not_before, expiry) in epoch seconds
+        self._cutoffs: dict[UUID, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.last_sync: Optional[datetime] = None
+
+    def is_revoked(self, payload: dict, user_id: UUID) -> bool:
+        """Checks a decoded access token against revoked jtis and the user's cutoff"""
+        with self._lock:
+            jti = payload.get("jti")
+            if jti is not None and jti in self._jtis:
+                self.rejected += 1
+                return True
+
+            cutoff = self._cutoffs.get(user_id)
+            if cutoff is not None:
+                # Tokens issued before jti/iat were added carry no iat and are treated as old
+                if payload.get("iat", 0) <= cutoff[0]:
+                    self.rejected += 1
+                    return True
+        return False
+
+    def add(self, row: TokenRevocation) -> None:
+        """Applies a committed revocation row to the in-memory sets"""
+        expires_at = row.expires_at.timestamp()
+        with self._lock:
+            if row.jti is not None:
+                self._jtis[row.jti] = expires_at
+            if row.user_id is not None and row.not_before is not None:
+                not_before = row.not_before.timestamp()
+                current = self._cutoffs.get(row.user_id)
+                if current is None or current[0] < not_before:
+                    self._cutoffs[row.user_id] = (not_before, expires_at)
+
+    def sync(self) -> int:
+        """Merges unexpired rows from the database and deletes expired ones"""
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            rows = db.scalars(
+                select(TokenRevocation).where(TokenRevocation.expires_at > now)
+            ).all()
+            for row in rows:
+                self.add(row)
+            # Expiry housekeeping is not announced; every worker runs it on its own
+            db.execute(
+                delete(TokenRevocation)
+                .where(TokenRevocation.expires_at <= now)
+                .execution_options(change_feed=False)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to sync token revocations: {e}")
+            return 0
+        finally:
+            db.close()
+
+        self._evict(now.timestamp())
+        self.last_sync = now
+        return len(rows)
+
+    def _evict(self, now: float) -> None:
+        with self._lock:
+            for jti in [jti for jti, expires_at in self._jtis.items() if expires_at <= now]:
+                del self._jtis[jti]
+            for user_id in [user_id for user_id, (_, expires_at) in self._cutoffs.items() if expires_at <= now]:
+                del self._cutoffs[user_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "revoked_tokens": len(self._jtis),
+                "user_cutoffs": len(self._cutoffs),
+                "rejected": self.rejected,
+                "last_sync": self.last_sync,
+            }
+
+revocation_list = RevocationList()
+
+def revoke_token(db, payload: dict) -> Optional[TokenRevocation]:
+    """
+    Adds a revocation row for a single access token to the session.
+    Call revocation_list.add(row) once the session is committed.
+    """
+    jti = payload.get("jti")
+    if jti is None:
+        return None
+    row = TokenRevocation(
+        jti=jti,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+    )
+    db.add(row)
+    return row
+
+def revoke_user(db, user_id: UUID) -> TokenRevocation:
+    """
+    Adds a cutoff row invalidating every access token the user holds now.
+    Call revocation_list.add(row) once the session is committed.
+    """
+    now = datetime.now(timezone.utc)
+    row = TokenRevocation(
+        user_id=user_id,
+        not_before=now,
+        # No token issued before `now` can outlive this
+        expires_at=now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    db.add(row)
+    return row
+
+# Revocations written by other workers are applied as soon as they are announced;
+# the periodic sync below remains the fallback when the change feed is down
+async def _sync_revocations() -> None:
+    await run_in_threadpool(revocation_list.sync)
+
+async def _apply_remote_revocations(change: Change) -> None:
+    if change.op == "i":
+        await _sync_revocations()
+
+change_feed.on("token_revocations", _apply_remote_revocations)
+change_feed.on_resync(_sync_revocations)
+
+async def run_revocation_sync(interval_seconds: float):
+    """Background task: pull revocations written by other workers every `interval_seconds`"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_in_threadpool(revocation_list.sync)
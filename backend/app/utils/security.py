@@ -1,10 +1,15 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import jwt
 from app.config import settings
 from argon2 import PasswordHasher
 
-ph = PasswordHasher()
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
 def hash_password(password: str) -> str:
     return ph.hash(password)
@@ -17,10 +22,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
+    now = datetime.now(timezone.utc)
+    expire = now + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    # jti and iat let app/utils/revocation.py revoke single tokens or everything issued before a cutoff;
+    # iat keeps sub-second precision so a token issued right after a cutoff is not caught by it
+    to_encode.update({"exp": expire, "iat": now.timestamp(), "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import jwt
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.token_revocations_models import TokenRevocation
+from sqlalchemy.dialects.postgresql import insert
+
+AUDIENCE = "stream"
+
+def create_stream_ticket(token_payload: dict) -> str:
+    """
+    Short-lived ticket for GET /stream, derived from the caller's access token.
+    EventSource cannot send headers, so the ticket travels in the query string
+    instead of the access token. It keeps the token's sub, role, jti and iat,
+    so revoking the token or the user also rejects tickets issued from it.
+    """
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": token_payload["sub"],
+        "role": token_payload.get("role"),
+        "jti": token_payload.get("jti"),
+        "iat": token_payload.get("iat", 0),
+        "exp": now + timedelta(seconds=settings.STREAM_TICKET_TTL_SECONDS),
+        "aud": AUDIENCE,
+        # Consumed on first use, see redeem_stream_ticket()
+        "nonce": uuid4().hex,
+    }
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+async def redeem_stream_ticket(ticket: str) -> dict:
+    """
+    Validates a ticket and marks it used. The nonce is stored as a revoked jti
+    in token_revocations, whose unique index makes a second redemption fail
+    on every worker; the row is deleted by the revocation sync once it expires.
+    """
+    try:
+        # An access token has no audience, so it is never accepted as a ticket
+        payload = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=AUDIENCE)
+    except jwt.ExpiredSignatureError:
+        raise Exception("Ticket expired")
+    except jwt.PyJWTError:
+        raise Exception("Invalid ticket")
+
+    statement = (
+        insert(TokenRevocation)
+        .values(
+            id=uuid4(),
+            jti=payload["nonce"],
+            expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+        )
+        .on_conflict_do_nothing(index_elements=["jti"])
+        .returning(TokenRevocation.id)
+        # Other workers need not hear about it; the unique index is what enforces single use
+        .execution_options(change_feed=False)
+    )
+    async with AsyncSessionLocal() as db:
+        consumed = await db.scalar(statement)
+        await db.commit()
+    if consumed is None:
+        raise Exception("Ticket already used")
+    return payload
@@ -0,0 +1,54 @@
+"""add report_jobs and data_versions tables
+
+Revision ID: a7d4e9c2b315
+Revises: f3c1a8b6d054
+Create Date: 2026-10-18 23:12:40.658120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e9c2b315'
+down_revision: Union[str, Sequence[str], None] = 'f3c1a8b6d054'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('resource', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource')
+    )
+    op.create_table('report_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('report_type', sa.String(), nullable=False),
+    sa.Column('format', sa.String(length=8), nullable=False),
+    sa.Column('filters', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('artifact_key', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('from_cache', sa.Boolean(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('requested_by', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_jobs_artifact_key_status', 'report_jobs', ['artifact_key', 'status'], unique=False)
+    op.create_index(op.f('ix_report_jobs_created_at'), 'report_jobs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_report_jobs_created_at'), table_name='report_jobs')
+    op.drop_index('ix_report_jobs_artifact_key_status', table_name='report_jobs')
+    op.drop_table('report_jobs')
+    op.drop_table('data_versions')
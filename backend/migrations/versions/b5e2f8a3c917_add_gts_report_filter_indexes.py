@@ -0,0 +1,29 @@
+"""add gts_responses year_graduated and submitted_at indexes
+
+Revision ID: b5e2f8a3c917
+Revises: a7d4e9c2b315
+Create Date: 2026-10-18 23:12:41.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2f8a3c917'
+down_revision: Union[str, Sequence[str], None] = 'a7d4e9c2b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_gts_responses_year_graduated', 'gts_responses', ['year_graduated'], unique=False)
+    op.create_index('ix_gts_responses_submitted_at', 'gts_responses', ['submitted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gts_responses_submitted_at', table_name='gts_responses')
+    op.drop_index('ix_gts_responses_year_graduated', table_name='gts_responses')
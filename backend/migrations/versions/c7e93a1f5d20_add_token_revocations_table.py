@@ -0,0 +1,40 @@
+"""add token_revocations table
+
+Revision ID: c7e93a1f5d20
+Revises: 8b1d4f6a2c37
+Create Date: 2026-10-18 13:47:05.918442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e93a1f5d20'
+down_revision: Union[str, Sequence[str], None] = '8b1d4f6a2c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'token_revocations',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('jti', sa.String(length=32), nullable=True),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('not_before', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti'),
+    )
+    op.create_index(op.f('ix_token_revocations_expires_at'), 'token_revocations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_token_revocations_expires_at'), table_name='token_revocations')
+    op.drop_table('token_revocations')
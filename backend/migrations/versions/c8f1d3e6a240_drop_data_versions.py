@@ -0,0 +1,31 @@
+"""drop data_versions table
+
+Revision ID: c8f1d3e6a240
+Revises: b5e2f8a3c917
+Create Date: 2026-10-18 23:40:12.219845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1d3e6a240'
+down_revision: Union[str, Sequence[str], None] = 'b5e2f8a3c917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_table('data_versions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('resource', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource')
+    )
@@ -0,0 +1,27 @@
+"""add (created_at, id) index to activity_logs
+
+Revision ID: d2a8f04b7e19
+Revises: c7e93a1f5d20
+Create Date: 2026-10-18 15:21:37.402816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f04b7e19'
+down_revision: Union[str, Sequence[str], None] = 'c7e93a1f5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activity_logs_created_at_id', 'activity_logs', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_logs_created_at_id', table_name='activity_logs')
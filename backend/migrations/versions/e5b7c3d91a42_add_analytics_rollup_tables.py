@@ -0,0 +1,69 @@
+"""add analytics rollup tables
+
+Revision ID: e5b7c3d91a42
+Revises: d2a8f04b7e19
+Create Date: 2026-10-18 19:02:11.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c3d91a42'
+down_revision: Union[str, Sequence[str], None] = 'd2a8f04b7e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analytics_alumni_rollup',
+    sa.Column('course', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('active', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('course')
+    )
+    op.create_table('analytics_gts_rollup',
+    sa.Column('course', sa.String(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('responses', sa.Integer(), nullable=False),
+    sa.Column('employed', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('course', 'year')
+    )
+
+    # Initial fill; same as `python -m app.utils.analytics_rollup`
+    op.execute("""
+        INSERT INTO analytics_alumni_rollup (course, total, active, pending)
+        SELECT coalesce(course, ''),
+               count(*),
+               count(*) FILTER (WHERE is_active IS TRUE),
+               count(*) FILTER (WHERE is_approved IS FALSE)
+        FROM users
+        WHERE role = 'alumni'
+        GROUP BY 1
+    """)
+    op.execute("""
+        INSERT INTO analytics_gts_rollup (course, year, responses, employed, completed)
+        SELECT coalesce(u.course, ''),
+               coalesce(extract(year FROM g.submitted_at)::integer, 0),
+               count(*),
+               count(*) FILTER (WHERE g.is_employed IS TRUE),
+               count(*) FILTER (WHERE coalesce(g.degree, '') <> ''
+                                  AND coalesce(g.year_graduated, 0) <> 0
+                                  AND coalesce(cardinality(g.occupation), 0) > 0
+                                  AND g.is_employed IS TRUE
+                                  AND coalesce(g.full_name, '') <> '')
+        FROM gts_responses g
+        JOIN users u ON u.id = g.user_id
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analytics_gts_rollup')
+    op.drop_table('analytics_alumni_rollup')
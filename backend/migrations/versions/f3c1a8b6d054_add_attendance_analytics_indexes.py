@@ -0,0 +1,29 @@
+"""add event_attendance (event_id, user_id) and events start_date indexes
+
+Revision ID: f3c1a8b6d054
+Revises: e5b7c3d91a42
+Create Date: 2026-10-18 21:47:05.193467
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c1a8b6d054'
+down_revision: Union[str, Sequence[str], None] = 'e5b7c3d91a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_event_attendance_event_id_user_id', 'event_attendance', ['event_id', 'user_id'], unique=False)
+    op.create_index('ix_events_start_date', 'events', ['start_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_start_date', table_name='events')
+    op.drop_index('ix_event_attendance_event_id_user_id', table_name='event_attendance')
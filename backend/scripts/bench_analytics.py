@@ -0,0 +1,75 @@
+"""
+Regression benchmark for GET /admin/analytics/ against a running API worker:
+calls it `--runs` times per filter set, one request at a time, and prints
+the median and fastest response time. `--save` stores the responses and
+`--compare` checks a later run returns the same numbers (in any order;
+breakdowns such as gtsByDept are not sorted).
+
+    python scripts/seed_bench_data.py --gts 100000 --events 50
+    python scripts/bench_analytics.py --username admin --password secret --save before.json
+    # change the code, restart the worker
+    python scripts/bench_analytics.py --username admin --password secret --compare before.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+FILTER_SETS = {
+    "all": {},
+    "2017-2020": {"start_year": 2017, "end_year": 2020},
+    "BSIT": {"department": "BSIT"},
+}
+
+# Depend on when the request ran, not on the data
+VOLATILE_KEYS = {"recentActivities"}
+
+def normalized(value):
+    """`value` with every list sorted, so only the numbers are compared"""
+    if isinstance(value, dict):
+        return {k: normalized(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted((normalized(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+def main(args) -> int:
+    responses = {}
+    with httpx.Client(base_url=args.base_url, timeout=httpx.Timeout(args.timeout)) as client:
+        response = client.post("/users/login", json={"identifier": args.username, "password": args.password})
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+        for name, params in FILTER_SETS.items():
+            times = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                response = client.get("/admin/analytics/", params=params)
+                times.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+            responses[name] = {k: v for k, v in response.json().items() if k not in VOLATILE_KEYS}
+            print(f"{name:10s} median {statistics.median(times):8.0f} ms   min {min(times):8.0f} ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(responses, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            expected = json.load(f)
+        different = [name for name in FILTER_SETS if normalized(expected.get(name)) != normalized(responses[name])]
+        print(f"responses differ for: {', '.join(different)}" if different else "responses identical")
+        return 1 if different else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--save", help="Write the responses to this JSON file")
+    parser.add_argument("--compare", help="Fail if the responses differ from this JSON file")
+    sys.exit(main(parser.parse_args()))
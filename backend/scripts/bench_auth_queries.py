@@ -0,0 +1,65 @@
+"""
+Counts the SQL statements and pool checkouts an authenticated request costs,
+in-process (no server needed) against the configured database. Logs in once,
+then sends `--requests` GETs to each path and prints the per-request averages.
+
+    python scripts/bench_auth_queries.py --username admin --password secret \\
+        /users/me /events/ "/notifications/?limit=20"
+
+Background tasks started by the app (presence flushes, revocation sync) are
+counted too; keep `--requests` high enough that they do not matter.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import database
+from app.main import app
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+def instrument(counts: Counter) -> None:
+    engines = [database.engine]
+    # Older trees only have the sync engine
+    if getattr(database, "async_engine", None) is not None:
+        engines.append(database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", lambda *args: counts.update(["statements"]))
+        event.listen(engine.pool, "checkout", lambda *args: counts.update(["checkouts"]))
+
+def main(args) -> int:
+    logging.disable(logging.INFO)
+    counts = Counter()
+    instrument(counts)
+
+    with TestClient(app) as client:
+        response = client.post("/users/login", json={"identifier": args.username, "password": args.password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+        print(f"{'path':40s} {'status':>6s} {'queries':>8s} {'checkouts':>10s} {'mean ms':>8s}")
+        for path in args.paths:
+            status = client.get(path, headers=headers).status_code  # warm caches
+            counts.clear()
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                client.get(path, headers=headers)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{path:40s} {status:6d} {counts['statements'] / args.requests:8.2f} "
+                f"{counts['checkouts'] / args.requests:10.2f} {elapsed / args.requests * 1000:8.2f}"
+            )
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Paths to GET with the access token")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per path")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Load test for a running API worker: `--clients` concurrent clients poll the
+given paths for `--duration` seconds, each waiting `--interval` seconds
+between requests (0 sends them back to back). Prints throughput, latency
+percentiles and errors per path and overall.
+
+    python scripts/bench_http.py --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --clients 300 --duration 30 \\
+        /users/me /events/ "/notifications/?limit=20"
+
+Run the load generator on a different machine (or at least different cores)
+than the worker, or both compete for the same CPU.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/users/login", json={"identifier": username, "password": password})
+    response.raise_for_status()
+    return response.json()["token"]
+
+async def poll(client: httpx.AsyncClient, paths: list, offset: int, deadline: float, interval: float, warmup_until: float, latencies: dict, statuses: dict):
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finished = time.perf_counter()
+        # Requests that started during the warmup are not counted
+        if started >= warmup_until:
+            latencies[path].append((finished - started) * 1000)
+            statuses[path][status] += 1
+        if interval:
+            await asyncio.sleep(interval)
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        if args.username:
+            token = await login(client, args.username, args.password)
+            client.headers["Authorization"] = f"Bearer {token}"
+
+        latencies = defaultdict(list)
+        statuses = defaultdict(Counter)
+        started = time.perf_counter()
+        warmup_until = started + args.warmup
+        deadline = warmup_until + args.duration
+        await asyncio.gather(*(
+            poll(client, args.paths, i, deadline, args.interval, warmup_until, latencies, statuses)
+            for i in range(args.clients)
+        ))
+
+    print(f"{args.clients} clients, {args.duration:g} s, interval {args.interval:g} s")
+    print(f"{'path':40s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'mean ms':>8s}  errors")
+    rows = [(path, latencies[path], statuses[path]) for path in args.paths]
+    rows.append(("total", [ms for path in args.paths for ms in latencies[path]], sum(statuses.values(), Counter())))
+    failed = 0
+    for path, values, counts in rows:
+        errors = {status: n for status, n in counts.items() if not (isinstance(status, int) and status < 400)}
+        if path != "total":
+            failed += sum(errors.values())
+        print(
+            f"{path:40s} {len(values) / args.duration:8.1f} {percentile(values, 50):8.1f} "
+            f"{percentile(values, 95):8.1f} {percentile(values, 99):8.1f} "
+            f"{statistics.fmean(values) if values else 0:8.1f}  {errors or '-'}"
+        )
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Paths to GET, spread across the clients")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", help="Log in first and send the access token")
+    parser.add_argument("--password")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds, after the warmup")
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--interval", type=float, default=0, help="Seconds each client waits between requests")
+    parser.add_argument("--timeout", type=float, default=30)
+    sys.exit(asyncio.run(main(parser.parse_args())))
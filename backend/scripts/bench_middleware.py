@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of AuthMiddleware alone: a bare app with the middleware and
+two trivial routes, one public and one authenticated, called in-process
+through httpx's ASGI transport. Prints requests per second for each.
+
+    python scripts/bench_middleware.py --username admin --requests 5000
+
+`--username` must exist in the configured database; the principal is cached
+after the first request, so the authenticated numbers measure the
+middleware, not the database.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from app.middleware.auth_middleware import AuthMiddleware
+from app.utils.security import create_access_token
+from fastapi import FastAPI
+
+PUBLIC_PATH = "/users/check-email/bench@example.com"
+PRIVATE_PATH = "/bench/ping"
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get(PUBLIC_PATH)
+    async def public():
+        return {"ok": True}
+
+    @app.get(PRIVATE_PATH)
+    async def private():
+        return {"ok": True}
+
+    app.add_middleware(AuthMiddleware)
+    return app
+
+async def run(client: httpx.AsyncClient, path: str, headers: dict, requests: int) -> float:
+    for _ in range(min(requests, 100)):
+        await client.get(path, headers=headers)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - started)
+
+async def main(args) -> int:
+    logging.disable(logging.CRITICAL)
+    token = create_access_token({"sub": args.username, "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path, path_headers in (("public", PUBLIC_PATH, {}), ("authenticated", PRIVATE_PATH, headers)):
+            rates = [await run(client, path, path_headers, args.requests) for _ in range(args.rounds)]
+            print(f"{name:14s} {max(rates):8.0f} req/s (best of {args.rounds})")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,88 @@
+"""
+Times marking unread notifications as read against a running API worker,
+either one PATCH per notification (what the admin page used to do, with
+`--concurrency` requests in flight like a browser) or with the bulk
+endpoints. Seed unread rows first; every mode consumes them.
+
+    python scripts/seed_bench_data.py --notifications 10000
+    python scripts/bench_notifications.py --username admin --password secret per-id
+    python scripts/bench_notifications.py --username admin --password secret bulk-ids
+
+Modes: per-id, bulk-ids (PATCH /notifications/read with the ids),
+bulk-cursor (PATCH /notifications/read up to the newest cursor) and delete
+(DELETE /notifications/ up to the newest cursor).
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+async def unread(client: httpx.AsyncClient, count: int) -> tuple:
+    """Ids of up to `count` unread notifications, newest first, and the newest cursor"""
+    ids, newest, before = [], None, None
+    while len(ids) < count:
+        params = {"is_read": "false", "limit": 200}
+        if before:
+            params["before"] = before
+        response = await client.get("/notifications/", params=params)
+        response.raise_for_status()
+        newest = newest or response.headers.get("X-Prev-Cursor")
+        ids += [item["id"] for item in response.json()]
+        before = response.headers.get("X-Next-Cursor")
+        if not before:
+            break
+    return ids[:count], newest
+
+async def per_id(client: httpx.AsyncClient, ids: list, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def mark(notif_id):
+        async with semaphore:
+            response = await client.patch(f"/notifications/{notif_id}/read")
+            return response.status_code < 400
+
+    results = await asyncio.gather(*(mark(notif_id) for notif_id in ids))
+    return {"requests": len(ids), "updated": sum(results)}
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=httpx.Timeout(args.timeout)) as client:
+        response = await client.post("/users/login", json={"identifier": args.username, "password": args.password})
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+        ids, newest = await unread(client, args.count)
+        if not ids:
+            print("no unread notifications; seed some first")
+            return 1
+
+        started = time.perf_counter()
+        if args.mode == "per-id":
+            result = await per_id(client, ids, args.concurrency)
+        else:
+            if args.mode == "bulk-ids":
+                body = {"ids": ids}
+            else:
+                body = {"up_to": newest}
+            method = "DELETE" if args.mode == "delete" else "PATCH"
+            path = "/notifications/" if args.mode == "delete" else "/notifications/read"
+            response = await client.request(method, path, json=body)
+            response.raise_for_status()
+            result = {"requests": 1, **response.json()}
+        elapsed = time.perf_counter() - started
+
+    print(f"{args.mode}: {len(ids)} unread, {result}, {elapsed * 1000:.0f} ms")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("per-id", "bulk-ids", "bulk-cursor", "delete"))
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--count", type=int, default=10000, help="Unread notifications to mark")
+    parser.add_argument("--concurrency", type=int, default=6, help="Requests in flight in per-id mode")
+    parser.add_argument("--timeout", type=float, default=60)
+    sys.exit(asyncio.run(main(parser.parse_args())))
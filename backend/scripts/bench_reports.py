@@ -0,0 +1,113 @@
+"""
+Times report jobs against a running API worker: submits the report through
+POST /admin/reports/jobs, polls until it is done and downloads the file.
+With `--pid` (the worker's process id, Linux only) it also samples the
+resident memory of the worker and its render processes and prints the peak.
+
+    python scripts/seed_bench_data.py --gts 100000
+    python scripts/bench_reports.py --username admin --password secret --pid 12345 gts:pdf gts:csv
+
+Identical reports over unchanged data are served from the artifact cache;
+point REPORT_CACHE_DIR at an empty directory before starting the worker.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import httpx
+
+def descendants(pid: int) -> list:
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending += [int(child) for child in f.read().split()]
+        except OSError:
+            pass
+    return pids
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+class MemorySampler(threading.Thread):
+    """Peak RSS of a process tree: the sum over all processes and the largest single one"""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_total = 0.0
+        self.peak_process = 0.0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            sizes = [rss_mb(pid) for pid in descendants(self.pid)]
+            self.peak_total = max(self.peak_total, sum(sizes))
+            self.peak_process = max(self.peak_process, max(sizes, default=0.0))
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+def render(client: httpx.Client, report_type: str, format: str, poll: float) -> tuple:
+    response = client.post("/admin/reports/jobs", json={"report_type": report_type, "format": format})
+    response.raise_for_status()
+    job = response.json()
+    while job["status"] not in ("done", "failed"):
+        time.sleep(poll)
+        response = client.get(f"/admin/reports/jobs/{job['id']}")
+        response.raise_for_status()
+        job = response.json()
+    if job["status"] == "failed":
+        raise RuntimeError(f"{report_type}:{format} failed: {job['error']}")
+    response = client.get(job["download_url"])
+    response.raise_for_status()
+    return len(response.content), job["from_cache"]
+
+def main(args) -> int:
+    with httpx.Client(base_url=args.base_url, timeout=httpx.Timeout(args.timeout)) as client:
+        response = client.post("/users/login", json={"identifier": args.username, "password": args.password})
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+        for report in args.reports:
+            report_type, format = report.split(":")
+            sampler = MemorySampler(args.pid) if args.pid else None
+            if sampler:
+                sampler.start()
+            started = time.perf_counter()
+            size, from_cache = render(client, report_type, format, args.poll)
+            elapsed = time.perf_counter() - started
+            line = f"{report:12s} {elapsed:8.1f} s {size / 1024:10.0f} KB"
+            if sampler:
+                sampler.stop()
+                line += f"   peak RSS {sampler.peak_total:6.0f} MB total, {sampler.peak_process:6.0f} MB largest process"
+            if from_cache:
+                line += "   (from cache)"
+            print(line, flush=True)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("reports", nargs="+", help="report_type:format, e.g. gts:pdf")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--pid", type=int, help="Worker process id to sample memory of")
+    parser.add_argument("--poll", type=float, default=0.2, help="Seconds between status checks")
+    parser.add_argument("--timeout", type=float, default=60)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Fills the configured database with synthetic rows for the benchmark scripts:
+alumni, GTS responses (spread over those alumni), events and unread
+notifications. Rows from a previous run are deleted first, so the counts
+are exact. Never run it against a production database.
+
+    python scripts/seed_bench_data.py --alumni 2000 --gts 100000 --events 50 --notifications 10000
+
+Rows are inserted with plain SQL, bypassing the ORM listeners; the analytics
+rollups are recomputed afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import SessionLocal, engine
+from sqlalchemy import text
+
+# Everything seeded hangs off these users; events do not cascade
+CLEAR = (
+    "DELETE FROM events WHERE created_by IN (SELECT id FROM users WHERE username LIKE 'bench\\_%')",
+    "DELETE FROM users WHERE username LIKE 'bench\\_%'",
+)
+
+ALUMNI = """
+INSERT INTO users (id, username, email, password_hash, firstname, lastname, course, batch_year,
+                   role, is_active, is_approved, sex, last_seen)
+SELECT uuid_generate_v4(), 'bench_' || g, 'bench_' || g || '@example.com', 'x', 'Bench', 'User ' || g,
+       (ARRAY['BSIT', 'BSCS', 'BSED', 'BSBA', 'BSN', 'BSCE', 'BSA', NULL])[1 + g % 8], 2010 + g % 12,
+       'alumni', g % 10 <> 0, g % 7 <> 0, 'male', now() - (g % 20) * interval '1 day'
+FROM generate_series(1, :n) g
+"""
+
+# Every few rows leave a field empty, so completeness checks have work to do
+GTS = """
+INSERT INTO gts_responses (id, user_id, full_name, permanent_address, present_address, contact_email, mobile,
+                           sex, birthday, degree, year_graduated, occupation, is_employed, employment_status,
+                           company_name, job_start_date, months_to_first_job, submitted_at)
+SELECT uuid_generate_v4(), u.id, CASE WHEN g % 13 = 0 THEN '' ELSE 'Name ' || g END, 'Address', 'Address',
+       'bench@example.com', '09170000000', 'Male', date '1990-01-01' + g % 3650,
+       CASE WHEN g % 11 = 0 THEN NULL WHEN g % 17 = 0 THEN '' ELSE 'BS' END,
+       CASE WHEN g % 9 = 0 THEN NULL ELSE 2010 + g % 12 END,
+       CASE WHEN g % 5 = 0 THEN NULL WHEN g % 19 = 0 THEN '{}'::varchar[] ELSE ARRAY['Developer'] END,
+       CASE WHEN g % 3 = 0 THEN NULL WHEN g % 4 = 0 THEN false ELSE true END,
+       (ARRAY['Regular', 'Contractual', 'Temporary', 'Self-employed'])[1 + g % 4],
+       'Company ' || g % 500, date '2012-01-01' + g % 4000, g % 36,
+       date '2015-01-01' + g % 3650
+FROM generate_series(1, :n) g
+JOIN LATERAL (SELECT id FROM users WHERE username = 'bench_' || (1 + g % :alumni)) u ON true
+"""
+
+EVENTS = """
+INSERT INTO events (id, title, location, start_date, end_date, created_by, created_at)
+SELECT uuid_generate_v4(), 'Bench event ' || g, 'Campus', current_date + g, current_date + g,
+       (SELECT id FROM users WHERE username = 'bench_1'), now()
+FROM generate_series(1, :n) g
+"""
+
+NOTIFICATIONS = """
+INSERT INTO activity_logs (id, user_id, action_type, description, is_read, created_at)
+SELECT uuid_generate_v4(), (SELECT id FROM users WHERE username = 'bench_1'), 'update',
+       to_json('Bench notification ' || g), false, now() - g * interval '1 second'
+FROM generate_series(1, :n) g
+"""
+
+def main(args) -> None:
+    if args.gts or args.events or args.notifications:
+        args.alumni = max(args.alumni, 1)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for statement in CLEAR:
+            conn.execute(text(statement))
+        conn.execute(text(ALUMNI), {"n": args.alumni})
+        conn.execute(text(GTS), {"n": args.gts, "alumni": args.alumni})
+        conn.execute(text(EVENTS), {"n": args.events})
+        conn.execute(text(NOTIFICATIONS), {"n": args.notifications})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    try:
+        from app.utils.analytics_rollup import rebuild
+    except ImportError:
+        pass
+    else:
+        with SessionLocal() as db:
+            rebuild(db)
+
+    print(
+        f"seeded {args.alumni} alumni, {args.gts} gts responses, {args.events} events, "
+        f"{args.notifications} notifications in {time.perf_counter() - started:.1f} s"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumni", type=int, default=2000)
+    parser.add_argument("--gts", type=int, default=0)
+    parser.add_argument("--events", type=int, default=0)
+    parser.add_argument("--notifications", type=int, default=0)
+    main(parser.parse_args())
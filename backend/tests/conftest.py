@@ -0,0 +1,86 @@
+"""
+The tests run against the database configured in `.env` (or the environment),
+migrated to the latest revision. Users they create are deleted afterwards.
+Without a reachable database the suite is skipped.
+"""
+from uuid import uuid4
+
+import pytest
+
+try:
+    # Importing the app registers every ORM listener, as in production
+    import app.main  # noqa: F401
+    from app.database import SessionLocal, engine
+    from app.models.users_models import Users
+    from sqlalchemy import delete, text
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+except Exception as e:
+    collect_ignore_glob = ["test_*.py"]
+    SKIP_REASON = f"database not available: {e.__class__.__name__}"
+else:
+    SKIP_REASON = None
+
+def pytest_report_header(config):
+    if SKIP_REASON:
+        return f"skipping all tests, {SKIP_REASON}"
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def make_user():
+    """Factory for approved users; returns (user, password)"""
+    from app.models.users_models import SexEnum, UserRole
+    from app.utils.activity_logger import activity_log_writer
+    from app.utils.security import hash_password
+
+    created = []
+
+    def make(role: UserRole = UserRole.alumni, password: str = "password123"):
+        name = f"test_{uuid4().hex[:12]}"
+        with SessionLocal() as db:
+            user = Users(
+                username=name,
+                email=f"{name}@example.com",
+                password_hash=hash_password(password),
+                firstname="Test",
+                lastname="User",
+                course="BSIT",
+                batch_year=2020,
+                role=role,
+                sex=SexEnum.male,
+                is_approved=True,
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            db.expunge(user)
+        created.append(user.id)
+        return user, password
+
+    yield make
+
+    # Queued activity log rows reference the users; write them before deleting.
+    # An ORM delete, so the analytics rollups subtract the users again.
+    activity_log_writer.flush()
+    if created:
+        with SessionLocal() as db:
+            db.execute(delete(Users).where(Users.id.in_(created)).execution_options(synchronize_session=False))
+            db.commit()
+
+@pytest.fixture
+def login(client):
+    """Logs a user in and returns the token response"""
+    def login(user, password):
+        response = client.post("/users/login", json={"identifier": user.username, "password": password})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return login
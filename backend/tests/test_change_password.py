@@ -0,0 +1,32 @@
+def change_password(client, tokens, current, new):
+    return client.post(
+        "/users/change-password",
+        json={"current_password": current, "new_password": new, "confirm_new_password": new},
+        headers={"Authorization": f"Bearer {tokens['token']}"},
+    )
+
+def test_change_password_revokes_other_sessions(client, make_user, login):
+    user, password = make_user()
+    other = login(user, password)
+    tokens = login(user, password)
+
+    response = change_password(client, tokens, password, "newpassword456")
+    assert response.status_code == 200
+    fresh = response.json()
+
+    # Every token issued before the change is rejected
+    for old in (tokens, other):
+        assert client.post("/users/token/refresh", json={"refresh_token": old["refresh_token"]}).status_code == 401
+        assert client.get("/users/me", headers={"Authorization": f"Bearer {old['token']}"}).status_code == 401
+
+    # The pair returned by the change keeps working
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {fresh['token']}"}).status_code == 200
+    assert client.post("/users/token/refresh", json={"refresh_token": fresh["refresh_token"]}).status_code == 200
+
+def test_change_password_rejects_wrong_current_password(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+
+    response = change_password(client, tokens, "wrongpassword", "newpassword456")
+    assert response.status_code == 400
+    assert client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
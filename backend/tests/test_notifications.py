@@ -0,0 +1,59 @@
+from uuid import uuid4
+
+import pytest
+from app.database import SessionLocal
+from app.models.activity_logs_models import ActionType, ActivityLog
+from app.models.users_models import UserRole
+from sqlalchemy import select, update
+
+@pytest.fixture
+def admin_headers(make_user, login):
+    tokens = login(*make_user(UserRole.admin))
+    return {"Authorization": f"Bearer {tokens['token']}"}
+
+@pytest.fixture
+def logs(make_user):
+    """One read, one unread and one legacy (is_read NULL) notification"""
+    user, _ = make_user()
+    rows = {state: uuid4() for state in ("read", "unread", "legacy")}
+    with SessionLocal() as db:
+        for state, log_id in rows.items():
+            db.add(ActivityLog(
+                id=log_id,
+                user_id=user.id,
+                action_type=ActionType.update,
+                description=f"test {state}",
+                is_read=state == "read",
+            ))
+        db.flush()
+        # The ORM default would turn None into False; legacy rows hold a real NULL
+        db.execute(update(ActivityLog).where(ActivityLog.id == rows["legacy"]).values(is_read=None))
+        db.commit()
+    return rows
+
+def notification_ids(client, headers, **params):
+    response = client.get("/notifications/", params={"limit": 200, **params}, headers=headers)
+    assert response.status_code == 200
+    return {item["id"] for item in response.json()}
+
+def test_is_read_filter_treats_null_as_unread(client, admin_headers, logs):
+    unread = notification_ids(client, admin_headers, is_read=False)
+    read = notification_ids(client, admin_headers, is_read=True)
+
+    assert {str(logs["unread"]), str(logs["legacy"])} <= unread
+    assert str(logs["read"]) not in unread
+    assert str(logs["read"]) in read
+    assert not {str(logs["unread"]), str(logs["legacy"])} & read
+
+def test_bulk_mark_read_includes_null_rows(client, admin_headers, logs):
+    response = client.patch(
+        "/notifications/read",
+        json={"ids": [str(log_id) for log_id in logs.values()]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+
+    with SessionLocal() as db:
+        states = db.scalars(select(ActivityLog.is_read).where(ActivityLog.id.in_(logs.values()))).all()
+    assert states == [True, True, True]
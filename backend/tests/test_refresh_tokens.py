@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Barrier
+
+from app.database import SessionLocal
+from app.models.refresh_tokens_models import RefreshToken
+from sqlalchemy import select, update
+
+def refresh(client, refresh_token):
+    return client.post("/users/token/refresh", json={"refresh_token": refresh_token})
+
+def live_tokens(user_id):
+    with SessionLocal() as db:
+        return db.scalars(
+            select(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        ).all()
+
+def test_refresh_rotates_token(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {response.json()['token']}"}).status_code == 200
+
+def test_concurrent_refreshes_with_same_token(client, make_user, login):
+    # Two tabs refreshing at once: both get a token and the session survives
+    user, password = make_user()
+    tokens = login(user, password)
+    barrier = Barrier(2)
+
+    def send():
+        barrier.wait()
+        return refresh(client, tokens["refresh_token"])
+
+    with ThreadPoolExecutor(2) as pool:
+        responses = list(pool.map(lambda _: send(), range(2)))
+
+    assert [r.status_code for r in responses] == [200, 200]
+    new_tokens = {r.json()["refresh_token"] for r in responses}
+    assert len(new_tokens) == 2
+    assert len(live_tokens(user.id)) == 2
+    for token in new_tokens:
+        assert refresh(client, token).status_code == 200
+
+def test_reuse_after_grace_revokes_family(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    with SessionLocal() as db:
+        db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user.id, RefreshToken.revoked_at.is_not(None))
+            .values(revoked_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+        )
+        db.commit()
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert live_tokens(user.id) == []
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+def test_reuse_after_logout_is_rejected(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    response = client.post(
+        "/users/logout",
+        json={"refresh_token": rotated["refresh_token"]},
+        headers={"Authorization": f"Bearer {rotated['token']}"},
+    )
+    assert response.status_code == 200
+    # Still within the grace period, but the family is gone
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
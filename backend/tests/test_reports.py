@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models.users_models import Users
+from app.utils.report_utils import fingerprint_query
+from sqlalchemy import text
+
+def test_concurrent_writers_do_not_block(make_user):
+    # Report caching must not funnel every write to a table through one row
+    first, _ = make_user()
+    second, _ = make_user()
+
+    with SessionLocal() as writer, SessionLocal() as other:
+        writer.get(Users, first.id).firstname = "First"
+        writer.flush()  # holds its locks until commit
+
+        other.execute(text("SET LOCAL lock_timeout = '2s'"))
+        other.get(Users, second.id).firstname = "Second"
+        other.commit()
+
+        writer.commit()
+
+def fingerprint(report_type, filters=None):
+    with SessionLocal() as db:
+        return tuple(db.execute(fingerprint_query(report_type, filters)).one())
+
+def test_fingerprint_follows_report_contents(make_user):
+    user, _ = make_user()
+    filters = {"start_year": 2020, "end_year": 2020}
+    before = fingerprint("alumni", filters)
+
+    with SessionLocal() as db:
+        # Not printed in the report
+        db.get(Users, user.id).last_seen = datetime.now()
+        db.commit()
+    assert fingerprint("alumni", filters) == before
+
+    with SessionLocal() as db:
+        db.get(Users, user.id).firstname = "Renamed"
+        db.commit()
+    after = fingerprint("alumni", filters)
+    assert after != before
+    assert after[0] == before[0]
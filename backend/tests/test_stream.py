@@ -0,0 +1,66 @@
+import logging
+from datetime import timedelta
+
+from app.config import settings
+from app.middleware.auth_middleware import RedactQueryCredentials
+from app.utils.security import create_access_token
+
+def issue_ticket(client, token):
+    return client.post("/stream/ticket", headers={"Authorization": f"Bearer {token}"})
+
+def test_ticket_opens_stream_once(client, make_user, login, monkeypatch):
+    # End the stream right after the preamble so the response completes
+    monkeypatch.setattr(settings, "STREAM_MAX_DURATION_SECONDS", 0)
+    user, password = make_user()
+    tokens = login(user, password)
+
+    response = issue_ticket(client, tokens["token"])
+    assert response.status_code == 200
+    ticket = response.json()["ticket"]
+
+    first = client.get("/stream", params={"ticket": ticket})
+    assert first.status_code == 200
+    assert first.text.startswith("retry:")
+    assert client.get("/stream", params={"ticket": ticket}).status_code == 401
+
+def test_stream_rejects_access_token_in_query(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+
+    assert client.get("/stream", params={"token": tokens["token"]}).status_code == 401
+    # Nor is an access token accepted in place of a ticket
+    assert client.get("/stream", params={"ticket": tokens["token"]}).status_code == 401
+
+def test_ticket_is_not_an_access_token(client, make_user, login):
+    user, password = make_user()
+    ticket = issue_ticket(client, login(user, password)["token"]).json()["ticket"]
+
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+def test_expired_ticket_rejected(client, make_user, login, monkeypatch):
+    user, password = make_user()
+    tokens = login(user, password)
+    monkeypatch.setattr(settings, "STREAM_TICKET_TTL_SECONDS", -1)
+
+    ticket = issue_ticket(client, tokens["token"]).json()["ticket"]
+    assert client.get("/stream", params={"ticket": ticket}).status_code == 401
+
+def test_ticket_from_revoked_token_rejected(client, make_user, login):
+    user, password = make_user()
+    tokens = login(user, password)
+    ticket = issue_ticket(client, tokens["token"]).json()["ticket"]
+
+    assert client.post("/users/logout", headers={"Authorization": f"Bearer {tokens['token']}"}).status_code == 200
+    assert client.get("/stream", params={"ticket": ticket}).status_code == 401
+
+def test_access_log_redacts_query_credentials():
+    token = create_access_token({"sub": "someone"}, timedelta(minutes=1))
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", f"/stream?last_event_id=4&token={token}&ticket=abc", "1.1", 401), None,
+    )
+    RedactQueryCredentials().filter(record)
+
+    message = record.getMessage()
+    assert token not in message and "abc" not in message
+    assert "/stream?last_event_id=4&token=[redacted]&ticket=[redacted]" in message
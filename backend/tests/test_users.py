@@ -0,0 +1,12 @@
+from app.models.users_models import UserRole
+
+def test_dashboard_is_admin_only(client, make_user, login):
+    alumni = login(*make_user(UserRole.alumni))
+    admin = login(*make_user(UserRole.admin))
+
+    response = client.get("/users/dashboard", headers={"Authorization": f"Bearer {alumni['token']}"})
+    assert response.status_code == 403
+
+    response = client.get("/users/dashboard", headers={"Authorization": f"Bearer {admin['token']}"})
+    assert response.status_code == 200
+    assert response.json()["me"]["username"] == admin["username"]
@@ -31,14 +31,14 @@ function LoginForm() {
     if (Object.keys(errors).length > 0) return;
 
     try {
-      const { token, role, is_approved } = await login(identifier, password);
+      const { token, refresh_token, role, is_approved } = await login(identifier, password);
 
       if (role === "alumni" && !is_approved) {
         toast("Your account is pending approval by the admin.");
         return;
       }
 
-      setAuthData({ token, role, is_approved });
+      setAuthData({ token, refresh_token, role, is_approved });
       const userData = await getProfile();
       setUser(userData);
       setCurrentUser(userData);
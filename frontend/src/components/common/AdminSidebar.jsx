@@ -1,5 +1,5 @@
 /* eslint-disable no-unused-vars */
-import { userLogout } from "../../utils/storage";
+import { getRefreshToken, userLogout } from "../../utils/storage";
 import { useNavigate, NavLink } from "react-router-dom";
 import { useState, useEffect } from "react";
 import { ScanQrCode } from "lucide-react";
@@ -72,7 +72,8 @@ const AdminSidebar = () => {
 
   const handleLogout = async () => {
     try{
-      await api.post("/users/logout");
+      const refreshToken = getRefreshToken();
+      await api.post("/users/logout", refreshToken ? { refresh_token: refreshToken } : undefined);
     } finally {
     userLogout();
     setCurrentUser(null);
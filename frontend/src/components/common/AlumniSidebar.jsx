@@ -1,5 +1,5 @@
 /* eslint-disable no-unused-vars */
-import { userLogout } from "../../utils/storage";
+import { getRefreshToken, userLogout } from "../../utils/storage";
 import { useNavigate, NavLink } from "react-router-dom";
 import { useState, useEffect } from "react";
 import { FontAwesomeIcon } from "@fortawesome/react-fontawesome";
@@ -43,7 +43,8 @@ const AlumniSidebar = () => {
 
   const handleLogout = async () => {
     try{
-      await api.post("/users/logout");
+      const refreshToken = getRefreshToken();
+      await api.post("/users/logout", refreshToken ? { refresh_token: refreshToken } : undefined);
     } finally {
     userLogout();
     setCurrentUser(null);
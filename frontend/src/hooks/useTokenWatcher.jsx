@@ -1,20 +1,34 @@
 /* eslint-disable no-unused-vars */
-import { useEffect, useRef } from "react";
+import { useEffect, useRef, useState } from "react";
 import { jwtDecode } from "jwt-decode";
 import toast from "react-hot-toast";
-import { getToken, userLogout } from "../utils/storage";
+import { getRefreshToken, getToken, userLogout } from "../utils/storage";
+import { refreshSession } from "../services/auth";
 
 export default function useTokenWatcher() {
   const warnedRef = useRef(false);
   const logoutTimerRef = useRef(null);
   const warnTimerRef = useRef(null);
+  const refreshTimerRef = useRef(null);
+  // Bumped after a refresh (here or in another tab) to re-read the token
+  const [, setRefreshCount] = useState(0);
 
   const token = getToken();
 
+  // Another tab rotated the tokens; pick up the new access token
+  useEffect(() => {
+    const onStorage = (e) => {
+      if (e.key === "token") setRefreshCount((n) => n + 1);
+    };
+    window.addEventListener("storage", onStorage);
+    return () => window.removeEventListener("storage", onStorage);
+  }, []);
+
   useEffect(() => {
     // Clear old timers
     if (logoutTimerRef.current) clearTimeout(logoutTimerRef.current);
     if (warnTimerRef.current) clearTimeout(warnTimerRef.current);
+    if (refreshTimerRef.current) clearTimeout(refreshTimerRef.current);
     warnedRef.current = false;
 
     if (!token) return;
@@ -28,33 +42,57 @@ export default function useTokenWatcher() {
       const remaining = exp - now;
 
       const warnThreshold = 30 * 1000;
+      const refreshLead = 60 * 1000;
+
+      // Silently renew the access token shortly before it expires
+      if (getRefreshToken()) {
+        refreshTimerRef.current = setTimeout(async () => {
+          const refresh = async () => {
+            // Another tab may have refreshed while this one waited for the lock
+            if (getToken() !== token) return;
+            await refreshSession();
+          };
+          try {
+            // One tab refreshes at a time; the others pick up its tokens
+            if (navigator.locks) {
+              await navigator.locks.request("token-refresh", refresh);
+            } else {
+              await refresh();
+            }
+          } catch (_) {
+            // fall through to the expiry warning and logout below
+          }
+          setRefreshCount((n) => n + 1);
+        }, Math.max(0, remaining - refreshLead));
+      }
 
       // Token already expired?
-      if (remaining <= 0) {
+      if (remaining <= 0 && !getRefreshToken()) {
         toast.error("Your session has expired. Please log in again.");
         userLogout();
         return;
       }
 
       // If within warning threshold immediately
-      if (remaining <= warnThreshold) {
+      if (remaining > 0 && remaining <= warnThreshold) {
         toast("Your session will expire soon.");
         warnedRef.current = true;
       }
 
       // Delay warning
       warnTimerRef.current = setTimeout(() => {
-        if (!warnedRef.current) {
+        if (!warnedRef.current && getToken() === token) {
           warnedRef.current = true;
           toast("Your session will expire soon.");
         }
       }, Math.max(0, remaining - warnThreshold));
 
-      // Auto logout
+      // Auto logout; give an in-flight refresh a moment to land first
       logoutTimerRef.current = setTimeout(() => {
+        if (getToken() !== token) return;
         toast.error("Your session has expired. Please log in again.");
         userLogout();
-      }, remaining);
+      }, Math.max(0, remaining) + (getRefreshToken() ? 5 * 1000 : 0));
     } catch (_) {
       // silent fail
     }
@@ -62,6 +100,7 @@ export default function useTokenWatcher() {
     return () => {
       if (logoutTimerRef.current) clearTimeout(logoutTimerRef.current);
       if (warnTimerRef.current) clearTimeout(warnTimerRef.current);
+      if (refreshTimerRef.current) clearTimeout(refreshTimerRef.current);
     };
   }, [token]);
 }
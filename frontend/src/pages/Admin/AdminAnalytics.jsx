@@ -7,6 +7,7 @@ import {
   PieChart, Pie, Cell, Legend, BarChart, Bar,
 } from "recharts";
 import api from "../../services/api";
+import { subscribeInvalidate } from "../../services/stream";
 import { useTheme } from "../../hooks/useTheme";
 
 const AdminAnalytics = () => {
@@ -29,8 +30,8 @@ const AdminAnalytics = () => {
       }
     };
     fetchAnalytics();
-    const interval = setInterval(fetchAnalytics, 10000);
-    return () => clearInterval(interval);
+    // Refetch when the stream reports a change instead of polling
+    return subscribeInvalidate(["users", "gts", "events"], fetchAnalytics);
   }, []);
 
   if (loading) {
@@ -23,6 +23,10 @@ import {
 } from "@fortawesome/free-solid-svg-icons";
 import { useTheme } from "../../hooks/useTheme";
 import api from "../../services/api";
+import { subscribe } from "../../services/stream";
+
+// Matches the default limit of GET /activity/recent
+const RECENT_ACTIVITY_LIMIT = 10;
 
 const AdminDashboard = () => {
   const { theme } = useTheme();
@@ -50,42 +54,61 @@ const AdminDashboard = () => {
   };
 
   useEffect(() => {
+    // One request; the server runs the counter and list queries concurrently
     const fetchUserStats = async () => {
       try {
-        const [
-          statsRes,
-          activeRes,
-          blockedRes,
-          archivedRes,
-          onlineRes,
-          pendingRes,
-          meRes,
-        ] = await Promise.all([
-          api.get("/users/stats"),
-          api.get("/users/active"),
-          api.get("/users/blocked"),
-          api.get("/users/archived"),
+        const { data } = await api.get("/users/dashboard");
+        const { counters } = data;
+
+        setUserStats({
+          total_users: counters.total_users,
+          admins: counters.admins,
+          alumni: counters.alumni,
+        });
+        setActiveUsers(counters.active_users);
+        setBlockedUsers(counters.blocked_users);
+        setArchivedUsers(counters.archived_users);
+        setOnlineUsers(data.online);
+        setPendingUsers(data.pending || []);
+        setCurrentUser(data.me);
+      } catch (error) {
+        console.error("Error fetching user stats: ", error);
+        toast.error("Failed to load dashboard data. Please refresh.");
+      }
+    };
+
+    const fetchUserLists = async () => {
+      try {
+        const [onlineRes, pendingRes] = await Promise.all([
           api.get("/users/online"),
           api.get("/users/pending-alumni"),
-          api.get("/users/me"),
         ]);
-
-        setUserStats(statsRes.data);
-        setActiveUsers(activeRes.data.active_users);
-        setBlockedUsers(blockedRes.data.blocked_users);
-        setArchivedUsers(archivedRes.data.archived_users);
         setOnlineUsers(onlineRes.data);
         setPendingUsers(pendingRes.data || []);
-        setCurrentUser(meRes.data);
-      } catch (error) {
-        console.error("Error fetching user stats: ", error);
-        toast.error("Failed to load dashboard data. Please refresh.");
+      } catch (err) {
+        console.error("Error fetching user lists:", err);
       }
     };
 
+    // The stream pushes counters whenever users or presence change
+    const applyCounters = (counters) => {
+      setUserStats({
+        total_users: counters.total_users,
+        admins: counters.admins,
+        alumni: counters.alumni,
+      });
+      setActiveUsers(counters.active_users);
+      setBlockedUsers(counters.blocked_users);
+      setArchivedUsers(counters.archived_users);
+      fetchUserLists();
+    };
+
     fetchUserStats();
-    const interval = setInterval(fetchUserStats, 10000);
-    return () => clearInterval(interval);
+    const unsubscribers = [
+      subscribe("counters", applyCounters),
+      subscribe("reset", fetchUserStats),
+    ];
+    return () => unsubscribers.forEach((off) => off());
   }, []);
 
   useEffect(() => {
@@ -99,8 +122,13 @@ const AdminDashboard = () => {
     };
 
     fetchRecentActivity();
-    const interval = setInterval(fetchRecentActivity, 10000);
-    return () => clearInterval(interval);
+    const unsubscribers = [
+      subscribe("notification", (entry) =>
+        setRecentActivity((prev) => [entry, ...prev].slice(0, RECENT_ACTIVITY_LIMIT))
+      ),
+      subscribe("reset", fetchRecentActivity),
+    ];
+    return () => unsubscribers.forEach((off) => off());
   }, []);
 
   const approveUser = async (userId) => {
@@ -7,6 +7,7 @@ import {
   faMagnifyingGlass,
 } from "@fortawesome/free-solid-svg-icons";
 import api from "../../services/api";
+import { subscribeInvalidate } from "../../services/stream";
 import { getToken } from "../../utils/storage";
 import FloatingInput from "../../components/FloatingInput";
 import FloatingSelect from "../../components/FloatingSelect";
@@ -81,8 +82,8 @@ const AdminEvents = () => {
 
   useEffect(() => {
     fetchEvents();
-    const interval = setInterval(fetchEvents, 10000);
-    return () => clearInterval(interval);
+    // Refetch when the stream reports a change instead of polling
+    return subscribeInvalidate(["events", "attendance"], fetchEvents);
   }, []);
 
   const handleEdit = (eventData) => {
@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { FontAwesomeIcon } from "@fortawesome/react-fontawesome";
 import {
   faBell,
@@ -12,6 +12,13 @@ import {
 import toast from "react-hot-toast";
 import { formatDistanceToNow, parseISO } from "date-fns";
 import api from "../../services/api";
+import {
+  fetchNewNotifications,
+  fetchNotifications,
+  markNotificationsRead,
+  mergeNotifications,
+} from "../../services/notifications";
+import { subscribe } from "../../services/stream";
 import { useTheme } from "../../hooks/useTheme";
 
 const AdminNotifications = () => {
@@ -25,6 +32,13 @@ const AdminNotifications = () => {
     return "info";
   };
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const notificationsRef = useRef([]);
+  // Cursor of the newest entry fetched so far; "mark all read" covers everything up to it
+  const headCursorRef = useRef(null);
+  // Entries pushed by the stream are newer than the head cursor and are marked by id
+  const pushedIdsRef = useRef(new Set());
   const [filter, setFilter] = useState("all");
   const [sortOrder, setSortOrder] = useState("newest");
 
@@ -38,10 +52,16 @@ const AdminNotifications = () => {
   };
 
   useEffect(() => {
-    const fetchNotifications = async () => {
+    notificationsRef.current = notifications;
+  }, [notifications]);
+
+  useEffect(() => {
+    const loadFirstPage = async () => {
       try {
-        const res = await api.get("/notifications");
-        setNotifications(res.data || []);
+        const { items, nextCursor, headCursor } = await fetchNotifications();
+        setNotifications(items);
+        setNextCursor(nextCursor);
+        headCursorRef.current = headCursor;
       } catch (error) {
         console.error("Error fetching notifications:", error);
         toast.error("Failed to load notifications. Please refresh.");
@@ -50,11 +70,42 @@ const AdminNotifications = () => {
       }
     };
 
-    fetchNotifications();
-    const interval = setInterval(fetchNotifications, 10000);
-    return () => clearInterval(interval);
+    // After a stream resync, fetch only entries newer than the ones already shown
+    const fetchMissedNotifications = async () => {
+      try {
+        const { items, headCursor } = await fetchNewNotifications(notificationsRef.current);
+        setNotifications((prev) => mergeNotifications(prev, items));
+        if (headCursor) headCursorRef.current = headCursor;
+      } catch (error) {
+        console.error("Error fetching notifications:", error);
+      }
+    };
+
+    loadFirstPage();
+    const unsubscribers = [
+      subscribe("notification", (entry) => {
+        pushedIdsRef.current.add(entry.id);
+        setNotifications((prev) => mergeNotifications(prev, [entry]));
+      }),
+      subscribe("reset", fetchMissedNotifications),
+    ];
+    return () => unsubscribers.forEach((off) => off());
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const { items, nextCursor: cursor } = await fetchNotifications({ before: nextCursor });
+      setNotifications((prev) => mergeNotifications(prev, items));
+      setNextCursor(cursor);
+    } catch {
+      toast.error("Failed to load more notifications");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const markAsRead = async (id) => {
     try {
       await api.patch(`/notifications/${id}/read`);
@@ -75,9 +126,16 @@ const AdminNotifications = () => {
     }
 
     try {
-      await Promise.all(
-        unreadNotifs.map(n => api.patch(`/notifications/${n.id}/read`))
-      );
+      // One set-based request instead of one PATCH per notification
+      if (headCursorRef.current) {
+        await markNotificationsRead({ up_to: headCursorRef.current });
+        const pushedUnread = unreadNotifs.filter((n) => pushedIdsRef.current.has(n.id));
+        if (pushedUnread.length > 0) {
+          await markNotificationsRead({ ids: pushedUnread.map((n) => n.id) });
+        }
+      } else {
+        await markNotificationsRead({ ids: unreadNotifs.map((n) => n.id) });
+      }
       setNotifications((prev) =>
         prev.map((n) => ({ ...n, is_read: true }))
       );
@@ -310,6 +368,18 @@ const AdminNotifications = () => {
                 ))}
               </ul>
             )}
+
+            {!loading && nextCursor && (
+              <div className="flex justify-center mt-4">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-4 py-2 text-sm font-medium text-white transition bg-blue-600 rounded-md hover:bg-blue-700 disabled:opacity-50"
+                >
+                  {loadingMore ? "Loading..." : "Load more"}
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </main>
@@ -10,13 +10,48 @@ const AdminReports = () => {
   const { theme } = useTheme();  
   const isDark = theme === "dark";
   const [downloading, setDownloading] = useState(null);
+  const [filters, setFilters] = useState({
+    course: "",
+    start_year: "",
+    end_year: "",
+    employment_status: "",
+    start_date: "",
+    end_date: "",
+  });
 
-  const handleDownload = async (type, format = "pdf") => {
+  const setFilter = (name) => (e) => setFilters((prev) => ({ ...prev, [name]: e.target.value }));
+
+  // Only the filters the report supports, and only those that are set
+  const reportFilters = (report) =>
+    Object.fromEntries(
+      report.filters
+        .filter((name) => filters[name] !== "")
+        .map((name) => [name, filters[name]])
+    );
+
+  const handleDownload = async (report, format = "pdf") => {
+    const type = report.key;
     setDownloading(`${type}-${format}`);
     const toastId = toast.loading(`Generating ${type} report...`);
     
     try {
-      const res = await api.get(`/admin/reports/${type}?format=${format}`, {
+      let request = { url: `/admin/reports/${type}`, params: { format, ...reportFilters(report) } };
+      if (format === "pdf") {
+        // PDFs are rendered in the background; wait for the job, then download it
+        let { data: job } = await api.post("/admin/reports/jobs", {
+          report_type: type,
+          format,
+          filters: reportFilters(report),
+        });
+        while (job.status === "queued" || job.status === "running") {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          ({ data: job } = await api.get(`/admin/reports/jobs/${job.id}`));
+        }
+        if (job.status !== "done") throw new Error(job.error || "Report generation failed");
+        request = { url: job.download_url };
+      }
+      const res = await api.get(request.url, {
+        params: request.params,
         responseType: "blob",
       });
       const url = window.URL.createObjectURL(new Blob([res.data]));
@@ -44,24 +79,36 @@ const AdminReports = () => {
       label: "Alumni Summary",
       icon: Users,
       description: "Comprehensive alumni database export",
-      color: "blue"
+      color: "blue",
+      filters: ["course", "start_year", "end_year"]
     },
     { 
       key: "events", 
       label: "Event Attendance",
       icon: Calendar,
       description: "Event participation and RSVP data",
-      color: "purple"
+      color: "purple",
+      filters: ["start_date", "end_date"]
     },
     { 
       key: "gts", 
       label: "Graduate Tracer Study",
       icon: ClipboardList,
       description: "Employment and feedback responses",
-      color: "green"
+      color: "green",
+      filters: ["course", "start_year", "end_year", "employment_status", "start_date", "end_date"]
     },
   ];
 
+  const filterFields = [
+    { name: "course", label: "Course", type: "text", placeholder: "e.g. BSIT", appliesTo: "Alumni, Tracer Study" },
+    { name: "start_year", label: "From year", type: "number", placeholder: "e.g. 2018", appliesTo: "Alumni, Tracer Study" },
+    { name: "end_year", label: "To year", type: "number", placeholder: "e.g. 2022", appliesTo: "Alumni, Tracer Study" },
+    { name: "employment_status", label: "Employment status", type: "text", placeholder: "e.g. Regular", appliesTo: "Tracer Study" },
+    { name: "start_date", label: "From date", type: "date", appliesTo: "Events, Tracer Study" },
+    { name: "end_date", label: "To date", type: "date", appliesTo: "Events, Tracer Study" },
+  ];
+
   const getColorClasses = (color, type = "button") => {
     const colors = {
       blue: type === "button" ? "bg-blue-600 hover:bg-blue-700" : "bg-blue-500/10 text-blue-400 border-blue-500/30",
@@ -84,6 +131,40 @@ const AdminReports = () => {
             </p>
           </header>
 
+          <motion.div
+            initial={{ opacity: 0 }}
+            animate={{ opacity: 1 }}
+            transition={{ duration: 0.4 }}
+            className={`mb-6 rounded-xl p-6 border ${
+              isDark ? "bg-gray-800 border-gray-700" : "bg-white border-gray-200"
+            }`}
+          >
+            <h4 className={`font-semibold mb-1 ${isDark ? "text-white" : "text-gray-900"}`}>
+              Filters
+            </h4>
+            <p className={`text-sm mb-4 ${isDark ? "text-gray-400" : "text-gray-600"}`}>
+              Leave empty to export everything. Years are the batch year for alumni and the graduation year for the
+              tracer study; dates are the event start date or the tracer study submission date.
+            </p>
+            <div className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3">
+              {filterFields.map((field) => (
+                <label key={field.name} className={`block text-sm ${isDark ? "text-gray-300" : "text-gray-700"}`}>
+                  {field.label}
+                  <input
+                    type={field.type}
+                    value={filters[field.name]}
+                    onChange={setFilter(field.name)}
+                    placeholder={field.placeholder}
+                    className={`mt-1 w-full px-3 py-2 rounded-lg border ${
+                      isDark ? "bg-gray-700 border-gray-600 text-white" : "bg-white border-gray-300 text-gray-900"
+                    }`}
+                  />
+                  <span className="block mt-1 text-xs text-gray-500">{field.appliesTo}</span>
+                </label>
+              ))}
+            </div>
+          </motion.div>
+
           <motion.div
             initial={{ opacity: 0, y: 20 }}
             animate={{ opacity: 1, y: 0 }}
@@ -121,7 +202,7 @@ const AdminReports = () => {
                     
                     <div className="space-y-3">
                       <button
-                        onClick={() => handleDownload(report.key, "pdf")}
+                        onClick={() => handleDownload(report, "pdf")}
                         disabled={isDownloadingPdf}
                         className={`w-full px-4 py-3 text-white font-medium rounded-lg transition-all flex items-center justify-center gap-2 ${
                           isDownloadingPdf 
@@ -143,7 +224,7 @@ const AdminReports = () => {
                       </button>
                       
                       <button
-                        onClick={() => handleDownload(report.key, "csv")}
+                        onClick={() => handleDownload(report, "csv")}
                         disabled={isDownloadingCsv}
                         className={`w-full px-4 py-3 text-white font-medium rounded-lg transition-all flex items-center justify-center gap-2 ${
                           isDownloadingCsv 
@@ -3,6 +3,7 @@ import { useEffect, useState } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import { useSearchParams } from "react-router-dom";
 import api from "../../services/api";
+import { subscribeInvalidate } from "../../services/stream";
 import AlumniGTSForm from "./AlumniGTSForm";
 import { useTheme } from "../../hooks/useTheme";
 
@@ -73,8 +74,8 @@ const AlumniDashboard = () => {
     };
     fetchEvents();
 
-    const interval = setInterval(fetchEvents, 10000);
-    return () => clearInterval(interval);
+    // Refetch when the stream reports a change instead of polling
+    return subscribeInvalidate(["events", "attendance"], fetchEvents);
   }, []);
 
   const tabVariants = {
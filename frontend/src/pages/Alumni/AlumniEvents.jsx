@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import toast from "react-hot-toast";
 import api from "../../services/api";
+import { subscribeInvalidate } from "../../services/stream";
 import { useTheme } from "../../hooks/useTheme";
 
 const AlumniEvents = () => {
@@ -32,8 +33,8 @@ const AlumniEvents = () => {
     };
 
     fetchEvents();
-    const interval = setInterval(fetchEvents, 10000);
-    return () => clearInterval(interval);
+    // Refetch when the stream reports a change instead of polling
+    return subscribeInvalidate(["events", "attendance"], fetchEvents);
   }, []);
 
   const handleAttend = async (eventId) => {
@@ -1,8 +1,10 @@
 /* eslint-disable no-unused-vars */
 import { useNavigate, useLocation } from "react-router-dom";
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import api from "../../services/api";
+import { fetchNewNotifications, mergeNotifications } from "../../services/notifications";
+import { subscribe } from "../../services/stream";
 import AlumniSystemAlerts from "./notifications/SystemAlerts";  // Assuming this is your SystemAlerts component
 import AlumniEventUpdates from "./notifications/EventUpdates";  // Assuming this is your EventUpdates component
 
@@ -33,21 +35,33 @@ const AlumniNotifications = () => {
   const [notifications, setNotifications] = useState([]);
   const [loading, setLoading] = useState(true);
 
+  const notificationsRef = useRef([]);
+
+  useEffect(() => {
+    notificationsRef.current = notifications;
+  }, [notifications]);
+
   useEffect(() => {
-    const fetchNotifications = async () => {
+    // First call loads the newest page; after a stream resync it fetches only newer entries
+    const loadNotifications = async () => {
       try {
-        const res = await api.get("/notifications");
-        setNotifications(res.data);
+        const { items } = await fetchNewNotifications(notificationsRef.current);
+        setNotifications((prev) => mergeNotifications(prev, items));
       } catch (error) {
         console.error("Failed to fetch notifications:", error);
       } finally {
         setLoading(false);
       }
     };
-    fetchNotifications();
-
-    const interval = setInterval(fetchNotifications, 10000);
-    return () => clearInterval(interval);
+    loadNotifications();
+
+    const unsubscribers = [
+      subscribe("notification", (entry) =>
+        setNotifications((prev) => mergeNotifications(prev, [entry]))
+      ),
+      subscribe("reset", loadNotifications),
+    ];
+    return () => unsubscribers.forEach((off) => off());
   }, []);
 
   const markAsRead = async (id) => {
@@ -2,6 +2,7 @@ import { useNavigate } from "react-router-dom";
 import { useEffect, useState } from "react";
 import toast from "react-hot-toast";
 import api from "../../../services/api";
+import { subscribeInvalidate } from "../../../services/stream";
 
 const AlumniEventUpdates = ({ isDark }) => {
   const navigate = useNavigate();
@@ -23,8 +24,8 @@ const AlumniEventUpdates = ({ isDark }) => {
     };
 
     fetchEvents();
-    const interval = setInterval(fetchEvents, 10000);
-    return () => clearInterval(interval);
+    // Refetch when the stream reports a change instead of polling
+    return subscribeInvalidate(["events"], fetchEvents);
   }, []);
 
   const formatDate = (dateStr) =>
@@ -3,6 +3,7 @@ import { FontAwesomeIcon } from "@fortawesome/react-fontawesome";
 import { faEye, faEyeSlash } from "@fortawesome/free-solid-svg-icons";
 import toast from "react-hot-toast";
 import api from "../../../services/api";
+import { setAuthData } from "../../../utils/storage";
 import {
   isStrongPassword,
   getPasswordStrength,
@@ -49,11 +50,13 @@ const AlumniChangePassword = () => {
     }
 
     try {
-      await api.post("/users/change-password", {
+      const { data } = await api.post("/users/change-password", {
         current_password: passwordData.current,
         new_password: passwordData.new,
         confirm_new_password: passwordData.confirm,
       });
+      // Other sessions are signed out; keep this one with the new tokens
+      setAuthData(data);
       toast.success("Password changed successfully!");
       setPasswordData({ current: "", new: "", confirm: "" });
       setPasswordStrength({ score: 0, label: "" });
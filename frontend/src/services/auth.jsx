@@ -1,4 +1,5 @@
 import api from "./api";
+import { getRefreshToken, setAuthData } from "../utils/storage";
 
 const BASE_URL = import.meta.env.VITE_API_URL;
 
@@ -16,10 +17,29 @@ export async function login(identifier, password) {
 
   const data = await res.json();
   localStorage.setItem("token", data.token); 
+  localStorage.setItem("refresh_token", data.refresh_token);
   localStorage.setItem("role", data.role);
   localStorage.setItem("is_approved",data.is_approved);
 
-  return { token: data.token, role: data.role, username: data.username, is_approved: data.is_approved };
+  return { token: data.token, refresh_token: data.refresh_token, role: data.role, username: data.username, is_approved: data.is_approved };
+}
+
+// Exchange the stored refresh token for a new access token (no password needed)
+export async function refreshSession() {
+  const refreshToken = getRefreshToken();
+  if (!refreshToken) throw new Error("No refresh token");
+
+  const res = await fetch(`${BASE_URL}/users/token/refresh`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+
+  if (!res.ok) throw new Error("Session refresh failed");
+
+  const data = await res.json();
+  setAuthData(data);
+  return data;
 }
 
 export const getProfile = async () => {
@@ -0,0 +1,46 @@
+import api from "./api";
+
+const PAGE_SIZE = 50;
+
+// Activity logs are written in batches, so an entry can be stored slightly
+// after newer ones were already fetched; polls re-read this window and dedupe
+const POLL_OVERLAP_MS = 5000;
+
+// One page, newest first; pass nextCursor back as `before` for older entries.
+// headCursor identifies the newest entry returned (usable as `up_to` below).
+export async function fetchNotifications(params = {}) {
+  const res = await api.get("/notifications", { params: { limit: PAGE_SIZE, ...params } });
+  return {
+    items: res.data || [],
+    nextCursor: res.headers["x-next-cursor"] || null,
+    headCursor: res.headers["x-prev-cursor"] || null,
+  };
+}
+
+// Entries created since the newest one the caller already has
+export async function fetchNewNotifications(current) {
+  if (current.length === 0) return fetchNotifications();
+
+  const newest = Math.max(...current.map((n) => new Date(n.created_at).getTime()));
+  const since = new Date(newest - POLL_OVERLAP_MS).toISOString();
+  return fetchNotifications({ since, limit: 200 });
+}
+
+// Bulk endpoints take either { ids } or { up_to: cursor } and return counts
+export async function markNotificationsRead(selection) {
+  const res = await api.patch("/notifications/read", selection);
+  return res.data.updated;
+}
+
+export async function deleteNotifications(selection) {
+  const res = await api.delete("/notifications/", { data: selection });
+  return res.data.deleted;
+}
+
+export function mergeNotifications(current, incoming) {
+  const byId = new Map(current.map((n) => [n.id, n]));
+  incoming.forEach((n) => byId.set(n.id, n));
+  return [...byId.values()].sort(
+    (a, b) => new Date(b.created_at) - new Date(a.created_at)
+  );
+}
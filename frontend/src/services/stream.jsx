@@ -0,0 +1,107 @@
+import { getToken } from "../utils/storage";
+import api from "./api";
+
+// One EventSource per tab, shared by every page that subscribes. It opens on
+// the first subscription and closes when the last one goes away.
+const RECONNECT_DELAY_MS = 3000;
+const EVENT_TYPES = ["notification", "counters", "invalidate", "reset"];
+
+const handlers = new Map();
+let source = null;
+let lastEventId = null;
+let reconnectTimer = null;
+let opening = false;
+let subscribers = 0;
+
+function dispatch(type, data) {
+  (handlers.get(type) || new Set()).forEach((handler) => handler(data));
+}
+
+async function open() {
+  if (!getToken() || opening) return;
+
+  // EventSource cannot send the Authorization header, so trade the access
+  // token for a single-use ticket; only the ticket appears in the URL
+  opening = true;
+  let ticket;
+  try {
+    ({ ticket } = (await api.post("/stream/ticket")).data);
+  } catch {
+    scheduleReopen(true);
+    return;
+  } finally {
+    opening = false;
+  }
+  if (subscribers === 0 || source) return;
+
+  const params = new URLSearchParams({ ticket });
+  if (lastEventId) params.set("last_event_id", lastEventId);
+  source = new EventSource(`${import.meta.env.VITE_API_URL}/stream?${params}`);
+
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (e) => {
+      if (e.lastEventId) lastEventId = e.lastEventId;
+      dispatch(type, e.data ? JSON.parse(e.data) : {});
+    });
+  });
+
+  source.onerror = () => {
+    // The browser's own retry would reuse the spent ticket, so close and
+    // reopen with a fresh one. CLOSED means the stream was refused rather
+    // than dropped (e.g. the token expired)
+    const refused = source.readyState === EventSource.CLOSED;
+    close();
+    scheduleReopen(refused);
+  };
+}
+
+function scheduleReopen(refused) {
+  if (reconnectTimer) return;
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null;
+    if (subscribers === 0) return;
+    open();
+    // Events may have been missed while disconnected; let pages refetch
+    if (refused) dispatch("reset", {});
+  }, RECONNECT_DELAY_MS);
+}
+
+function close() {
+  if (source) {
+    source.close();
+    source = null;
+  }
+}
+
+// Calls handler(data) for each event of `type`; returns an unsubscribe function.
+// Types: "notification" (ActivityLogResponse), "counters" (admin dashboard
+// counts), "invalidate" ({ resource }) and "reset" (refetch everything).
+export function subscribe(type, handler) {
+  if (!handlers.has(type)) handlers.set(type, new Set());
+  handlers.get(type).add(handler);
+
+  subscribers += 1;
+  if (!source && !reconnectTimer) open();
+
+  return () => {
+    handlers.get(type).delete(handler);
+    subscribers -= 1;
+    if (subscribers === 0) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+      close();
+    }
+  };
+}
+
+// Runs refetch() whenever one of `resources` changes or the stream resyncs
+export function subscribeInvalidate(resources, refetch) {
+  const offInvalidate = subscribe("invalidate", ({ resource }) => {
+    if (resources.includes(resource)) refetch();
+  });
+  const offReset = subscribe("reset", refetch);
+  return () => {
+    offInvalidate();
+    offReset();
+  };
+}
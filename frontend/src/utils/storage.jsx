@@ -1,9 +1,11 @@
 export const getToken = () => localStorage.getItem("token");
+export const getRefreshToken = () => localStorage.getItem("refresh_token");
 export const getRole = () => localStorage.getItem("role");
 export const isApproved = () => localStorage.getItem("is_approved") === "true";
 
-export const setAuthData = ({ token, role, is_approved }) => {
+export const setAuthData = ({ token, refresh_token, role, is_approved }) => {
   localStorage.setItem("token", token);
+  if (refresh_token) localStorage.setItem("refresh_token", refresh_token);
   localStorage.setItem("role", role);
   localStorage.setItem("is_approved", is_approved);
 };
@@ -23,6 +25,7 @@ export const clearUser = () => {
 
 export const clearAuthData = () => {
   localStorage.removeItem("token");
+  localStorage.removeItem("refresh_token");
   localStorage.removeItem("role");
   localStorage.removeItem("is_approved");
   localStorage.removeItem("user");